@@ -0,0 +1 @@
+# Leere Datei (Module)
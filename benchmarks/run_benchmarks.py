@@ -0,0 +1,204 @@
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import pandas as pd
+from components.charts import clear_chart_cache, render_category_averages, render_prediction_chart, render_progress_chart
+from components.reports import generate_excel_report, generate_pdf_report
+from utils import report_cache
+from utils.data_loader import get_participant_tests, load_participants, load_tests, read_with_journal
+from utils.dataset_store import clear_shared
+from utils.processors import (
+    aggregate_progress,
+    calculate_category_averages,
+    calculate_category_averages_batch,
+    calculate_statistics,
+    calculate_statistics_batch,
+    calculate_test_percentages,
+    calculate_trends_batch,
+    get_participants_needing_attention,
+    has_score_columns,
+    prepare_prediction_data,
+    score_tests,
+)
+from utils.report_cache import clear_report_cache
+from utils.synthetic_data import SYNTHETIC_SIZES, write_dataset
+
+# Standardmäßig gemessene Datensatzgrößen (1m mit `--size 1m` zusätzlich wählbar)
+DEFAULT_SIZES = ["1k", "100k"]
+
+# Eine Messung: (Name, Vorbereitung ohne Zeitmessung oder None, gemessene Funktion)
+Benchmark = Tuple[str, Optional[Callable[[], None]], Callable[[], Any]]
+
+
+def measure(func: Callable[[], Any], setup: Optional[Callable[[], None]] = None, runs: int = 3) -> Dict[str, float]:
+    """
+    Misst die Laufzeit einer Funktion mehrfach; `setup` läuft vor jeder Messung und zählt nicht mit.
+
+    Args:
+        func (Callable[[], Any]): Gemessene Funktion.
+        setup (Optional[Callable[[], None]]): Vorbereitung, z. B. Leeren eines Caches.
+        runs (int): Anzahl der Messungen.
+
+    Returns:
+        Dict[str, float]: "Median_s" und "Min_s" in Sekunden.
+    """
+    timings = []
+    for _ in range(runs):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {"Median_s": statistics.median(timings), "Min_s": min(timings)}
+
+
+def build_benchmarks(paths: Dict[str, str]) -> List[Benchmark]:
+    """
+    Stellt die Messungen für einen Datensatz zusammen: Loader, Prozessoren, Diagramme und Berichte.
+
+    Die Messungen pro Teilnehmer verwenden den Teilnehmer mit den meisten Tests.
+    Loader, Diagramme und Berichte werden jeweils ohne Cache (kalt) gemessen.
+
+    Args:
+        paths (Dict[str, str]): Pfade aus `utils.synthetic_data.write_dataset`.
+
+    Returns:
+        List[Benchmark]: Messungen in Ausgabereihenfolge.
+    """
+    participants = load_participants(paths["participants"])
+    tests = load_tests(paths["tests"])
+    raw_tests = read_with_journal(paths["tests"])
+    participant_id = int(tests["Teilnehmer_ID"].value_counts().idxmax())
+    participant_data = participants.loc[participants["ID"] == participant_id].to_dict(orient="records")[0]
+    participant_tests = get_participant_tests(tests, participant_id)
+    progress = aggregate_progress(participant_tests)
+    stats = calculate_statistics(participant_tests)
+    averages = calculate_category_averages(participant_tests)
+    trends = calculate_trends_batch(tests)
+
+    def clear_caches() -> None:
+        clear_shared()
+        clear_chart_cache()
+        clear_report_cache()
+
+    return [
+        ("load_participants", clear_caches, lambda: load_participants(paths["participants"])),
+        ("load_tests", clear_caches, lambda: load_tests(paths["tests"])),
+        ("has_score_columns", None, lambda: has_score_columns(raw_tests)),
+        ("score_tests", None, lambda: score_tests(raw_tests)),
+        ("calculate_test_percentages", None, lambda: calculate_test_percentages(raw_tests)),
+        ("aggregate_progress", None, lambda: aggregate_progress(tests, participant_id)),
+        ("calculate_statistics", None, lambda: calculate_statistics(tests, participant_id)),
+        ("prepare_prediction_data", None, lambda: prepare_prediction_data(tests)),
+        ("calculate_category_averages", None, lambda: calculate_category_averages(participant_tests)),
+        ("calculate_statistics_batch", None, lambda: calculate_statistics_batch(tests)),
+        ("calculate_category_averages_batch", None, lambda: calculate_category_averages_batch(tests)),
+        ("calculate_trends_batch", None, lambda: calculate_trends_batch(tests)),
+        ("get_participants_needing_attention", None, lambda: get_participants_needing_attention(trends)),
+        ("render_progress_chart", clear_caches, lambda: render_progress_chart(progress)),
+        ("render_category_averages", clear_caches, lambda: render_category_averages(averages)),
+        ("render_prediction_chart", clear_caches, lambda: render_prediction_chart(progress)),
+        ("generate_pdf_report", clear_caches, lambda: generate_pdf_report(participant_data, progress, stats, averages)),
+        ("generate_excel_report", clear_caches, lambda: generate_excel_report(participant_data, progress, stats, averages)),
+    ]
+
+
+def run_benchmarks(sizes: List[str], data_dir: str, runs: int = 3, seed: int = 0) -> Dict[str, Any]:
+    """
+    Erzeugt (falls nötig) die synthetischen Datensätze und misst alle Benchmarks je Größe.
+
+    Args:
+        sizes (List[str]): Datensatzgrößen aus `SYNTHETIC_SIZES`, z. B. ["1k", "100k"].
+        data_dir (str): Verzeichnis der Datensätze; vorhandene Datensätze werden wiederverwendet.
+        runs (int): Messungen je Benchmark.
+        seed (int): Startwert des Datengenerators.
+
+    Returns:
+        Dict[str, Any]: Ergebnisse je Größe mit "Testzeilen" und "Messungen" (Name -> Zeiten).
+    """
+    # Berichte nicht im Cache der App ablegen
+    report_cache.REPORT_CACHE_DIR = os.path.join(data_dir, "report_cache")
+
+    results = {}
+    for size in sizes:
+        directory = os.path.join(data_dir, f"{size}_seed{seed}")
+        paths = write_dataset(directory, SYNTHETIC_SIZES[size], seed) if not os.path.isdir(directory) else {
+            name: os.path.join(directory, file_name)
+            for file_name in os.listdir(directory)
+            for name in ("participants", "tests")
+            if os.path.splitext(file_name)[0] == name
+        }
+        results[size] = {
+            "Testzeilen": SYNTHETIC_SIZES[size],
+            "Messungen": {name: measure(func, setup, runs) for name, setup, func in build_benchmarks(paths)},
+        }
+    return results
+
+
+def _git_revision() -> Optional[str]:
+    """
+    Liefert den aktuellen Git-Commit, sofern verfügbar.
+
+    Returns:
+        Optional[str]: Commit-Hash oder None.
+    """
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    """
+    Führt die Benchmarks aus, z. B. `python -m benchmarks.run_benchmarks --size 100k --output data/benchmarks.jsonl`.
+
+    Mit `--output` wird je Aufruf eine JSON-Zeile mit Git-Commit angehängt, sodass sich
+    Revisionen vergleichen lassen.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Misst Loader, Prozessoren, Diagramme und Berichte auf synthetischen Daten.")
+    parser.add_argument("--size", action="append", choices=list(SYNTHETIC_SIZES), help="Datensatzgröße (mehrfach möglich)")
+    parser.add_argument("--runs", type=int, default=3, help="Messungen je Benchmark (Median)")
+    parser.add_argument("--seed", type=int, default=0, help="Startwert des Datengenerators")
+    parser.add_argument("--data-dir", help="Verzeichnis für die Datensätze (Standard: temporär)")
+    parser.add_argument("--output", help="JSONL-Datei, an die das Ergebnis angehängt wird")
+    args = parser.parse_args()
+
+    # Wie in der App (streamlit_app.py), damit geteilte DataFrames gleich behandelt werden
+    pd.set_option("mode.copy_on_write", True)
+    sizes = args.size or DEFAULT_SIZES
+    if args.data_dir:
+        results = run_benchmarks(sizes, args.data_dir, args.runs, args.seed)
+    else:
+        with tempfile.TemporaryDirectory() as data_dir:
+            results = run_benchmarks(sizes, data_dir, args.runs, args.seed)
+
+    table = pd.DataFrame({size: {name: t["Median_s"] * 1000 for name, t in r["Messungen"].items()} for size, r in results.items()})
+    print(table.round(2).rename_axis("Median (ms)").to_string())
+
+    if args.output:
+        record = {
+            "Zeitpunkt": datetime.datetime.now().isoformat(timespec="seconds"),
+            "Revision": _git_revision(),
+            "Python": sys.version.split()[0],
+            "pandas": pd.__version__,
+            "Läufe": args.runs,
+            "Seed": args.seed,
+            "Ergebnisse": results,
+        }
+        with open(args.output, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,188 @@
-import matplotlib.pyplot as plt
+import threading
+from io import BytesIO
+from typing import Callable
+from cachetools import LRUCache
+from matplotlib.figure import Figure
 import streamlit as st
 import pandas as pd
+from utils.cache import hash_key
+from utils.metrics import instrument, record_cache_access
+from utils.processors import CATEGORIES
+
+# Obergrenze des Diagramm-Caches in Bytes (gerenderte PNG/SVG-Daten)
+CHART_CACHE_BYTES = 64 * 1024 * 1024
+
+# Auflösung der gerenderten Diagramme
+CHART_DPI = 100
+
+_chart_cache: LRUCache = LRUCache(maxsize=CHART_CACHE_BYTES, getsizeof=len)
+_chart_cache_lock = threading.Lock()
+
+
+@instrument("Diagramme", "matplotlib")
+def _render_figure(draw: Callable[[Figure], None], figsize: tuple, fmt: str) -> bytes:
+    """
+    Zeichnet ein Diagramm auf eine eigene Figure und liefert es als Bilddaten.
+
+    Die Figure wird ohne `pyplot` erzeugt und ist damit nicht im globalen Zustand
+    registriert; nach dem Speichern wird sie geleert und freigegeben.
+
+    Args:
+        draw (Callable[[Figure], None]): Zeichnet den Inhalt auf die Figure.
+        figsize (tuple): Größe in Zoll.
+        fmt (str): Bildformat ("png" oder "svg").
+
+    Returns:
+        bytes: Gerendertes Diagramm.
+    """
+    fig = Figure(figsize=figsize)
+    try:
+        draw(fig)
+        buffer = BytesIO()
+        fig.savefig(buffer, format=fmt, dpi=CHART_DPI, bbox_inches="tight")
+        return buffer.getvalue()
+    finally:
+        fig.clear()
+
+
+def _cached_render(key: str, render: Callable[[], bytes]) -> bytes:
+    """
+    Liefert ein gerendertes Diagramm aus dem LRU-Cache oder rendert es neu.
+
+    Args:
+        key (str): Hash über Eingabedaten und Diagrammparameter.
+        render (Callable[[], bytes]): Rendert das Diagramm.
+
+    Returns:
+        bytes: Gerendertes Diagramm.
+    """
+    with _chart_cache_lock:
+        image = _chart_cache.get(key)
+    record_cache_access("Diagramme", hit=image is not None)
+    if image is None:
+        image = render()
+        with _chart_cache_lock:
+            _chart_cache[key] = image
+    return image
+
+
+def clear_chart_cache() -> None:
+    """
+    Leert den Diagramm-Cache.
+
+    Returns:
+        None
+    """
+    with _chart_cache_lock:
+        _chart_cache.clear()
+
+
+def _draw_time_chart(fig: Figure, data: pd.DataFrame, title: str, total_label: str, total_color: str, category_label: str) -> None:
+    """
+    Zeichnet einen Zeitverlauf (Gesamt und Kategorien) im Bereich von -30 bis +30 Tagen.
+
+    Args:
+        fig (Figure): Ziel-Figure.
+        data (pd.DataFrame): Daten mit `Tage`, `Gesamtprozentsatz` und `<Kategorie>_Prozent`.
+        title (str): Titel des Diagramms.
+        total_label (str): Legendentext der Gesamtlinie.
+        total_color (str): Farbe der Gesamtlinie.
+        category_label (str): Formatstring für die Kategorielinien, z. B. "{}".
+
+    Returns:
+        None
+    """
+    ax = fig.subplots()
+    ax.plot(data["Tage"], data["Gesamtprozentsatz"], label=total_label, linewidth=2, color=total_color)
+
+    for category in CATEGORIES:
+        if f"{category}_Prozent" in data.columns:
+            ax.plot(data["Tage"], data[f"{category}_Prozent"], linestyle="--", label=category_label.format(category))
+
+    ax.axvline(x=0, color="gray", linestyle="--", linewidth=1, label="Heute")
+    ax.set_ylim(0, 100)
+    ax.set_xlim(-30, 30)
+    ax.set_title(title)
+    ax.set_xlabel("Tage (von -30 bis +30)")
+    ax.set_ylabel("Prozent (%)")
+    ax.legend()
+    ax.grid(alpha=0.5)
+
+
+@instrument("Diagramme")
+def render_progress_chart(progress_data: pd.DataFrame, title: str = "Fortschritt über Zeit", fmt: str = "png") -> bytes:
+    """
+    Rendert den Fortschritt eines Teilnehmers als Bild (gecacht nach Inhalt).
+
+    Args:
+        progress_data (pd.DataFrame): Fortschrittsdaten mit Tagen und Prozentwerten.
+        title (str): Titel des Diagramms.
+        fmt (str): Bildformat ("png" oder "svg").
+
+    Returns:
+        bytes: Gerendertes Diagramm.
+    """
+    columns = ["Tage", "Gesamtprozentsatz"] + [c for c in progress_data.columns if c.endswith("_Prozent")]
+    data = progress_data[columns]
+    return _cached_render(
+        hash_key("progress", data, title, fmt),
+        lambda: _render_figure(
+            lambda fig: _draw_time_chart(fig, data, title, "Gesamtfortschritt", "black", "{}"), (10, 6), fmt
+        ),
+    )
+
+
+@instrument("Diagramme")
+def render_category_averages(category_averages: dict, fmt: str = "png") -> bytes:
+    """
+    Rendert die Durchschnittswerte der Kategorien als Balkendiagramm (gecacht nach Inhalt).
+
+    Args:
+        category_averages (dict): Durchschnittswerte pro Kategorie.
+        fmt (str): Bildformat ("png" oder "svg").
+
+    Returns:
+        bytes: Gerendertes Diagramm.
+    """
+    def draw(fig: Figure) -> None:
+        ax = fig.subplots()
+        categories = list(category_averages.keys())
+        averages = list(category_averages.values())
+
+        ax.bar(categories, averages, color="skyblue")
+        ax.set_title("Durchschnittswerte der Kategorien")
+        ax.set_xlabel("Kategorien")
+        ax.set_ylabel("Durchschnitt (%)")
+        ax.set_ylim(0, 100)
+        for i, avg in enumerate(averages):
+            ax.text(i, avg + 1, f"{avg:.2f}%", ha="center", fontsize=9)
+
+    return _cached_render(
+        hash_key("categories", category_averages, fmt), lambda: _render_figure(draw, (8, 5), fmt)
+    )
+
+
+@instrument("Diagramme")
+def render_prediction_chart(predicted_data: pd.DataFrame, title: str = "Prognose über Zeit", fmt: str = "png") -> bytes:
+    """
+    Rendert die Prognosen eines Teilnehmers als Bild (gecacht nach Inhalt).
+
+    Args:
+        predicted_data (pd.DataFrame): Prognosedaten mit Tagen und vorhergesagten Prozentwerten.
+        title (str): Titel des Diagramms.
+        fmt (str): Bildformat ("png" oder "svg").
+
+    Returns:
+        bytes: Gerendertes Diagramm.
+    """
+    columns = ["Tage", "Gesamtprozentsatz"] + [c for c in predicted_data.columns if c.endswith("_Prozent")]
+    data = predicted_data[columns]
+    return _cached_render(
+        hash_key("prediction", data, title, fmt),
+        lambda: _render_figure(
+            lambda fig: _draw_time_chart(fig, data, title, "Prognose (Gesamt)", "blue", "Prognose ({})"), (10, 6), fmt
+        ),
+    )
 
 
 def plot_progress_chart(progress_data: pd.DataFrame, title: str = "Fortschritt über Zeit") -> None:
@@ -14,22 +196,7 @@ def plot_progress_chart(progress_data: pd.DataFrame, title: str = "Fortschritt 
     Returns:
         None
     """
-    plt.figure(figsize=(10, 6))
-    plt.plot(progress_data["Tage"], progress_data["Gesamtprozentsatz"], label="Gesamtfortschritt", linewidth=2, color="black")
-
-    categories = ["Textaufgaben", "Raumvorstellung", "Gleichungen", "Brüche", "Grundrechenarten", "Zahlenraum"]
-    for category in categories:
-        plt.plot(progress_data["Tage"], progress_data[f"{category}_Prozent"], linestyle="--", label=category)
-
-    plt.axvline(x=0, color="gray", linestyle="--", linewidth=1, label="Heute")
-    plt.ylim(0, 100)
-    plt.xlim(-30, 30)
-    plt.title(title)
-    plt.xlabel("Tage (von -30 bis +30)")
-    plt.ylabel("Prozent (%)")
-    plt.legend()
-    plt.grid(alpha=0.5)
-    st.pyplot(plt)
+    st.image(render_progress_chart(progress_data, title))
 
 
 def plot_category_averages(category_averages: dict) -> None:
@@ -42,19 +209,7 @@ def plot_category_averages(category_averages: dict) -> None:
     Returns:
         None
     """
-    plt.figure(figsize=(8, 5))
-    categories = list(category_averages.keys())
-    averages = list(category_averages.values())
-
-    plt.bar(categories, averages, color="skyblue")
-    plt.title("Durchschnittswerte der Kategorien")
-    plt.xlabel("Kategorien")
-    plt.ylabel("Durchschnitt (%)")
-    plt.ylim(0, 100)
-    for i, avg in enumerate(averages):
-        plt.text(i, avg + 1, f"{avg:.2f}%", ha="center", fontsize=9)
-
-    st.pyplot(plt)
+    st.image(render_category_averages(category_averages))
 
 
 def plot_prediction_chart(predicted_data: pd.DataFrame, title: str = "Prognose über Zeit") -> None:
@@ -68,19 +223,4 @@ def plot_prediction_chart(predicted_data: pd.DataFrame, title: str = "Prognose 
     Returns:
         None
     """
-    plt.figure(figsize=(10, 6))
-    plt.plot(predicted_data["Tage"], predicted_data["Gesamtprozentsatz"], label="Prognose (Gesamt)", linewidth=2, color="blue")
-
-    categories = ["Textaufgaben", "Raumvorstellung", "Gleichungen", "Brüche", "Grundrechenarten", "Zahlenraum"]
-    for category in categories:
-        plt.plot(predicted_data["Tage"], predicted_data[f"{category}_Prozent"], linestyle="--", label=f"Prognose ({category})")
-
-    plt.axvline(x=0, color="gray", linestyle="--", linewidth=1, label="Heute")
-    plt.ylim(0, 100)
-    plt.xlim(-30, 30)
-    plt.title(title)
-    plt.xlabel("Tage (von -30 bis +30)")
-    plt.ylabel("Prozent (%)")
-    plt.legend()
-    plt.grid(alpha=0.5)
-    st.pyplot(plt)
+    st.image(render_prediction_chart(predicted_data, title))
@@ -1,4 +1,8 @@
+from typing import Any, Dict, Optional
+import pandas as pd
 import streamlit as st
+from utils.bulk_import import read_upload
+from utils.search_index import search_participants
 from utils.validators import validate_participant_data, validate_test_input
 
 
@@ -33,10 +37,13 @@ def participant_form() -> dict:
     return {}
 
 
-def test_form() -> dict:
+def test_form(participant_id: Optional[int]) -> dict:
     """
     Erstellt ein Formular für die Eingabe von Testergebnissen.
 
+    Args:
+        participant_id (Optional[int]): ID des gewählten Teilnehmers; ohne Auswahl kann nicht gespeichert werden.
+
     Returns:
         dict: Validierte Testdaten.
     """
@@ -56,9 +63,9 @@ def test_form() -> dict:
             max_points = st.number_input(f"{category} - Maximal", min_value=1, step=1)
         scores.append({"category": category, "reached_points": reached_points, "max_points": max_points})
 
-    submit_button = st.button("Test speichern")
+    submit_button = st.button("Test speichern", disabled=participant_id is None)
 
-    if submit_button:
+    if submit_button and participant_id is not None:
         test_data = {
             "test_date": test_date.strftime("%Y-%m-%d"),
             "scores": scores,
@@ -72,24 +79,56 @@ def test_form() -> dict:
     return {}
 
 
-def update_exit_date_form(participants: list) -> dict:
+def participant_picker(index: Dict[str, Any], label: str, key: str) -> Optional[int]:
+    """
+    Erstellt eine Suchauswahl für Teilnehmer: Suchfeld plus Auswahl aus den besten Treffern.
+
+    Es werden nur die `SEARCH_RESULT_LIMIT` besten Treffer an den Browser übertragen.
+
+    Args:
+        index (Dict[str, Any]): Suchindex aus `load_search_index`.
+        label (str): Beschriftung der Auswahl.
+        key (str): Eindeutiger Schlüssel der Eingabeelemente.
+
+    Returns:
+        Optional[int]: ID des gewählten Teilnehmers oder None ohne Treffer.
+    """
+    query = st.text_input(f"{label} (Name, ID oder SV-Nummer)", key=f"{key}_query")
+    matches = search_participants(index, query)
+    if matches.empty:
+        st.info("Kein passender Teilnehmer gefunden.")
+        return None
+    names = dict(zip(matches["ID"], matches["name"]))
+    participant_id = st.selectbox(
+        label, options=matches["ID"].tolist(), format_func=lambda pid: f"{names[pid]} (ID {pid})", key=f"{key}_select"
+    )
+    return int(participant_id)
+
+
+def update_exit_date_form(index: Dict[str, Any], participants: pd.DataFrame) -> dict:
     """
     Erstellt ein Formular für das Aktualisieren des Austrittsdatums eines Teilnehmers.
 
     Args:
-        participants (list): Liste aller Teilnehmer.
+        index (Dict[str, Any]): Suchindex der Teilnehmer aus `load_search_index`.
+        participants (pd.DataFrame): Teilnehmerdaten mit `ID` und `Eintrittsdatum`.
 
     Returns:
         dict: Aktualisierte Daten mit Teilnehmer-ID und neuem Austrittsdatum.
     """
     st.header("Austrittsdatum aktualisieren")
 
-    participant_id = st.selectbox("Wähle einen Teilnehmer", options=[p["ID"] for p in participants])
+    participant_id = participant_picker(index, "Wähle einen Teilnehmer", key="exit_date")
     new_exit_date = st.date_input("Neues Austrittsdatum")
-    submit_button = st.button("Austrittsdatum speichern")
+    submit_button = st.button("Austrittsdatum speichern", disabled=participant_id is None)
 
-    if submit_button:
+    if submit_button and participant_id is not None:
         try:
+            entry_date = participants.loc[participants["ID"] == participant_id, "Eintrittsdatum"]
+            if entry_date.empty:
+                raise ValueError("Der Teilnehmer wurde nicht gefunden.")
+            if pd.notna(entry_date.iloc[0]) and pd.Timestamp(entry_date.iloc[0]).date() >= new_exit_date:
+                raise ValueError("Das Eintrittsdatum muss vor dem Austrittsdatum liegen.")
             updated_data = {
                 "participant_id": participant_id,
                 "new_exit_date": new_exit_date.strftime("%Y-%m-%d"),
@@ -99,4 +138,43 @@ def update_exit_date_form(participants: list) -> dict:
         except ValueError as e:
             st.error(f"Fehler: {e}")
     return {}
-      
+
+
+def import_form(label: str, key: str) -> Optional[pd.DataFrame]:
+    """
+    Erstellt ein Formular für den Import einer CSV- oder Excel-Datei.
+
+    Args:
+        label (str): Beschriftung des Datei-Uploads.
+        key (str): Eindeutiger Schlüssel der Eingabeelemente.
+
+    Returns:
+        Optional[pd.DataFrame]: Gelesene Zeilen nach Klick auf "Importieren", sonst None.
+    """
+    uploaded_file = st.file_uploader(label, type=["csv", "xlsx"], key=f"{key}_upload")
+    submit_button = st.button("Importieren", key=f"{key}_submit", disabled=uploaded_file is None)
+
+    if submit_button and uploaded_file is not None:
+        try:
+            return read_upload(uploaded_file, uploaded_file.name)
+        except ValueError as e:
+            st.error(f"Fehler: {e}")
+    return None
+
+
+def show_import_result(result: Dict[str, Any], label: str) -> None:
+    """
+    Zeigt das Ergebnis eines Imports mit dem Fehlerbericht je Zeile an.
+
+    Args:
+        result (Dict[str, Any]): Ergebnis aus `import_participants` oder `import_tests`.
+        label (str): Bezeichnung der Datensätze, z. B. "Teilnehmer".
+
+    Returns:
+        None
+    """
+    if result["importiert"]:
+        st.success(f"{result['importiert']} {label} erfolgreich importiert!")
+    if not result["fehler"].empty:
+        st.warning(f"{len(result['fehler'])} Zeilen wurden wegen Fehlern nicht importiert:")
+        st.dataframe(result["fehler"])
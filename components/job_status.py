@@ -0,0 +1,40 @@
+from typing import Any, Optional
+import streamlit as st
+from utils.jobs import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    STATUS_RUNNING,
+    get_job_error,
+    get_job_progress,
+    get_job_result,
+    get_job_status,
+)
+
+
+def job_status_panel(job_id: Optional[str], label: str) -> Optional[Any]:
+    """
+    Zeigt den Stand eines Hintergrundauftrags an und liefert sein Ergebnis, sobald es vorliegt.
+
+    Args:
+        job_id (Optional[str]): Auftrags-ID oder None, wenn kein Auftrag gestartet wurde.
+        label (str): Bezeichnung des Auftrags für die Anzeige, z. B. "Bericht".
+
+    Returns:
+        Optional[Any]: Ergebnis des Auftrags oder None, solange er läuft oder fehlgeschlagen ist.
+    """
+    if job_id is None:
+        return None
+
+    status = get_job_status(job_id)
+    if status == STATUS_DONE:
+        return get_job_result(job_id)
+    if status == STATUS_FAILED:
+        st.error(f"{label} konnte nicht erstellt werden: {get_job_error(job_id)}")
+    elif status == STATUS_RUNNING:
+        done, total = get_job_progress(job_id)
+        if total:
+            st.progress(done / total, text=f"{label}: {done} von {total} erstellt")
+        else:
+            st.info(f"{label} wird im Hintergrund erstellt …")
+        st.button("Status aktualisieren", key=f"refresh_{job_id}")
+    return None
@@ -0,0 +1,51 @@
+import hmac
+import os
+import streamlit as st
+from utils.metrics import export_metrics, get_cache_summary, get_frame_summary, get_timing_summary, reset_metrics
+
+# Umgebungsvariable mit dem Admin-Passwort; ohne sie wird das Leistungspanel nicht angeboten
+ADMIN_PASSWORD_ENV = "MATHE_DATEN_ADMIN_PASSWORD"
+
+
+def is_admin() -> bool:
+    """
+    Fragt in der Seitenleiste das Admin-Passwort ab und merkt sich die Anmeldung in der Sitzung.
+
+    Returns:
+        bool: True, wenn die Sitzung als Admin angemeldet ist.
+    """
+    password = os.environ.get(ADMIN_PASSWORD_ENV)
+    if not password:
+        return False
+    if st.session_state.get("admin"):
+        return True
+    entered = st.sidebar.text_input("Admin-Passwort", type="password", key="admin_password")
+    if entered and hmac.compare_digest(entered, password):
+        st.session_state["admin"] = True
+        return True
+    return False
+
+
+def admin_metrics_panel() -> None:
+    """
+    Zeigt Admins in der Seitenleiste p50/p95 je Stufe, Cache-Trefferquoten und den
+    Speicherbedarf der geladenen Daten; die Messwerte lassen sich als JSON oder CSV exportieren.
+
+    Returns:
+        None
+    """
+    if not is_admin():
+        return
+
+    with st.sidebar.expander("Leistung"):
+        st.caption("Laufzeiten je Stufe (ms, letzte Aufrufe dieses Prozesses)")
+        st.dataframe(get_timing_summary().round(2))
+        st.caption("Caches")
+        st.dataframe(get_cache_summary())
+        st.caption("Geladene Daten")
+        st.dataframe(get_frame_summary())
+
+        st.download_button("Export (JSON)", export_metrics("json"), file_name="metrics.json", mime="application/json")
+        st.download_button("Export (CSV)", export_metrics("csv"), file_name="metrics.csv", mime="text/csv")
+        if st.button("Messwerte zurücksetzen"):
+            reset_metrics()
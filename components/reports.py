@@ -1,24 +1,119 @@
+import multiprocessing
+import os
+import re
+import tempfile
+import unicodedata
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from fpdf import FPDF
 from openpyxl import Workbook
 from io import BytesIO
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 import pandas as pd
 import streamlit as st
-from components.charts import plot_progress_chart, plot_category_averages
+from components.charts import render_progress_chart
+from components.job_status import job_status_panel
+from utils.cache import hash_key
+from utils.jobs import get_tracked_job, submit_job, track_job
+from utils.metrics import instrument
+from utils.data_loader import get_participant_tests
+from utils.processors import aggregate_progress, calculate_category_averages_batch, calculate_statistics_batch
+from utils.report_cache import create_report_file, get_cached_report, store_report_file
 
+# Version der Berichtsvorlagen; bei Layoutänderungen erhöhen, damit alte Berichte nicht mehr ausgeliefert werden
+REPORT_TEMPLATE_VERSION = 2
 
-def generate_pdf_report(participant_data: dict, progress_data: pd.DataFrame, stats: dict, averages: dict) -> BytesIO:
+# Ersatz für Zeichen außerhalb von Latin-1, die sich nicht in Buchstabe plus Akzent zerlegen lassen
+_PDF_REPLACEMENTS = str.maketrans({
+    "ı": "i", "ł": "l", "Ł": "L", "đ": "d", "Đ": "D", "œ": "oe", "Œ": "OE",
+    "–": "-", "—": "-", "„": '"', "“": '"', "”": '"', "‚": "'", "‘": "'", "’": "'", "€": "EUR",
+})
+
+
+def _pdf_text(text: str) -> str:
+    """
+    Macht Text für die Standardschriften von FPDF (Latin-1) darstellbar.
+
+    Zeichen aus Latin-1 (z. B. Umlaute) bleiben erhalten; andere werden ohne Akzent
+    geschrieben (z. B. "ğ" -> "g") oder ersetzt, notfalls durch "?".
+
+    Args:
+        text (str): Eingabetext.
+
+    Returns:
+        str: Text, der sich als Latin-1 kodieren lässt.
+    """
+    chars = []
+    for char in text.translate(_PDF_REPLACEMENTS):
+        if ord(char) < 256:
+            chars.append(char)
+            continue
+        base = "".join(c for c in unicodedata.normalize("NFKD", char) if not unicodedata.combining(c))
+        chars.append(base if base and all(ord(c) < 256 for c in base) else "?")
+    return "".join(chars)
+
+
+def _format_report_date(value) -> str:
+    """
+    Formatiert ein Datum aus Formular (Text) oder Datendatei (Timestamp) als YYYY-MM-DD.
+
+    Args:
+        value: Datum als Text, Timestamp oder leer.
+
+    Returns:
+        str: Formatiertes Datum oder leerer Text.
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    if isinstance(value, str):
+        return value
+    return pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+def _report_fields(participant_data: dict) -> dict:
     """
-    Generiert einen PDF-Bericht für einen Teilnehmer.
+    Vereinheitlicht Teilnehmerdaten aus dem Formular (entry_date) und der Datendatei (Eintrittsdatum).
+
+    Args:
+        participant_data (dict): Daten des Teilnehmers.
+
+    Returns:
+        dict: Name, SV-Nummer, Eintritts- und Austrittsdatum für die Berichte.
+    """
+    return {
+        "name": participant_data.get("name", ""),
+        "sv_number": participant_data.get("sv_number", ""),
+        "entry_date": _format_report_date(participant_data.get("entry_date", participant_data.get("Eintrittsdatum"))),
+        "exit_date": _format_report_date(participant_data.get("exit_date", participant_data.get("Austrittsdatum"))),
+    }
+
+
+@instrument("Berichte", "FPDF")
+def _build_pdf_report(
+    participant_data: dict,
+    progress_data: pd.DataFrame,
+    stats: dict,
+    averages: dict,
+    charts: Optional[Dict[str, bytes]] = None,
+) -> bytes:
+    """
+    Erstellt einen PDF-Bericht für einen Teilnehmer (ohne Cache).
 
     Args:
         participant_data (dict): Daten des Teilnehmers.
         progress_data (pd.DataFrame): Fortschrittsdaten des Teilnehmers.
         stats (dict): Statistiken des Teilnehmers.
         averages (dict): Durchschnittswerte der Kategorien.
+        charts (Optional[Dict[str, bytes]]): Bereits gerenderte Diagramme (PNG), z. B.
+            {"progress": ...}; fehlende Diagramme werden gerendert.
 
     Returns:
-        BytesIO: PDF-Bericht im Speicher.
+        bytes: PDF-Bericht.
     """
+    fields = _report_fields(participant_data)
+    charts = charts or {}
+    progress_chart = charts.get("progress") or render_progress_chart(progress_data)
+
     pdf = FPDF()
     pdf.set_auto_page_break(auto=True, margin=15)
     pdf.add_page()
@@ -29,10 +124,10 @@ def generate_pdf_report(participant_data: dict, progress_data: pd.DataFrame, sta
 
     # Teilnehmerinformationen
     pdf.set_font("Arial", size=12)
-    pdf.cell(200, 10, txt=f"Name: {participant_data['name']}", ln=True)
-    pdf.cell(200, 10, txt=f"SV-Nummer: {participant_data['sv_number']}", ln=True)
-    pdf.cell(200, 10, txt=f"Eintrittsdatum: {participant_data['entry_date']}", ln=True)
-    pdf.cell(200, 10, txt=f"Austrittsdatum: {participant_data['exit_date']}", ln=True)
+    pdf.cell(200, 10, txt=_pdf_text(f"Name: {fields['name']}"), ln=True)
+    pdf.cell(200, 10, txt=_pdf_text(f"SV-Nummer: {fields['sv_number']}"), ln=True)
+    pdf.cell(200, 10, txt=_pdf_text(f"Eintrittsdatum: {fields['entry_date']}"), ln=True)
+    pdf.cell(200, 10, txt=_pdf_text(f"Austrittsdatum: {fields['exit_date']}"), ln=True)
 
     # Statistiken
     pdf.ln(10)
@@ -45,74 +140,200 @@ def generate_pdf_report(participant_data: dict, progress_data: pd.DataFrame, sta
     pdf.ln(10)
     pdf.cell(200, 10, txt="Durchschnittswerte der Kategorien:", ln=True)
     for category, avg in averages.items():
-        pdf.cell(200, 10, txt=f"{category}: {avg}%", ln=True)
+        pdf.cell(200, 10, txt=_pdf_text(f"{category}: {avg}%"), ln=True)
 
-    # Fortschrittsdiagramm einfügen
+    # Fortschrittsdiagramm einfügen (FPDF liest Bilder nur aus Dateien)
     pdf.ln(10)
     pdf.cell(200, 10, txt="Fortschrittsdiagramm", ln=True)
-    plt_file = BytesIO()
-    plot_progress_chart(progress_data)
-    plt.savefig(plt_file, format="png")
-    plt_file.seek(0)
-    pdf.image(plt_file, x=10, y=None, w=190)
+    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as chart_file:
+        chart_file.write(progress_chart)
+    try:
+        pdf.image(chart_file.name, x=10, y=None, w=190)
+    finally:
+        os.remove(chart_file.name)
 
     # Rückgabe des PDFs
-    pdf_file = BytesIO()
-    pdf.output(pdf_file)
-    pdf_file.seek(0)
-    return pdf_file
+    return pdf.output(dest="S").encode("latin-1")
 
 
-def generate_excel_report(participant_data: dict, progress_data: pd.DataFrame, stats: dict, averages: dict) -> BytesIO:
+@instrument("Berichte")
+def generate_pdf_report(
+    participant_data: dict,
+    progress_data: pd.DataFrame,
+    stats: dict,
+    averages: dict,
+    charts: Optional[Dict[str, bytes]] = None,
+) -> BytesIO:
     """
-    Generiert einen Excel-Bericht für einen Teilnehmer.
+    Generiert einen PDF-Bericht für einen Teilnehmer; unveränderte Berichte kommen aus dem Festplatten-Cache.
+
+    Das Diagramm wird aus den Fortschrittsdaten gerendert und ist daher nicht Teil des Schlüssels.
 
     Args:
         participant_data (dict): Daten des Teilnehmers.
         progress_data (pd.DataFrame): Fortschrittsdaten des Teilnehmers.
         stats (dict): Statistiken des Teilnehmers.
         averages (dict): Durchschnittswerte der Kategorien.
+        charts (Optional[Dict[str, bytes]]): Bereits gerenderte Diagramme (PNG), z. B.
+            {"progress": ...}; fehlende Diagramme werden gerendert.
 
     Returns:
-        BytesIO: Excel-Bericht im Speicher.
+        BytesIO: PDF-Bericht im Speicher.
+    """
+    key = hash_key("pdf", REPORT_TEMPLATE_VERSION, participant_data, progress_data, stats, averages)
+    report = get_cached_report(
+        key, "pdf", lambda: _build_pdf_report(participant_data, progress_data, stats, averages, charts)
+    )
+    return BytesIO(report)
+
+
+def _excel_value(value: Any) -> Any:
+    """
+    Wandelt fehlende Werte (NaN/NaT) in leere Zellen um.
+
+    Args:
+        value (Any): Zellwert.
+
+    Returns:
+        Any: Zellwert oder None.
+    """
+    return None if not isinstance(value, str) and pd.isna(value) else value
+
+
+def _sheet_title(participant_data: dict) -> str:
+    """
+    Bildet einen gültigen, eindeutigen Tabellenblattnamen aus ID und Name (max. 31 Zeichen).
+
+    Args:
+        participant_data (dict): Daten des Teilnehmers.
+
+    Returns:
+        str: Name des Tabellenblatts.
+    """
+    name = " ".join(re.sub(r"[\\/*?:\[\]]+", " ", str(participant_data.get("name", ""))).split())
+    return f"{participant_data['ID']} {name}".strip()[:31]
+
+
+def _write_participant_sheet(ws, participant_data: dict, progress_data: pd.DataFrame, stats: dict, averages: dict) -> None:
+    """
+    Schreibt den Bericht eines Teilnehmers zeilenweise in ein Write-only-Tabellenblatt.
+
+    Args:
+        ws: Tabellenblatt aus `Workbook(write_only=True).create_sheet`.
+        participant_data (dict): Daten des Teilnehmers.
+        progress_data (pd.DataFrame): Fortschrittsdaten des Teilnehmers.
+        stats (dict): Statistiken des Teilnehmers.
+        averages (dict): Durchschnittswerte der Kategorien.
+
+    Returns:
+        None
     """
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Bericht"
+    fields = _report_fields(participant_data)
 
     # Teilnehmerinformationen
     ws.append(["Teilnehmerbericht"])
-    ws.append(["Name", participant_data["name"]])
-    ws.append(["SV-Nummer", participant_data["sv_number"]])
-    ws.append(["Eintrittsdatum", participant_data["entry_date"]])
-    ws.append(["Austrittsdatum", participant_data["exit_date"]])
+    ws.append(["Name", fields["name"]])
+    ws.append(["SV-Nummer", fields["sv_number"]])
+    ws.append(["Eintrittsdatum", fields["entry_date"]])
+    ws.append(["Austrittsdatum", fields["exit_date"]])
     ws.append([])
 
     # Statistiken
     ws.append(["Statistiken"])
-    ws.append(["Durchschnitt der letzten zwei Tests", stats["Durchschnitt_letzte_zwei"]])
+    ws.append(["Durchschnitt der letzten zwei Tests", _excel_value(stats["Durchschnitt_letzte_zwei"])])
     ws.append([])
 
     # Durchschnittswerte der Kategorien
     ws.append(["Durchschnittswerte der Kategorien"])
     for category, avg in averages.items():
-        ws.append([category, avg])
+        ws.append([category, _excel_value(avg)])
     ws.append([])
 
     # Fortschrittsdaten
     ws.append(["Fortschrittsdaten"])
     ws.append(list(progress_data.columns))
-    for row in progress_data.itertuples(index=False):
-        ws.append(list(row))
+    for row in progress_data.itertuples(index=False, name=None):
+        ws.append([_excel_value(value) for value in row])
+
+
+@instrument("Berichte", "openpyxl")
+def _build_excel_report(participant_data: dict, progress_data: pd.DataFrame, stats: dict, averages: dict) -> bytes:
+    """
+    Erstellt einen Excel-Bericht für einen Teilnehmer (ohne Cache).
+
+    Args:
+        participant_data (dict): Daten des Teilnehmers.
+        progress_data (pd.DataFrame): Fortschrittsdaten des Teilnehmers.
+        stats (dict): Statistiken des Teilnehmers.
+        averages (dict): Durchschnittswerte der Kategorien.
+
+    Returns:
+        bytes: Excel-Bericht.
+    """
+    wb = Workbook(write_only=True)
+    _write_participant_sheet(wb.create_sheet("Bericht"), participant_data, progress_data, stats, averages)
 
     # Rückgabe der Excel-Datei
     excel_file = BytesIO()
     wb.save(excel_file)
-    excel_file.seek(0)
-    return excel_file
+    return excel_file.getvalue()
+
+
+@instrument("Berichte")
+def generate_excel_report(participant_data: dict, progress_data: pd.DataFrame, stats: dict, averages: dict) -> BytesIO:
+    """
+    Generiert einen Excel-Bericht für einen Teilnehmer; unveränderte Berichte kommen aus dem Festplatten-Cache.
+
+    Args:
+        participant_data (dict): Daten des Teilnehmers.
+        progress_data (pd.DataFrame): Fortschrittsdaten des Teilnehmers.
+        stats (dict): Statistiken des Teilnehmers.
+        averages (dict): Durchschnittswerte der Kategorien.
+
+    Returns:
+        BytesIO: Excel-Bericht im Speicher.
+    """
+    key = hash_key("xlsx", REPORT_TEMPLATE_VERSION, participant_data, progress_data, stats, averages)
+    report = get_cached_report(
+        key, "xlsx", lambda: _build_excel_report(participant_data, progress_data, stats, averages)
+    )
+    return BytesIO(report)
 
 
-def download_reports(participant_data: dict, progress_data: pd.DataFrame, stats: dict, averages: dict) -> None:
+def generate_reports(
+    participant_data: dict,
+    progress_data: pd.DataFrame,
+    stats: dict,
+    averages: dict,
+    charts: Optional[Dict[str, bytes]] = None,
+) -> Dict[str, bytes]:
+    """
+    Generiert PDF- und Excel-Bericht eines Teilnehmers (z. B. als Hintergrundauftrag).
+
+    Args:
+        participant_data (dict): Teilnehmerdaten.
+        progress_data (pd.DataFrame): Fortschrittsdaten.
+        stats (dict): Statistiken.
+        averages (dict): Durchschnittswerte der Kategorien.
+        charts (Optional[Dict[str, bytes]]): Bereits gerenderte Diagramme.
+
+    Returns:
+        Dict[str, bytes]: Berichte unter den Schlüsseln "pdf" und "xlsx".
+    """
+    return {
+        "pdf": generate_pdf_report(participant_data, progress_data, stats, averages, charts).getvalue(),
+        "xlsx": generate_excel_report(participant_data, progress_data, stats, averages).getvalue(),
+    }
+
+
+def download_reports(
+    participant_data: dict,
+    progress_data: pd.DataFrame,
+    stats: dict,
+    averages: dict,
+    charts: Optional[Dict[str, bytes]] = None,
+    reports: Optional[Dict[str, bytes]] = None,
+) -> None:
     """
     Stellt die Berichte als Download zur Verfügung.
 
@@ -121,24 +342,276 @@ def download_reports(participant_data: dict, progress_data: pd.DataFrame, stats:
         progress_data (pd.DataFrame): Fortschrittsdaten.
         stats (dict): Statistiken.
         averages (dict): Durchschnittswerte der Kategorien.
+        charts (Optional[Dict[str, bytes]]): Bereits für die Seite gerenderte Diagramme.
+        reports (Optional[Dict[str, bytes]]): Bereits erstellte Berichte aus `generate_reports`;
+            fehlen sie, werden sie hier erstellt.
 
     Returns:
         None
     """
+    if reports is None:
+        reports = generate_reports(participant_data, progress_data, stats, averages, charts)
+
     # PDF-Bericht
-    pdf_report = generate_pdf_report(participant_data, progress_data, stats, averages)
     st.download_button(
         label="PDF-Bericht herunterladen",
-        data=pdf_report,
-        file_name=f"{participant_data['name']}_Bericht.pdf",
+        data=reports["pdf"],
+        file_name=f"{participant_data.get('name', 'Teilnehmer')}_Bericht.pdf",
         mime="application/pdf",
     )
 
     # Excel-Bericht
-    excel_report = generate_excel_report(participant_data, progress_data, stats, averages)
     st.download_button(
         label="Excel-Bericht herunterladen",
-        data=excel_report,
-        file_name=f"{participant_data['name']}_Bericht.xlsx",
+        data=reports["xlsx"],
+        file_name=f"{participant_data.get('name', 'Teilnehmer')}_Bericht.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     )
+
+
+def iter_report_jobs(participants: pd.DataFrame, tests: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+    """
+    Liefert die Berichtsdaten aller Teilnehmer mit Tests nacheinander.
+
+    Statistiken und Kategoriedurchschnitte werden für alle Teilnehmer in einem
+    Durchlauf berechnet; Teilnehmer mit weniger als zwei Tests erhalten NaN. Die
+    Fortschrittsdaten entstehen erst beim Abruf des jeweiligen Teilnehmers.
+
+    Args:
+        participants (pd.DataFrame): Teilnehmerdaten.
+        tests (pd.DataFrame): Bewertete, nach Teilnehmer sortierte Testdaten.
+
+    Returns:
+        Iterator[Dict[str, Any]]: Ein Auftrag je Teilnehmer.
+    """
+    stats = calculate_statistics_batch(tests)
+    averages = calculate_category_averages_batch(tests)
+    for participant_data in participants.to_dict(orient="records"):
+        participant_id = participant_data["ID"]
+        if participant_id not in stats.index:
+            continue
+        name = re.sub(r"[^\w\-]+", "_", str(participant_data.get("name", ""))).strip("_")
+        yield {
+            "file_stem": f"{participant_id}_{name}" if name else str(participant_id),
+            "participant_data": participant_data,
+            "progress_data": aggregate_progress(get_participant_tests(tests, participant_id)),
+            "stats": {"Durchschnitt_letzte_zwei": stats.at[participant_id, "Durchschnitt_letzte_zwei"]},
+            "averages": averages.loc[participant_id].to_dict(),
+        }
+
+
+def prepare_bulk_report_jobs(participants: pd.DataFrame, tests: pd.DataFrame) -> List[Dict[str, Any]]:
+    """
+    Stellt die Berichtsdaten aller Teilnehmer mit Tests zusammen.
+
+    Args:
+        participants (pd.DataFrame): Teilnehmerdaten.
+        tests (pd.DataFrame): Bewertete, nach Teilnehmer sortierte Testdaten.
+
+    Returns:
+        List[Dict[str, Any]]: Ein Auftrag je Teilnehmer für `generate_bulk_reports`.
+    """
+    return list(iter_report_jobs(participants, tests))
+
+
+@instrument("Berichte")
+def generate_cohort_workbook(
+    participants: pd.DataFrame,
+    tests: pd.DataFrame,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> BytesIO:
+    """
+    Erstellt eine Excel-Arbeitsmappe für eine Gruppe: ein Übersichtsblatt und ein Blatt je Teilnehmer.
+
+    Die Arbeitsmappe wird im Write-only-Modus geschrieben und jedes Teilnehmerblatt
+    direkt nach dem Schreiben geschlossen, sodass der Speicherbedarf nicht mit der
+    Anzahl der Zeilen wächst.
+
+    Args:
+        participants (pd.DataFrame): Teilnehmerdaten.
+        tests (pd.DataFrame): Bewertete, nach Teilnehmer sortierte Testdaten.
+        progress_callback (Optional[Callable[[int, int], None]]): Wird nach jedem
+            Teilnehmer mit (fertig, gesamt) aufgerufen.
+
+    Returns:
+        BytesIO: Excel-Arbeitsmappe im Speicher.
+    """
+    total = int(participants["ID"].isin(tests["Teilnehmer_ID"]).sum())
+    wb = Workbook(write_only=True)
+    summary = wb.create_sheet("Übersicht")
+    header_written = False
+
+    for done, job in enumerate(iter_report_jobs(participants, tests), start=1):
+        fields = _report_fields(job["participant_data"])
+        if not header_written:
+            summary.append(
+                ["ID", "Name", "SV-Nummer", "Eintrittsdatum", "Austrittsdatum", "Durchschnitt der letzten zwei Tests"]
+                + list(job["averages"].keys())
+            )
+            header_written = True
+        summary.append(
+            [job["participant_data"]["ID"], fields["name"], fields["sv_number"], fields["entry_date"], fields["exit_date"],
+             _excel_value(job["stats"]["Durchschnitt_letzte_zwei"])]
+            + [_excel_value(avg) for avg in job["averages"].values()]
+        )
+
+        ws = wb.create_sheet(_sheet_title(job["participant_data"]))
+        _write_participant_sheet(ws, job["participant_data"], job["progress_data"], job["stats"], job["averages"])
+        ws.close()
+        if progress_callback:
+            progress_callback(done, total)
+
+    excel_file = BytesIO()
+    wb.save(excel_file)
+    excel_file.seek(0)
+    return excel_file
+
+
+def _build_participant_reports(job: Dict[str, Any]) -> Tuple[str, bytes, bytes]:
+    """
+    Erstellt PDF- und Excel-Bericht eines Teilnehmers (läuft in einem Worker-Prozess).
+
+    Args:
+        job (Dict[str, Any]): Auftrag aus `prepare_bulk_report_jobs`.
+
+    Returns:
+        Tuple[str, bytes, bytes]: Dateiname ohne Endung, PDF- und Excel-Bericht.
+    """
+    args = (job["participant_data"], job["progress_data"], job["stats"], job["averages"])
+    return job["file_stem"], generate_pdf_report(*args).getvalue(), generate_excel_report(*args).getvalue()
+
+
+@instrument("Berichte")
+def generate_bulk_reports(
+    jobs: List[Dict[str, Any]],
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Erstellt die Berichte vieler Teilnehmer parallel und schreibt sie in ein ZIP-Archiv.
+
+    FPDF und matplotlib sind CPU-gebunden, daher wird auf einen Prozesspool verteilt.
+    Fertige Berichte werden in der Reihenfolge ihrer Fertigstellung in das Archiv
+    geschrieben, sodass nie alle Einzelberichte gleichzeitig im Speicher liegen. Das
+    Archiv liegt als Datei im Berichts-Cache; im Speicher (und im Auftragsergebnis)
+    bleibt nur sein Pfad. Schlägt der Bericht eines Teilnehmers fehl, werden die
+    übrigen trotzdem erstellt; die Fehler stehen zusätzlich in `Fehler.txt` im Archiv.
+
+    Args:
+        jobs (List[Dict[str, Any]]): Aufträge aus `prepare_bulk_report_jobs`.
+        max_workers (Optional[int]): Anzahl der Prozesse (Standard: Anzahl der Kerne).
+        progress_callback (Optional[Callable[[int, int], None]]): Wird nach jedem
+            Teilnehmer mit (fertig, gesamt) aufgerufen.
+
+    Returns:
+        Dict[str, Any]: "Pfad" des ZIP-Archivs mit je einem PDF- und Excel-Bericht pro
+            Teilnehmer und "Fehler" (Liste von (Datei, Fehlermeldung)).
+    """
+    temp_path = create_report_file()
+    errors = []
+    context = multiprocessing.get_context("spawn")
+    try:
+        with zipfile.ZipFile(temp_path, "w", compression=zipfile.ZIP_DEFLATED) as archive, ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=context
+        ) as executor:
+            futures = {executor.submit(_build_participant_reports, job): job["file_stem"] for job in jobs}
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    file_stem, pdf_report, excel_report = future.result()
+                except Exception as e:
+                    errors.append((futures[future], f"{type(e).__name__}: {e}"))
+                else:
+                    archive.writestr(f"{file_stem}_Bericht.pdf", pdf_report)
+                    archive.writestr(f"{file_stem}_Bericht.xlsx", excel_report)
+                if progress_callback:
+                    progress_callback(done, len(futures))
+            errors.sort()
+            if errors:
+                archive.writestr("Fehler.txt", "".join(f"{stem}: {message}\n" for stem, message in errors))
+        return {"Pfad": store_report_file(temp_path, "zip"), "Fehler": errors}
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def generate_class_reports(
+    participants: pd.DataFrame,
+    tests: pd.DataFrame,
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Stellt die Berichtsdaten zusammen und erstellt das ZIP-Archiv (z. B. als Hintergrundauftrag).
+
+    Args:
+        participants (pd.DataFrame): Teilnehmerdaten.
+        tests (pd.DataFrame): Bewertete, nach Teilnehmer sortierte Testdaten.
+        max_workers (Optional[int]): Anzahl der Prozesse.
+        progress_callback (Optional[Callable[[int, int], None]]): Fortschrittsmeldung (fertig, gesamt).
+
+    Returns:
+        Dict[str, Any]: Ergebnis aus `generate_bulk_reports` (Pfad des Archivs und Fehler).
+    """
+    return generate_bulk_reports(prepare_bulk_report_jobs(participants, tests), max_workers, progress_callback)
+
+
+def download_bulk_reports(participants: pd.DataFrame, tests: pd.DataFrame) -> None:
+    """
+    Startet die Berichterstellung für alle übergebenen Teilnehmer im Hintergrund und
+    bietet das ZIP-Archiv nach Fertigstellung als Download an.
+
+    Args:
+        participants (pd.DataFrame): Teilnehmerdaten.
+        tests (pd.DataFrame): Bewertete, nach Teilnehmer sortierte Testdaten.
+
+    Returns:
+        None
+    """
+    if st.button("Berichte für alle Teilnehmer erstellen"):
+        track_job("bulk_reports", submit_job("bulk_reports", generate_class_reports, participants, tests, report_progress=True))
+
+    result = job_status_panel(get_tracked_job("bulk_reports"), "Berichte")
+    if result is None:
+        return
+    if result["Fehler"]:
+        st.warning(f"{len(result['Fehler'])} Berichte konnten nicht erstellt werden:")
+        st.dataframe(pd.DataFrame(result["Fehler"], columns=["Datei", "Fehler"]))
+    try:
+        with open(result["Pfad"], "rb") as zip_file:
+            data = zip_file.read()
+    except FileNotFoundError:
+        st.info("Das Archiv wurde inzwischen aus dem Berichts-Cache entfernt. Bitte die Berichte neu erstellen.")
+        return
+    st.download_button(
+        label="Alle Berichte herunterladen (ZIP)",
+        data=data,
+        file_name="Berichte.zip",
+        mime="application/zip",
+    )
+
+
+def download_cohort_workbook(participants: pd.DataFrame, tests: pd.DataFrame) -> None:
+    """
+    Erstellt die Excel-Arbeitsmappe der Gruppe im Hintergrund und bietet sie nach Fertigstellung an.
+
+    Args:
+        participants (pd.DataFrame): Teilnehmerdaten.
+        tests (pd.DataFrame): Bewertete, nach Teilnehmer sortierte Testdaten.
+
+    Returns:
+        None
+    """
+    if st.button("Excel-Arbeitsmappe für alle Teilnehmer erstellen"):
+        track_job(
+            "cohort_workbook",
+            submit_job("cohort_workbook", generate_cohort_workbook, participants, tests, report_progress=True),
+        )
+
+    workbook = job_status_panel(get_tracked_job("cohort_workbook"), "Arbeitsmappe")
+    if workbook is not None:
+        st.download_button(
+            label="Excel-Arbeitsmappe herunterladen",
+            data=workbook.getvalue(),
+            file_name="Klassenbericht.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        )
@@ -0,0 +1,136 @@
+from typing import Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.dataset_store import get_shared
+
+# Wählbare Zeilenzahlen je Seite der Tabelle
+TABLE_PAGE_SIZES = (25, 50, 100, 250)
+
+# Spalten, die von der Volltextsuche der Teilnehmertabelle durchsucht werden
+PARTICIPANT_SEARCH_COLUMNS = ("name", "sv_number")
+
+
+def get_sort_order(data: pd.DataFrame, version: str, key: str, column: str, descending: bool = False) -> np.ndarray:
+    """
+    Liefert die Zeilenpositionen in Sortierreihenfolge; sie werden je Datenversion einmal berechnet.
+
+    Fehlende Werte stehen immer am Ende. Passt eine gehaltene Reihenfolge nicht zur
+    Länge von `data` (Datenstand hat sich beim Laden geändert), wird neu sortiert.
+
+    Args:
+        data (pd.DataFrame): Vollständige Tabelle.
+        version (str): Datenversion der Tabelle.
+        key (str): Name der Tabelle, z. B. "participants".
+        column (str): Sortierspalte.
+        descending (bool): Absteigend sortieren.
+
+    Returns:
+        np.ndarray: Zeilenpositionen in `data`.
+    """
+    def build() -> np.ndarray:
+        values = data[column].reset_index(drop=True)
+        return values.sort_values(ascending=not descending, na_position="last", kind="stable").index.to_numpy()
+
+    order = get_shared(("sort_order", key, column, descending), version, build)
+    return order if len(order) == len(data) else build()
+
+
+def get_search_mask(data: pd.DataFrame, version: str, key: str, query: str, columns: Sequence[str]) -> np.ndarray:
+    """
+    Markiert die Zeilen, deren Suchspalten den Suchbegriff enthalten (ohne Groß-/Kleinschreibung).
+
+    Der kleingeschriebene Suchtext je Zeile wird je Datenversion einmal aufgebaut.
+
+    Args:
+        data (pd.DataFrame): Vollständige Tabelle.
+        version (str): Datenversion der Tabelle.
+        key (str): Name der Tabelle.
+        query (str): Suchbegriff; leer trifft alle Zeilen.
+        columns (Sequence[str]): Durchsuchte Spalten.
+
+    Returns:
+        np.ndarray: Boolesche Maske über die Zeilen von `data`.
+    """
+    if not query.strip():
+        return np.ones(len(data), dtype=bool)
+
+    def build() -> pd.Series:
+        text = [data[column].fillna("").astype(str).reset_index(drop=True) for column in columns]
+        return text[0].str.cat(text[1:], sep=" ").str.lower()
+
+    haystack = get_shared(("search_text", key, tuple(columns)), version, build)
+    if len(haystack) != len(data):
+        haystack = build()
+    return haystack.str.contains(query.strip().lower(), regex=False).to_numpy()
+
+
+def select_page(
+    data: pd.DataFrame, order: np.ndarray, mask: np.ndarray, page: int, page_size: int
+) -> Tuple[pd.DataFrame, int]:
+    """
+    Wählt eine Seite der gefilterten und sortierten Tabelle aus.
+
+    Es wird nicht sortiert: die gehaltene Reihenfolge wird nur auf die Filtermaske reduziert.
+
+    Args:
+        data (pd.DataFrame): Vollständige Tabelle.
+        order (np.ndarray): Zeilenpositionen in Sortierreihenfolge (siehe `get_sort_order`).
+        mask (np.ndarray): Boolesche Filtermaske über die Zeilen von `data`.
+        page (int): Seitennummer ab 1.
+        page_size (int): Zeilen je Seite.
+
+    Returns:
+        Tuple[pd.DataFrame, int]: Zeilen der Seite und Anzahl aller gefilterten Zeilen.
+    """
+    positions = order[mask[order]]
+    start = (page - 1) * page_size
+    return data.iloc[positions[start:start + page_size]], len(positions)
+
+
+def paginated_table(
+    data: pd.DataFrame,
+    version: str,
+    key: str,
+    mask: Optional[np.ndarray] = None,
+    search_columns: Sequence[str] = PARTICIPANT_SEARCH_COLUMNS,
+) -> pd.DataFrame:
+    """
+    Zeigt eine Tabelle seitenweise an; Suche, Filter und Sortierung laufen auf dem Server.
+
+    An den Browser wird nur die sichtbare Seite übertragen, sodass Datenmenge und
+    Renderzeit nicht mit der Tabellengröße wachsen.
+
+    Args:
+        data (pd.DataFrame): Vollständige Tabelle.
+        version (str): Datenversion der Tabelle (Schlüssel der gehaltenen Sortierungen).
+        key (str): Eindeutiger Name der Tabelle für Eingabeelemente und Cache.
+        mask (Optional[np.ndarray]): Zusätzliche Filtermaske über die Zeilen (alle, wenn None).
+        search_columns (Sequence[str]): Von der Suche durchsuchte Spalten.
+
+    Returns:
+        pd.DataFrame: Die angezeigten Zeilen.
+    """
+    search_col, sort_col, direction_col, size_col = st.columns([3, 2, 1, 1])
+    query = search_col.text_input("Suche", key=f"{key}_search")
+    sort_column = sort_col.selectbox("Sortieren nach", list(data.columns), key=f"{key}_sort")
+    descending = direction_col.checkbox("Absteigend", key=f"{key}_descending")
+    page_size = size_col.selectbox("Zeilen", TABLE_PAGE_SIZES, index=1, key=f"{key}_page_size")
+
+    visible = get_search_mask(data, version, key, query, [c for c in search_columns if c in data.columns])
+    if mask is not None:
+        visible = visible & np.asarray(mask, dtype=bool)
+    order = get_sort_order(data, version, key, sort_column, descending)
+
+    total = int(visible.sum())
+    page_count = max((total + page_size - 1) // page_size, 1)
+    if st.session_state.get(f"{key}_page", 1) > page_count:
+        # Nach einer Filteränderung auf die letzte vorhandene Seite springen
+        st.session_state[f"{key}_page"] = page_count
+    page = st.number_input("Seite", min_value=1, max_value=page_count, step=1, key=f"{key}_page")
+
+    rows, total = select_page(data, order, visible, int(page), page_size)
+    st.dataframe(rows)
+    first = (page - 1) * page_size + 1 if total else 0
+    st.caption(f"Zeilen {first}–{first + len(rows) - 1 if total else 0} von {total} (Seite {page} von {page_count})")
+    return rows
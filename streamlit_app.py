@@ -1,121 +1,279 @@
+import functools
+import numpy as np
+import pandas as pd
 import streamlit as st
-from components.forms import participant_form, test_form, update_exit_date_form
-from components.charts import plot_progress_chart, plot_category_averages, plot_prediction_chart
-from components.reports import download_reports
+from components.forms import (
+    import_form,
+    participant_form,
+    participant_picker,
+    show_import_result,
+    test_form,
+    update_exit_date_form,
+)
+from components.job_status import job_status_panel
+from components.metrics_panel import admin_metrics_panel
+from components.tables import paginated_table
 from utils.data_loader import (
-    load_participants,
+    load_participants_with_index,
     load_tests,
-    save_data,
+    get_participant_tests,
+    get_data_version,
     get_active_participants,
-    get_inactive_participants,
+    load_search_index,
 )
 from utils.processors import (
-    calculate_test_percentages,
     aggregate_progress,
     calculate_statistics,
-    prepare_prediction_data,
     calculate_category_averages,
+    calculate_statistics_batch,
+    calculate_category_averages_batch,
+    calculate_trends_batch,
+    get_participants_needing_attention,
 )
+from utils.aggregates import load_aggregates, record_tests
+from utils.bulk_import import import_participants, import_tests
+from utils.dataset_store import get_shared
+from utils.enrollment import count_active, enrollment_timeline
+from utils.jobs import get_tracked_job, submit_job, track_job
+from utils.storage import get_data_path
+from utils.write_coordinator import WriteConflictError, commit_rows
+
+# Diagramme (matplotlib), Berichte (fpdf/openpyxl) und Prognosen (scikit-learn) werden erst auf
+# den Seiten importiert, die sie benötigen; Python lädt jedes Modul nur beim ersten Aufruf.
 
 # Streamlit-Konfiguration
 st.set_page_config(page_title="Mathematik-Kurs Verwaltung", layout="wide")
 
-# Globale Dateipfade (Simulation einer Datenbank)
-PARTICIPANTS_FILE = "data/participants.csv"
-TESTS_FILE = "data/tests.csv"
+# Copy-on-Write: Sitzungen erhalten flache Sichten auf prozessweit geteilte DataFrames
+# (utils.dataset_store); erst eine Änderung kopiert die betroffene Spalte.
+pd.set_option("mode.copy_on_write", True)
+
+# Globale Dateipfade (Simulation einer Datenbank), Format über MATHE_DATEN_STORAGE wählbar
+PARTICIPANTS_FILE = get_data_path("participants")
+TESTS_FILE = get_data_path("tests")
 
-# Daten laden
-participants = load_participants(PARTICIPANTS_FILE)
+# Altersgruppen der Teilnehmerübersicht (jeweils von einschließlich bis ausschließlich)
+AGE_GROUP_BINS = [0, 18, 25, 35, 45, 55, 65, 120]
+
+# Daten laden (Version vor dem Laden, damit die Konfliktprüfung beim Speichern nichts übersieht)
+participants_version = get_data_version(PARTICIPANTS_FILE)
+participants, enrollment_index = load_participants_with_index(PARTICIPANTS_FILE)
+search_index = load_search_index(PARTICIPANTS_FILE)
 tests = load_tests(TESTS_FILE)
+aggregates = load_aggregates(TESTS_FILE)
+trends = get_shared(("trends", TESTS_FILE), get_data_version(TESTS_FILE), lambda: calculate_trends_batch(tests))
 
 # Hauptmenü
 st.title("Mathematik-Kurs Verwaltung")
 menu = st.sidebar.radio("Navigation", ["Teilnehmer", "Tests", "Berichte", "Prognosen"])
+admin_metrics_panel()
 
 if menu == "Teilnehmer":
     st.header("Teilnehmerverwaltung")
 
     # Anzeige der Teilnehmer
     show_all = st.checkbox("Alle Teilnehmer anzeigen (inkl. Inaktive)")
-    if show_all:
-        st.dataframe(participants)
-    else:
-        active_participants = get_active_participants(participants)
-        st.dataframe(active_participants)
+    shown = np.ones(len(participants), dtype=bool) if show_all else participants["Aktiv"].to_numpy(dtype=bool)
+
+    # Filter und Gruppierung nach Alter (beim Laden aus der SV-Nummer abgeleitet)
+    ages = participants["Alter"].dropna()
+    if not ages.empty:
+        min_age, max_age = int(ages.min()), int(ages.max())
+        if min_age < max_age:
+            age_range = st.slider("Alter", min_value=min_age, max_value=max_age, value=(min_age, max_age))
+            shown &= participants["Alter"].between(*age_range).fillna(False).to_numpy(dtype=bool)
+
+    # Suche, Sortierung und Blättern auf dem Server; übertragen wird nur die sichtbare Seite
+    # Alter und Aktiv-Status ändern sich täglich, daher gehört der Tag zur Version der Sortierungen
+    table_version = f"{participants_version}|{pd.Timestamp.today().date().isoformat()}"
+    paginated_table(participants, table_version, "participants", mask=shown)
+    shown_participants = participants[shown]
+
+    with st.expander("Altersgruppen"):
+        age_groups = pd.cut(shown_participants["Alter"].astype(float), bins=AGE_GROUP_BINS, right=False)
+        counts = age_groups.value_counts(sort=False).rename("Anzahl")
+        st.dataframe(counts.set_axis(counts.index.astype(str)).rename_axis("Alter"))
+
+    # Belegung zu einem Stichtag und im Zeitverlauf
+    with st.expander("Belegung"):
+        on_date = st.date_input("Stichtag", key="occupancy_date")
+        st.metric("Eingeschrieben am Stichtag", count_active(enrollment_index, on_date))
+        if not participants.empty:
+            interval = st.radio("Zeitraster", ["Wöchentlich", "Monatlich"], horizontal=True)
+            last_exit = participants["Austrittsdatum"].max()
+            end = pd.Timestamp.today() if pd.isna(last_exit) else max(last_exit, pd.Timestamp.today())
+            timeline = enrollment_timeline(
+                enrollment_index,
+                participants["Eintrittsdatum"].min(),
+                end,
+                freq="W-MON" if interval == "Wöchentlich" else "MS",
+            )
+            st.line_chart(timeline)
 
     # Teilnehmer hinzufügen
     st.subheader("Teilnehmer hinzufügen")
     new_participant = participant_form()
     if new_participant:
-        participants = participants.append(new_participant, ignore_index=True)
-        save_data(participants, PARTICIPANTS_FILE)
+        new_row = {
+            "name": new_participant["name"],
+            "sv_number": new_participant["sv_number"],
+            "Eintrittsdatum": new_participant["entry_date"],
+            "Austrittsdatum": new_participant["exit_date"],
+        }
+        # Die ID wird erst beim Speichern vergeben, damit parallele Sitzungen keine ID doppelt nutzen
+        commit_rows(pd.DataFrame([new_row]), PARTICIPANTS_FILE, key="ID", assign_ids=True)
 
     # Austrittsdatum ändern
     st.subheader("Austrittsdatum aktualisieren")
-    updated_exit = update_exit_date_form(participants.to_dict(orient="records"))
+    updated_exit = update_exit_date_form(search_index, participants)
     if updated_exit:
-        participants.loc[
-            participants["ID"] == updated_exit["participant_id"], "Austrittsdatum"
-        ] = updated_exit["new_exit_date"]
-        save_data(participants, PARTICIPANTS_FILE)
+        changed = participants["ID"] == updated_exit["participant_id"]
+        base_rows = participants.loc[changed]
+        try:
+            commit_rows(
+                base_rows.assign(Austrittsdatum=pd.to_datetime(updated_exit["new_exit_date"])),
+                PARTICIPANTS_FILE,
+                key="ID",
+                expected_version=participants_version,
+                base_rows=base_rows,
+            )
+        except WriteConflictError as e:
+            st.error(f"Fehler: {e}")
+
+    # Teilnehmer aus Datei importieren
+    st.subheader("Teilnehmer importieren")
+    upload = import_form("CSV- oder Excel-Datei mit Teilnehmern", key="participants_import")
+    if upload is not None:
+        try:
+            show_import_result(import_participants(upload, PARTICIPANTS_FILE), "Teilnehmer")
+        except ValueError as e:
+            st.error(f"Fehler: {e}")
 
 elif menu == "Tests":
+    from components.charts import plot_progress_chart
+
     st.header("Testmanagement")
 
+    participant_id = participant_picker(search_index, "Wähle einen Teilnehmer", key="tests")
+
     # Test hinzufügen
     st.subheader("Test hinzufügen")
-    new_test = test_form()
+    new_test = test_form(participant_id)
     if new_test:
-        new_test_df = pd.DataFrame(new_test["scores"])
-        new_test_df["Teilnehmer_ID"] = new_test["participant_id"]
-        new_test_df["Testdatum"] = new_test["test_date"]
-        tests = tests.append(new_test_df, ignore_index=True)
-        save_data(tests, TESTS_FILE)
+        new_row = {"Teilnehmer_ID": participant_id, "Testdatum": new_test["test_date"]}
+        for score in new_test["scores"]:
+            new_row[f"{score['category']}_Erreicht"] = score["reached_points"]
+            new_row[f"{score['category']}_Max"] = score["max_points"]
+        new_test_df = pd.DataFrame([new_row])
+        commit_rows(new_test_df, TESTS_FILE, on_commit=functools.partial(record_tests, TESTS_FILE))
+
+    # Tests aus Datei importieren
+    st.subheader("Tests importieren")
+    upload = import_form("CSV- oder Excel-Datei mit Tests", key="tests_import")
+    if upload is not None:
+        try:
+            show_import_result(import_tests(upload, participants, TESTS_FILE), "Tests")
+        except ValueError as e:
+            st.error(f"Fehler: {e}")
 
     # Testergebnisse visualisieren
     st.subheader("Testergebnisse visualisieren")
-    participant_id = st.selectbox("Wähle einen Teilnehmer", participants["ID"].tolist())
-    participant_tests = tests[tests["Teilnehmer_ID"] == participant_id]
-    if not participant_tests.empty:
-        participant_tests = calculate_test_percentages(participant_tests)
-        progress_data = aggregate_progress(participant_tests, participant_id)
-        plot_progress_chart(progress_data)
+    if participant_id is not None:
+        participant_tests = get_participant_tests(tests, participant_id)
+        if not participant_tests.empty:
+            progress_data = aggregate_progress(participant_tests)
+            plot_progress_chart(progress_data)
 
 elif menu == "Berichte":
+    from components.charts import render_progress_chart, render_category_averages
+    from components.reports import download_reports, download_bulk_reports, download_cohort_workbook, generate_reports
+
     st.header("Berichtserstellung")
 
-    participant_id = st.selectbox("Wähle einen Teilnehmer für den Bericht", participants["ID"].tolist())
-    participant_tests = tests[tests["Teilnehmer_ID"] == participant_id]
+    active_participants = get_active_participants(participants, index=enrollment_index)
+
+    # Klassenübersicht aller aktiven Teilnehmer
+    with st.expander("Klassenübersicht"):
+        class_overview = get_shared(
+            ("class_overview", TESTS_FILE),
+            get_data_version(TESTS_FILE),
+            lambda: calculate_statistics_batch(tests).join(calculate_category_averages_batch(tests)),
+        )
+        st.dataframe(class_overview.reindex(active_participants["ID"].values))
+        download_bulk_reports(active_participants, tests)
+        download_cohort_workbook(active_participants, tests)
+
+    # Aktive Teilnehmer mit rückläufigen Ergebnissen
+    with st.expander("Teilnehmer mit Handlungsbedarf"):
+        active_trends = trends[trends.index.isin(active_participants["ID"])]
+        attention = get_participants_needing_attention(active_trends)
+        if attention.empty:
+            st.write("Derzeit zeigt kein aktiver Teilnehmer einen rückläufigen Trend.")
+        else:
+            st.dataframe(attention.join(participants.set_index("ID")["name"]))
+
+    participant_id = participant_picker(search_index, "Wähle einen Teilnehmer für den Bericht", key="report")
+    if participant_id is None:
+        st.stop()
+    participant_tests = get_participant_tests(tests, participant_id)
 
     if not participant_tests.empty:
         # Berichtsdaten
-        stats = calculate_statistics(participant_tests, participant_id)
-        averages = calculate_category_averages(participant_tests)
-        progress_data = aggregate_progress(participant_tests, participant_id)
+        stats = calculate_statistics(participant_tests, aggregate=aggregates.get(participant_id))
+        averages = calculate_category_averages(participant_tests, aggregate=aggregates.get(participant_id))
+        progress_data = aggregate_progress(participant_tests)
 
-        # Visualisierung
+        # Visualisierung (einmal gerendert, für Seite und Bericht verwendet)
+        charts = {
+            "progress": render_progress_chart(progress_data),
+            "categories": render_category_averages(averages),
+        }
         st.subheader("Fortschrittsübersicht")
-        plot_progress_chart(progress_data)
+        st.image(charts["progress"])
 
         st.subheader("Kategoriedurchschnittswerte")
-        plot_category_averages(averages)
+        st.image(charts["categories"])
 
-        # Bericht generieren
+        # Bericht im Hintergrund generieren; das Ergebnis bleibt über Reruns abrufbar
+        participant_data = participants.loc[participants["ID"] == participant_id].to_dict(orient="records")[0]
+        report_job = f"report_{participant_id}"
         if st.button("Bericht generieren"):
-            participant_data = participants.loc[participants["ID"] == participant_id].to_dict(orient="records")[0]
-            download_reports(participant_data, progress_data, stats, averages)
-            st.success(f"Bericht für {participant_data['name']} wurde erstellt!")
+            track_job(report_job, submit_job("report", generate_reports, participant_data, progress_data, stats, averages, charts))
+        reports = job_status_panel(get_tracked_job(report_job), "Bericht")
+        if reports is not None:
+            download_reports(participant_data, progress_data, stats, averages, reports=reports)
+            st.success(f"Bericht für {participant_data.get('name', participant_id)} wurde erstellt!")
 
 elif menu == "Prognosen":
+    from components.charts import plot_prediction_chart
+    from utils.forecasting import get_forecaster, get_participant_forecast
+
     st.header("Prognose")
 
-    participant_id = st.selectbox("Wähle einen Teilnehmer für die Prognose", participants["ID"].tolist())
-    participant_tests = tests[tests["Teilnehmer_ID"] == participant_id]
+    participant_id = participant_picker(search_index, "Wähle einen Teilnehmer für die Prognose", key="forecast")
+    if participant_id is None:
+        st.stop()
 
-    if not participant_tests.empty:
-        # Prognosedaten vorbereiten
-        prediction_data = prepare_prediction_data(participant_tests, participant_id)
+    # Trend aus allen bisherigen Tests
+    if participant_id in trends.index:
+        trend = trends.loc[participant_id]
+        col1, col2 = st.columns(2)
+        col1.metric("Trend (Prozentpunkte pro Woche)", f"{trend['Steigung'] * 7:.2f}")
+        col2.metric("Streuung um den Trend", f"{trend['Residuenstreuung']:.2f}")
 
-        # Beispiel: Einbindung eines AutoML-Modells
-        prediction_data["Gesamtprozentsatz"] = prediction_data["Gesamtprozentsatz"] * 1.05  # Platzhalter
-        plot_prediction_chart(prediction_data)
+    # Das Modell wird im Hintergrund je Datenversion trainiert; bis dahin gilt der letzte Stand
+    forecaster = get_forecaster(TESTS_FILE, tests)
+    if forecaster is None:
+        st.info("Das Prognosemodell wird im Hintergrund trainiert …")
+        st.button("Status aktualisieren")
+    else:
+        if forecaster["Datenversion"] != get_data_version(TESTS_FILE):
+            st.caption("Die Prognose beruht auf dem vorherigen Datenstand; das Modell wird gerade aktualisiert.")
+        forecast = get_participant_forecast(forecaster, participant_id)
+        if forecast.empty:
+            st.info("Für diesen Teilnehmer liegen nicht genügend Testdaten für eine Prognose vor.")
+        else:
+            # Letzter Test als Ausgangspunkt der Prognosekurve
+            progress_data = aggregate_progress(get_participant_tests(tests, participant_id))
+            plot_prediction_chart(pd.concat([progress_data.tail(1), forecast], ignore_index=True))
+            st.dataframe(forecast)
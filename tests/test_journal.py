@@ -0,0 +1,47 @@
+import pandas as pd
+from utils.data_loader import append_data, get_journal_path, read_with_journal
+
+
+def _participants(ids):
+    return pd.DataFrame({
+        "ID": ids,
+        "name": [f"Teilnehmer {i}" for i in ids],
+        "sv_number": ["1234010190"] * len(ids),
+        "Eintrittsdatum": pd.to_datetime(["2024-01-01"] * len(ids)),
+        "Austrittsdatum": pd.to_datetime(["2024-12-31"] * len(ids)),
+    })
+
+
+def test_torn_journal_line_is_ignored_and_repaired(tmp_path):
+    file_path = str(tmp_path / "participants.csv")
+    _participants([1, 2]).to_csv(file_path, index=False)
+    append_data(_participants([3]), file_path, key="ID")
+
+    # Abgebrochener Schreibvorgang: letzte Zeile ohne Zeilenende und mit zu wenigen Feldern
+    with open(get_journal_path(file_path), "a", encoding="utf-8") as journal:
+        journal.write("1,Anna Mü")
+
+    data = read_with_journal(file_path, key="ID")
+    assert data["ID"].tolist() == [1, 2, 3]
+    assert data.loc[data["ID"] == 1, "name"].item() == "Teilnehmer 1"
+    assert data.loc[data["ID"] == 1, "sv_number"].item() == "1234010190"
+
+    # Das nächste Anhängen schneidet die halbe Zeile ab, statt daran anzuhängen
+    append_data(_participants([4]), file_path, key="ID")
+    data = read_with_journal(file_path, key="ID")
+    assert data["ID"].tolist() == [1, 2, 3, 4]
+    assert data["Eintrittsdatum"].notna().all()
+    with open(get_journal_path(file_path), encoding="utf-8") as journal:
+        assert "Anna Mü" not in journal.read()
+
+
+def test_journal_rows_with_wrong_field_count_are_skipped(tmp_path):
+    file_path = str(tmp_path / "participants.csv")
+    _participants([1]).to_csv(file_path, index=False)
+    append_data(_participants([2]), file_path, key="ID")
+    with open(get_journal_path(file_path), "a", encoding="utf-8") as journal:
+        journal.write("1,Anna\n")
+
+    data = read_with_journal(file_path, key="ID")
+    assert data["ID"].tolist() == [1, 2]
+    assert data.loc[data["ID"] == 1, "name"].item() == "Teilnehmer 1"
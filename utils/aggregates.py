@@ -0,0 +1,286 @@
+import json
+import math
+import os
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+import pandas as pd
+from utils.data_loader import get_data_version, load_tests
+from utils.dataset_store import get_shared, peek_shared, set_shared
+from utils.processors import CATEGORIES, score_tests
+from utils.write_coordinator import file_lock
+
+# Endung der Aggregatdatei neben der Testdatei (eine JSON-Zeile je Aktualisierung)
+AGGREGATES_SUFFIX = ".aggregates.jsonl"
+
+# Ab dieser Dateigröße (Bytes) wird die Aggregatdatei auf eine Zeile je Teilnehmer verdichtet
+MAX_AGGREGATES_BYTES = 1_000_000
+
+# Bezugsdatum für die Trendberechnung (Tage seit diesem Datum)
+_EPOCH = pd.Timestamp("1970-01-01")
+
+
+def get_aggregates_path(tests_file: str) -> str:
+    """
+    Liefert den Pfad der Aggregatdatei zu einer Testdatei.
+
+    Args:
+        tests_file (str): Pfad zur Testdatei.
+
+    Returns:
+        str: Pfad zur Aggregatdatei.
+    """
+    return f"{tests_file}{AGGREGATES_SUFFIX}"
+
+
+def _empty_aggregate(participant_id: int) -> Dict[str, Any]:
+    """
+    Erzeugt ein leeres Aggregat für einen Teilnehmer.
+
+    Args:
+        participant_id (int): ID des Teilnehmers.
+
+    Returns:
+        Dict[str, Any]: Aggregat ohne Tests.
+    """
+    return {
+        "Teilnehmer_ID": int(participant_id),
+        "Anzahl": 0,
+        "Summen": {cat: 0.0 for cat in CATEGORIES},
+        "Gezaehlt": {cat: 0 for cat in CATEGORIES},
+        "Letzte_zwei": [],
+        "Erster_Test": None,
+        "Letzter_Test": None,
+        "Trend": {"n": 0, "sx": 0.0, "sy": 0.0, "sxy": 0.0, "sxx": 0.0},
+    }
+
+
+def update_aggregate(aggregate: Optional[Dict[str, Any]], test: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Schreibt einen bewerteten Test in O(1) in das Aggregat eines Teilnehmers ein.
+
+    Args:
+        aggregate (Optional[Dict[str, Any]]): Bisheriges Aggregat oder None.
+        test (Dict[str, Any]): Bewerteter Test mit `Teilnehmer_ID`, `Testdatum`,
+            `<Kategorie>_Prozent` und `Gesamtprozentsatz`.
+
+    Returns:
+        Dict[str, Any]: Neues Aggregat (das bisherige bleibt unverändert).
+    """
+    updated = json.loads(json.dumps(aggregate)) if aggregate else _empty_aggregate(test["Teilnehmer_ID"])
+    test_date = pd.Timestamp(test["Testdatum"])
+    total = float(test["Gesamtprozentsatz"])
+
+    updated["Anzahl"] += 1
+    for cat in CATEGORIES:
+        value = float(test[f"{cat}_Prozent"])
+        if not math.isnan(value):
+            updated["Summen"][cat] += value
+            updated["Gezaehlt"][cat] += 1
+
+    # Die zwei jüngsten Tests, absteigend nach Datum; bei gleichem Datum gilt der neuere Eintrag
+    # (er steht vorne, und die Sortierung ist stabil)
+    latest = [[test_date.strftime("%Y-%m-%d"), total]] + updated["Letzte_zwei"]
+    latest.sort(key=lambda entry: entry[0], reverse=True)
+    updated["Letzte_zwei"] = latest[:2]
+
+    date_text = test_date.strftime("%Y-%m-%d")
+    if updated["Erster_Test"] is None or date_text < updated["Erster_Test"]:
+        updated["Erster_Test"] = date_text
+    if updated["Letzter_Test"] is None or date_text > updated["Letzter_Test"]:
+        updated["Letzter_Test"] = date_text
+
+    x = float((test_date - _EPOCH).days)
+    trend = updated["Trend"]
+    trend["n"] += 1
+    trend["sx"] += x
+    trend["sy"] += total
+    trend["sxy"] += x * total
+    trend["sxx"] += x * x
+    return updated
+
+
+def build_aggregates(tests: pd.DataFrame) -> Dict[int, Dict[str, Any]]:
+    """
+    Baut die Aggregate aller Teilnehmer vollständig aus den bewerteten Testdaten auf.
+
+    Args:
+        tests (pd.DataFrame): Bewertete Testdaten, sortiert nach (Teilnehmer_ID, Testdatum).
+
+    Returns:
+        Dict[int, Dict[str, Any]]: Aggregate je Teilnehmer-ID.
+    """
+    if tests.empty:
+        return {}
+    percent_columns = [f"{cat}_Prozent" for cat in CATEGORIES]
+    grouped = tests.groupby("Teilnehmer_ID", sort=True)
+    sums = grouped[percent_columns].sum()
+    counts = grouped[percent_columns].count()
+    first_dates = grouped["Testdatum"].min()
+    last_dates = grouped["Testdatum"].max()
+
+    x = (tests["Testdatum"] - _EPOCH).dt.days.astype(float)
+    y = tests["Gesamtprozentsatz"].astype(float)
+    trend = pd.DataFrame({"n": 1, "sx": x, "sy": y, "sxy": x * y, "sxx": x * x}).groupby(tests["Teilnehmer_ID"]).sum()
+
+    latest = tests.sort_values(by=["Teilnehmer_ID", "Testdatum"], kind="mergesort").groupby("Teilnehmer_ID").tail(2)
+    latest_two: Dict[int, list] = {}
+    for participant_id, test_date, total in zip(latest["Teilnehmer_ID"], latest["Testdatum"], latest["Gesamtprozentsatz"]):
+        latest_two.setdefault(int(participant_id), []).insert(0, [test_date.strftime("%Y-%m-%d"), float(total)])
+
+    aggregates = {}
+    for participant_id in sums.index:
+        key = int(participant_id)
+        aggregates[key] = {
+            "Teilnehmer_ID": key,
+            "Anzahl": int(trend.at[participant_id, "n"]),
+            "Summen": {cat: float(sums.at[participant_id, f"{cat}_Prozent"]) for cat in CATEGORIES},
+            "Gezaehlt": {cat: int(counts.at[participant_id, f"{cat}_Prozent"]) for cat in CATEGORIES},
+            "Letzte_zwei": latest_two[key],
+            "Erster_Test": first_dates.at[participant_id].strftime("%Y-%m-%d"),
+            "Letzter_Test": last_dates.at[participant_id].strftime("%Y-%m-%d"),
+            "Trend": {column: float(trend.at[participant_id, column]) for column in ["n", "sx", "sy", "sxy", "sxx"]},
+        }
+    return aggregates
+
+
+def _write_aggregates(tests_file: str, aggregates: Dict[int, Dict[str, Any]], version: str) -> None:
+    """
+    Schreibt die Aggregatdatei neu (eine Zeile je Teilnehmer), atomar über eine temporäre Datei.
+
+    Der Aufrufer hält die Sperre der Aggregatdatei.
+
+    Args:
+        tests_file (str): Pfad zur Testdatei.
+        aggregates (Dict[int, Dict[str, Any]]): Aggregate je Teilnehmer-ID.
+        version (str): Datenversion der Testdaten, zu der die Aggregate gehören.
+
+    Returns:
+        None
+    """
+    path = get_aggregates_path(tests_file)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as file:
+            file.write("".join(json.dumps({**aggregate, "Datenversion": version}) + "\n" for aggregate in aggregates.values()))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _read_aggregates(tests_file: str, version: str) -> Dict[int, Dict[str, Any]]:
+    """
+    Liest die Aggregatdatei oder baut sie neu auf, falls sie fehlt oder nicht zur Datenversion passt.
+
+    Für einen Neuaufbau werden die Tests erst nach Bestimmen der Version geladen. Sie sind
+    damit mindestens so neu wie die Version, mit der die Datei gestempelt wird; ein
+    zwischenzeitlicher Schreibvorgang führt beim nächsten Laden zu einem erneuten Aufbau.
+
+    Args:
+        tests_file (str): Pfad zur Testdatei.
+        version (str): Datenversion der Testdaten, für die die Aggregate gelten sollen.
+
+    Returns:
+        Dict[int, Dict[str, Any]]: Aggregate je Teilnehmer-ID.
+    """
+    path = get_aggregates_path(tests_file)
+    aggregates: Dict[int, Dict[str, Any]] = {}
+    last_version = None
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    record = json.loads(line)
+                    last_version = record.pop("Datenversion", None)
+                    aggregates[int(record["Teilnehmer_ID"])] = record
+
+    if last_version != version:
+        aggregates = build_aggregates(load_tests(tests_file))
+        with file_lock(path):
+            _write_aggregates(tests_file, aggregates, version)
+    return aggregates
+
+
+def load_aggregates(tests_file: str) -> Mapping[int, Dict[str, Any]]:
+    """
+    Lädt die Aggregate aller Teilnehmer, prozessweit geteilt je Datenversion.
+
+    Geliefert wird eine schreibgeschützte Sicht auf die Tabelle der Datei. Das Aggregat
+    eines Teilnehmers ist unveränderlich; nach dem Speichern neuer Tests ersetzt
+    `record_tests` nur die Einträge der betroffenen Teilnehmer. Einzelne Einträge werden
+    daher mit `get` bzw. `[]` gelesen, nicht über die ganze Tabelle iteriert.
+
+    Args:
+        tests_file (str): Pfad zur Testdatei.
+
+    Returns:
+        Mapping[int, Dict[str, Any]]: Aggregate je Teilnehmer-ID (nicht verändern).
+    """
+    version = get_data_version(tests_file)
+    return MappingProxyType(get_shared(("aggregates", tests_file), version, lambda: _read_aggregates(tests_file, version)))
+
+
+def record_tests(tests_file: str, rows: pd.DataFrame, before: str, after: str) -> None:
+    """
+    Schreibt gerade gespeicherte Tests in die Aggregate ein, ohne die Testdaten erneut zu lesen.
+
+    Gedacht als `on_commit` von `utils.write_coordinator.commit_rows`: Der Aufruf erfolgt
+    unter der Sperre der Testdatei mit allen Zeilen des Schreibvorgangs und den
+    Datenversionen davor und danach. Nur wenn die geteilten Aggregate genau auf dem Stand
+    `before` sind, werden die Einträge der betroffenen Teilnehmer ersetzt (O(Zeilen)), je
+    eine Zeile an die Aggregatdatei angehängt und alles unter `after` registriert. Sonst
+    (z. B. nach einem Import ohne Aktualisierung) bleibt der Stand veraltet und wird beim
+    nächsten `load_aggregates` vollständig neu aufgebaut.
+
+    Args:
+        tests_file (str): Pfad zur Testdatei.
+        rows (pd.DataFrame): Gespeicherte Testzeilen mit Punkten.
+        before (str): Datenversion vor dem Schreibvorgang.
+        after (str): Datenversion nach dem Schreibvorgang.
+
+    Returns:
+        None
+    """
+    path = get_aggregates_path(tests_file)
+    key = ("aggregates", tests_file)
+
+    with file_lock(path):
+        entry = peek_shared(key)
+        if entry is None or entry[0] != before or not os.path.exists(path):
+            return
+        aggregates = entry[1]
+
+        changed = {}
+        for test in score_tests(rows).to_dict(orient="records"):
+            participant_id = int(test["Teilnehmer_ID"])
+            changed[participant_id] = update_aggregate(changed.get(participant_id, aggregates.get(participant_id)), test)
+        with open(path, "a", encoding="utf-8") as file:
+            file.write("".join(json.dumps({**aggregate, "Datenversion": after}) + "\n" for aggregate in changed.values()))
+            file.flush()
+            os.fsync(file.fileno())
+
+        # Jeder Eintrag wird als Ganzes ersetzt; Leser sehen den alten oder den neuen Stand
+        for participant_id, aggregate in changed.items():
+            aggregates[participant_id] = aggregate
+        if os.path.getsize(path) > MAX_AGGREGATES_BYTES:
+            _write_aggregates(tests_file, aggregates, after)
+        set_shared(key, after, aggregates)
+
+
+def get_trend(aggregate: Dict[str, Any]) -> float:
+    """
+    Liefert die Steigung der Regressionsgeraden des Gesamtprozentsatzes (Prozentpunkte pro Tag).
+
+    Args:
+        aggregate (Dict[str, Any]): Aggregat eines Teilnehmers.
+
+    Returns:
+        float: Steigung oder NaN bei weniger als zwei unterschiedlichen Testdaten.
+    """
+    trend = aggregate["Trend"]
+    denominator = trend["n"] * trend["sxx"] - trend["sx"] ** 2
+    if trend["n"] < 2 or denominator <= 0:
+        return float("nan")
+    return (trend["n"] * trend["sxy"] - trend["sx"] * trend["sy"]) / denominator
@@ -0,0 +1,116 @@
+import os
+from typing import Any, BinaryIO, Dict, Iterable
+import pandas as pd
+from utils.processors import CATEGORIES
+from utils.validators import parse_import_dates, validate_participants_frame, validate_tests_frame
+from utils.write_coordinator import commit_rows
+
+# Spaltennamen aus dem Teilnehmerformular, die beim Import auf die gespeicherten Namen abgebildet werden
+PARTICIPANT_COLUMN_ALIASES = {"entry_date": "Eintrittsdatum", "exit_date": "Austrittsdatum"}
+
+# Pflichtspalten einer Importdatei
+PARTICIPANT_IMPORT_COLUMNS = ["name", "sv_number", "Eintrittsdatum", "Austrittsdatum"]
+TEST_IMPORT_COLUMNS = ["Teilnehmer_ID", "Testdatum"] + [
+    f"{cat}_{kind}" for cat in CATEGORIES for kind in ("Erreicht", "Max")
+]
+
+
+def read_upload(file: BinaryIO, file_name: str) -> pd.DataFrame:
+    """
+    Liest eine hochgeladene CSV- oder Excel-Datei; alle Werte bleiben zunächst Text.
+
+    Args:
+        file (BinaryIO): Dateiinhalt, z. B. aus `st.file_uploader`.
+        file_name (str): Dateiname zur Erkennung des Formats.
+
+    Returns:
+        pd.DataFrame: Gelesene Zeilen.
+    """
+    extension = os.path.splitext(file_name)[1].lower()
+    if extension == ".csv":
+        return pd.read_csv(file, dtype=str, keep_default_na=False)
+    if extension in (".xlsx", ".xlsm"):
+        return pd.read_excel(file, dtype=str, keep_default_na=False, engine="openpyxl")
+    raise ValueError(f"Nicht unterstütztes Dateiformat: {extension or file_name}. Erlaubt sind CSV und Excel (.xlsx).")
+
+
+def _require_columns(data: pd.DataFrame, columns: Iterable[str]) -> None:
+    """
+    Prüft, ob alle Pflichtspalten vorhanden sind.
+
+    Args:
+        data (pd.DataFrame): Importierte Daten.
+        columns (Iterable[str]): Pflichtspalten.
+
+    Returns:
+        None
+    """
+    missing = [column for column in columns if column not in data.columns]
+    if missing:
+        raise ValueError(f"Fehlende Spalten in der Importdatei: {', '.join(missing)}.")
+
+
+def _error_report(errors: pd.Series) -> pd.DataFrame:
+    """
+    Erstellt den Fehlerbericht aus den Fehlermeldungen je Zeile.
+
+    Args:
+        errors (pd.Series): Fehlermeldungen je Zeile (leer für gültige Zeilen).
+
+    Returns:
+        pd.DataFrame: Spalten `Zeile` (Zeilennummer in der Datei inkl. Kopfzeile) und `Fehler`.
+    """
+    invalid = errors[errors != ""]
+    return pd.DataFrame({"Zeile": invalid.index.to_numpy() + 2, "Fehler": invalid.to_numpy()})
+
+
+def import_participants(upload: pd.DataFrame, file_path: str) -> Dict[str, Any]:
+    """
+    Validiert importierte Teilnehmer und speichert alle gültigen Zeilen mit einem Schreibvorgang.
+
+    Neue Teilnehmer erhalten beim Speichern fortlaufende IDs ab der höchsten gespeicherten ID.
+
+    Args:
+        upload (pd.DataFrame): Gelesene Importdatei (siehe `read_upload`).
+        file_path (str): Pfad zur Teilnehmerdatei.
+
+    Returns:
+        Dict[str, Any]: "importiert" (Anzahl gespeicherter Zeilen) und "fehler" (Fehlerbericht).
+    """
+    upload = upload.rename(columns=PARTICIPANT_COLUMN_ALIASES).reset_index(drop=True)
+    _require_columns(upload, PARTICIPANT_IMPORT_COLUMNS)
+
+    errors = validate_participants_frame(upload)
+    valid = upload[errors == ""]
+    if not valid.empty:
+        rows = pd.DataFrame({
+            "name": valid["name"].str.strip().to_numpy(),
+            "sv_number": valid["sv_number"].str.strip().to_numpy(),
+            "Eintrittsdatum": parse_import_dates(valid["Eintrittsdatum"]).to_numpy(),
+            "Austrittsdatum": parse_import_dates(valid["Austrittsdatum"]).to_numpy(),
+        })
+        commit_rows(rows, file_path, key="ID", assign_ids=True)
+    return {"importiert": len(valid), "fehler": _error_report(errors)}
+
+
+def import_tests(upload: pd.DataFrame, participants: pd.DataFrame, file_path: str) -> Dict[str, Any]:
+    """
+    Validiert importierte Tests und speichert alle gültigen Zeilen mit einem Schreibvorgang.
+
+    Args:
+        upload (pd.DataFrame): Gelesene Importdatei (siehe `read_upload`).
+        participants (pd.DataFrame): Vorhandene Teilnehmer (für die Prüfung der IDs).
+        file_path (str): Pfad zur Testdatei.
+
+    Returns:
+        Dict[str, Any]: "importiert" (Anzahl gespeicherter Zeilen) und "fehler" (Fehlerbericht).
+    """
+    upload = upload.reset_index(drop=True)
+    _require_columns(upload, TEST_IMPORT_COLUMNS)
+
+    errors = validate_tests_frame(upload, CATEGORIES, participant_ids=participants["ID"])
+    valid = upload.loc[errors == "", TEST_IMPORT_COLUMNS]
+    if not valid.empty:
+        rows = valid.apply(pd.to_numeric, errors="coerce").assign(Testdatum=parse_import_dates(valid["Testdatum"]))
+        commit_rows(rows.astype({column: int for column in TEST_IMPORT_COLUMNS if column != "Testdatum"}), file_path)
+    return {"importiert": len(valid), "fehler": _error_report(errors)}
@@ -1,5 +1,9 @@
+import hashlib
+import json
+import pandas as pd
 import streamlit as st
 from typing import Callable, Any
+from utils.dataset_store import clear_shared
 
 
 @st.cache_data(ttl=3600, max_entries=100)
@@ -34,6 +38,55 @@ def cache_resource(func: Callable, *args, **kwargs) -> Any:
     return func(*args, **kwargs)
 
 
+def _update_hash(digest: "hashlib._Hash", part: Any) -> None:
+    """
+    Schreibt einen Bestandteil rekursiv in einen Hash.
+
+    Args:
+        digest (hashlib._Hash): Hash-Objekt.
+        part (Any): DataFrame, Series, Dictionary, Liste/Tupel oder einfacher Wert.
+
+    Returns:
+        None
+    """
+    if isinstance(part, (pd.DataFrame, pd.Series)):
+        columns = part.columns if isinstance(part, pd.DataFrame) else [part.name]
+        digest.update(json.dumps([str(column) for column in columns]).encode())
+        digest.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+    elif isinstance(part, dict):
+        digest.update(b"{")
+        for key in sorted(part, key=str):
+            _update_hash(digest, str(key))
+            _update_hash(digest, part[key])
+        digest.update(b"}")
+    elif isinstance(part, (list, tuple)):
+        digest.update(b"[")
+        for item in part:
+            _update_hash(digest, item)
+        digest.update(b"]")
+    elif isinstance(part, bytes):
+        digest.update(hashlib.sha256(part).digest())
+    else:
+        digest.update(json.dumps(part, default=str).encode())
+    digest.update(b"\x00")
+
+
+def hash_key(*parts: Any) -> str:
+    """
+    Bildet einen stabilen Inhalts-Hash über DataFrames, Dictionaries und einfache Werte.
+
+    Args:
+        *parts: Zu hashende Bestandteile, z. B. Eingabedaten und Parameter.
+
+    Returns:
+        str: SHA-256-Hash als Hex-String.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        _update_hash(digest, part)
+    return digest.hexdigest()
+
+
 def clear_cache() -> None:
     """
     Löscht den Streamlit-Cache.
@@ -43,6 +96,7 @@ def clear_cache() -> None:
     """
     st.cache_data.clear()
     st.cache_resource.clear()
+    clear_shared()
     st.success("Cache wurde erfolgreich gelöscht.")
 
 
@@ -1,54 +1,362 @@
+import csv
+import io
+import os
+import numpy as np
 import pandas as pd
 import datetime
-from streamlit.runtime.caching import cache_data
+from typing import Any, Dict, List, Optional, Tuple
+from utils.dataset_store import get_shared, get_shared_frame
+from utils.enrollment import DateLike, active_positions, build_enrollment_index
+from utils.helpers import parse_sv_numbers
+from utils.metrics import instrument, record_frame
+from utils.processors import has_score_columns, score_tests
+from utils.search_index import build_search_index
+from utils.storage import DATE_COLUMNS, TEXT_COLUMNS, Filters, apply_filters, read_columns, read_table, write_table
 
+# Endung der Journal-Datei, in die neue und geänderte Zeilen angehängt werden
+JOURNAL_SUFFIX = ".journal"
 
-@cache_data(ttl=3600)
-def load_participants(file_path: str) -> pd.DataFrame:
+# Ab dieser Journalgröße (Bytes) wird das Journal in die Basisdatei eingefaltet
+MAX_JOURNAL_BYTES = 1_000_000
+
+
+def get_data_version(file_path: str) -> str:
+    """
+    Liefert ein Versionskennzeichen aus Änderungszeit und Größe von Basisdatei und Journal.
+
+    Jeder Schreibvorgang über `append_data`, `compact_data` oder `save_data` ändert das
+    Kennzeichen. Es geht in die Cache-Schlüssel der Loader und abgeleiteter Ergebnisse
+    ein, sodass ein Schreibvorgang nur den betroffenen Datensatz invalidiert.
+
+    Args:
+        file_path (str): Pfad zur Datendatei.
+
+    Returns:
+        str: Versionskennzeichen, z. B. "1700000000000000000:2048|-".
+    """
+    parts = []
+    for path in (file_path, get_journal_path(file_path)):
+        try:
+            stat = os.stat(path)
+            parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+        except FileNotFoundError:
+            parts.append("-")
+    return "|".join(parts)
+
+
+@instrument("Laden")
+def load_participants(file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Lädt die Teilnehmerdaten und hält sie bis zur nächsten Änderung der Datei prozessweit vor.
+
+    Alle Sitzungen erhalten eine Sicht auf denselben DataFrame (siehe `utils.dataset_store`).
+    Aus der SV-Nummer werden beim Laden die Spalten `Geburtsdatum` und `Alter` abgeleitet.
+
+    Args:
+        file_path (str): Pfad zur Datendatei (CSV, Parquet oder Feather).
+        columns (Optional[List[str]]): Zu ladende Spalten (alle, wenn None).
+
+    Returns:
+        pd.DataFrame: Teilnehmerdaten als DataFrame.
     """
-    Lädt die Teilnehmerdaten aus einer CSV-Datei und cached sie.
+    key = ("participants", file_path, tuple(columns) if columns is not None else None)
+    # Aktiv-Status und Alter hängen vom Tag ab und werden daher täglich neu berechnet
+    version = f"{get_data_version(file_path)}|{datetime.date.today().isoformat()}"
+    return get_shared_frame(key, version, lambda: _read_participants(file_path, columns))
+
+
+def _read_participants(file_path: str, columns: Optional[List[str]]) -> pd.DataFrame:
+    """
+    Liest die Teilnehmerdaten von der Festplatte.
 
     Args:
-        file_path (str): Pfad zur CSV-Datei.
+        file_path (str): Pfad zur Datendatei.
+        columns (Optional[List[str]]): Zu ladende Spalten.
 
     Returns:
         pd.DataFrame: Teilnehmerdaten als DataFrame.
     """
-    data = pd.read_csv(file_path)
-    data["Eintrittsdatum"] = pd.to_datetime(data["Eintrittsdatum"])
-    data["Austrittsdatum"] = pd.to_datetime(data["Austrittsdatum"])
-    data["Aktiv"] = data["Austrittsdatum"] > datetime.date.today()
+    data = read_with_journal(file_path, key="ID", columns=columns)
+    if "Eintrittsdatum" in data.columns and "Austrittsdatum" in data.columns:
+        active = np.zeros(len(data), dtype=bool)
+        active[active_positions(build_enrollment_index(data), datetime.date.today())] = True
+        data["Aktiv"] = active
+    if "sv_number" in data.columns:
+        data[["Geburtsdatum", "Alter"]] = parse_sv_numbers(data["sv_number"])
+    if columns is None:
+        record_frame(os.path.basename(file_path), data)
     return data
 
 
-@cache_data(ttl=3600)
-def load_tests(file_path: str) -> pd.DataFrame:
+@instrument("Laden")
+def load_tests(
+    file_path: str, participant_id: Optional[int] = None, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
     """
-    Lädt die Testdaten aus einer CSV-Datei und cached sie.
+    Lädt die Testdaten und hält sie bis zur nächsten Änderung der Datei prozessweit vor.
+
+    Die Daten werden nach (Teilnehmer_ID, Testdatum) sortiert zurückgegeben und dienen
+    damit zugleich als Teilnehmerindex für `get_participant_tests`. Sind alle
+    Punktespalten geladen, enthalten sie bereits die Prozentspalten aus `score_tests`.
 
     Args:
-        file_path (str): Pfad zur CSV-Datei.
+        file_path (str): Pfad zur Datendatei (CSV, Parquet oder Feather).
+        participant_id (Optional[int]): Lädt nur die Tests dieses Teilnehmers.
+        columns (Optional[List[str]]): Zu ladende Spalten (alle, wenn None).
 
     Returns:
         pd.DataFrame: Testdaten als DataFrame.
     """
-    data = pd.read_csv(file_path)
-    data["Testdatum"] = pd.to_datetime(data["Testdatum"])
+    key = ("tests", file_path, participant_id, tuple(columns) if columns is not None else None)
+    return get_shared_frame(
+        key, get_data_version(file_path), lambda: _read_tests(file_path, participant_id, columns)
+    )
+
+
+def _read_tests(file_path: str, participant_id: Optional[int], columns: Optional[List[str]]) -> pd.DataFrame:
+    """
+    Liest die Testdaten von der Festplatte, sortiert sie nach Teilnehmer und berechnet
+    einmalig die Prozentspalten für alle Tests.
+
+    Args:
+        file_path (str): Pfad zur Datendatei.
+        participant_id (Optional[int]): Lädt nur die Tests dieses Teilnehmers.
+        columns (Optional[List[str]]): Zu ladende Spalten.
+
+    Returns:
+        pd.DataFrame: Sortierte Testdaten als DataFrame.
+    """
+    filters = [("Teilnehmer_ID", "==", participant_id)] if participant_id is not None else None
+    data = index_tests_by_participant(read_with_journal(file_path, columns=columns, filters=filters))
+    if has_score_columns(data):
+        data = score_tests(data)
+    if participant_id is None and columns is None:
+        record_frame(os.path.basename(file_path), data)
     return data
 
 
+def index_tests_by_participant(tests: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sortiert die Testdaten nach (Teilnehmer_ID, Testdatum), sodass die Tests eines
+    Teilnehmers einen zusammenhängenden Zeilenbereich bilden.
+
+    Args:
+        tests (pd.DataFrame): Testdaten.
+
+    Returns:
+        pd.DataFrame: Sortierte Testdaten mit fortlaufendem Index.
+    """
+    sort_columns = [column for column in ["Teilnehmer_ID", "Testdatum"] if column in tests.columns]
+    if not sort_columns:
+        return tests
+    return tests.sort_values(by=sort_columns, kind="mergesort").reset_index(drop=True)
+
+
+def get_journal_path(file_path: str) -> str:
+    """
+    Liefert den Pfad der Journal-Datei zu einer Datendatei.
+
+    Args:
+        file_path (str): Pfad zur Datendatei.
+
+    Returns:
+        str: Pfad zur zugehörigen Journal-Datei.
+    """
+    return f"{file_path}{JOURNAL_SUFFIX}"
+
+
+def _read_journal_text(journal_path: str) -> str:
+    """
+    Liest den vollständig geschriebenen Teil des Journals.
+
+    Eine Zeile ohne Zeilenende stammt von einem abgebrochenen Schreibvorgang und wird
+    verworfen, ebenso Zeilen, deren Feldanzahl nicht zur Kopfzeile passt.
+
+    Args:
+        journal_path (str): Pfad zur Journal-Datei.
+
+    Returns:
+        str: CSV-Text mit Kopfzeile und allen vollständigen Zeilen (leer ohne vollständige Kopfzeile).
+    """
+    with open(journal_path, encoding="utf-8", newline="") as journal:
+        text = journal.read()
+    text = text[: text.rfind("\n") + 1]
+    if not text:
+        return ""
+
+    records = list(csv.reader(io.StringIO(text)))
+    if all(len(record) == len(records[0]) for record in records):
+        return text
+    complete = io.StringIO()
+    csv.writer(complete, lineterminator="\n").writerows(
+        record for record in records if len(record) == len(records[0])
+    )
+    return complete.getvalue()
+
+
+def _repair_journal_tail(journal_path: str) -> None:
+    """
+    Schneidet eine unvollständige letzte Journalzeile (ohne Zeilenende) ab, damit neue
+    Zeilen nicht an einen abgebrochenen Schreibvorgang angehängt werden.
+
+    Args:
+        journal_path (str): Pfad zur Journal-Datei.
+
+    Returns:
+        None
+    """
+    with open(journal_path, "rb+") as journal:
+        size = journal.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        journal.seek(size - 1)
+        if journal.read(1) == b"\n":
+            return
+        # Rückwärts bis zum letzten Zeilenende suchen
+        position = size
+        while position > 0:
+            start = max(position - 4096, 0)
+            journal.seek(start)
+            chunk = journal.read(position - start)
+            newline = chunk.rfind(b"\n")
+            if newline >= 0:
+                journal.truncate(start + newline + 1)
+                return
+            position = start
+        journal.truncate(0)
+
+
+def read_with_journal(
+    file_path: str,
+    key: Optional[str] = None,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Filters] = None,
+) -> pd.DataFrame:
+    """
+    Liest die Basisdatei und führt sie mit dem Journal zusammen.
+
+    Ohne Schlüssel werden die Journalzeilen angehängt. Mit Schlüssel ersetzt die
+    letzte Journalzeile je Schlüssel die bestehende Zeile an ihrer ursprünglichen
+    Position, neue Schlüssel werden angehängt. Das Journal ist unabhängig vom
+    Speicherformat eine CSV-Datei.
+
+    Args:
+        file_path (str): Pfad zur Datendatei.
+        key (Optional[str]): Spalte, die eine Zeile eindeutig identifiziert.
+        columns (Optional[List[str]]): Zu ladende Spalten (alle, wenn None).
+        filters (Optional[Filters]): Filterliste, z. B. [("Teilnehmer_ID", "==", 7)].
+
+    Returns:
+        pd.DataFrame: Zusammengeführte Daten.
+    """
+    load_columns = columns
+    if columns is not None and key is not None and key not in columns:
+        load_columns = [key] + list(columns)
+
+    data = read_table(file_path, columns=load_columns, filters=filters)
+    journal_path = get_journal_path(file_path)
+    journal_text = _read_journal_text(journal_path) if os.path.exists(journal_path) else ""
+    if not journal_text:
+        return data if columns is None else data[list(columns)]
+
+    journal_columns = pd.read_csv(io.StringIO(journal_text), nrows=0).columns
+    if load_columns is not None:
+        filter_columns = [column for column, _, _ in filters or []]
+        journal_columns = [c for c in journal_columns if c in load_columns or c in filter_columns]
+    date_columns = [column for column in DATE_COLUMNS if column in journal_columns]
+    text_columns = {column: str for column in TEXT_COLUMNS if column in journal_columns}
+    journal = pd.read_csv(
+        io.StringIO(journal_text), usecols=journal_columns, parse_dates=date_columns, dtype=text_columns
+    )
+    if key is None:
+        journal = apply_filters(journal, filters)
+
+    merged = pd.concat([data, journal], ignore_index=True)
+    if key is not None:
+        latest = merged.drop_duplicates(subset=key, keep="last").set_index(key)
+        order = merged[key].drop_duplicates(keep="first")
+        merged = latest.loc[order.values].reset_index()
+        merged = apply_filters(merged, filters)
+    merged = merged[data.columns.union(journal.columns, sort=False)]
+    return merged if columns is None else merged[list(columns)]
+
+
+def append_data(rows: pd.DataFrame, file_path: str, key: Optional[str] = None) -> None:
+    """
+    Hängt neue oder geänderte Zeilen an das Journal an, ohne die Basisdatei neu zu schreiben.
+
+    Die Kosten hängen nur von der Anzahl der Zeilen in `rows` ab. Eine unvollständige
+    letzte Zeile eines abgebrochenen Schreibvorgangs wird vorher abgeschnitten.
+    Überschreitet das Journal `MAX_JOURNAL_BYTES`, wird es mit `compact_data` in die
+    Basisdatei eingefaltet. Parallele Schreiber müssen über `utils.write_coordinator`
+    serialisiert werden.
+
+    Args:
+        rows (pd.DataFrame): Anzuhängende Zeilen.
+        file_path (str): Pfad zur Datendatei.
+        key (Optional[str]): Spalte, über die geänderte Zeilen zugeordnet werden.
+
+    Returns:
+        None
+    """
+    journal_path = get_journal_path(file_path)
+    if os.path.exists(journal_path):
+        _repair_journal_tail(journal_path)
+    if os.path.exists(journal_path) and os.path.getsize(journal_path) > 0:
+        columns = pd.read_csv(journal_path, nrows=0).columns
+        text = rows.reindex(columns=columns).to_csv(header=False, index=False)
+    else:
+        columns = read_columns(file_path) if os.path.exists(file_path) else rows.columns
+        text = rows.reindex(columns=columns).to_csv(index=False)
+
+    # Ein einziger Schreibaufruf je Aufruf; nach fsync sind die Zeilen dauerhaft gespeichert
+    with open(journal_path, "a", encoding="utf-8", newline="") as journal:
+        journal.write(text)
+        journal.flush()
+        os.fsync(journal.fileno())
+
+    if os.path.getsize(journal_path) > MAX_JOURNAL_BYTES:
+        compact_data(file_path, key=key)
+
+
+def compact_data(file_path: str, key: Optional[str] = None) -> None:
+    """
+    Faltet das Journal in die Basisdatei ein und entfernt es anschließend.
+
+    Args:
+        file_path (str): Pfad zur Datendatei.
+        key (Optional[str]): Spalte, über die geänderte Zeilen zugeordnet werden.
+
+    Returns:
+        None
+    """
+    journal_path = get_journal_path(file_path)
+    if not os.path.exists(journal_path):
+        return
+    data = read_with_journal(file_path, key=key)
+    write_table(data, file_path)
+    os.remove(journal_path)
+
+
 def save_data(data: pd.DataFrame, file_path: str) -> None:
     """
-    Speichert einen DataFrame in eine CSV-Datei.
+    Speichert einen DataFrame vollständig im zur Dateiendung passenden Format.
+
+    Da `data` den vollständigen Stand enthält, wird ein vorhandenes Journal verworfen.
+    Für einzelne neue oder geänderte Zeilen ist `append_data` vorzuziehen; parallele
+    Schreiber müssen über `utils.write_coordinator` serialisiert werden.
 
     Args:
         data (pd.DataFrame): Zu speichernde Daten.
-        file_path (str): Pfad zur CSV-Datei.
+        file_path (str): Pfad zur Datendatei.
 
     Returns:
         None
     """
-    data.to_csv(file_path, index=False)
+    write_table(data, file_path)
+    journal_path = get_journal_path(file_path)
+    if os.path.exists(journal_path):
+        os.remove(journal_path)
 
 
 def add_participant(participants: pd.DataFrame, participant_data: dict) -> pd.DataFrame:
@@ -80,31 +388,133 @@ def update_exit_date(participants: pd.DataFrame, participant_id: int, new_exit_d
         pd.DataFrame: Aktualisierte Teilnehmerdaten.
     """
     participants.loc[participants["ID"] == participant_id, "Austrittsdatum"] = pd.to_datetime(new_exit_date)
-    participants["Aktiv"] = participants["Austrittsdatum"] > datetime.date.today()
+    participants["Aktiv"] = participants["Austrittsdatum"] > pd.Timestamp(datetime.date.today())
     return participants
 
 
-def get_active_participants(participants: pd.DataFrame) -> pd.DataFrame:
+@instrument("Filter")
+def get_participant_tests(tests: pd.DataFrame, participant_id: int) -> pd.DataFrame:
+    """
+    Liefert die Tests eines Teilnehmers per binärer Suche statt per Maske über alle Zeilen.
+
+    Args:
+        tests (pd.DataFrame): Nach `index_tests_by_participant` sortierte Testdaten.
+        participant_id (int): ID des Teilnehmers.
+
+    Returns:
+        pd.DataFrame: Tests des Teilnehmers, sortiert nach Testdatum.
+    """
+    participant_ids = tests["Teilnehmer_ID"].to_numpy()
+    start = np.searchsorted(participant_ids, participant_id, side="left")
+    stop = np.searchsorted(participant_ids, participant_id, side="right")
+    return tests.iloc[start:stop]
+
+
+def load_participants_with_index(file_path: str) -> Tuple[pd.DataFrame, Dict[str, np.ndarray]]:
+    """
+    Lädt die Teilnehmerdaten zusammen mit dem Intervallindex ihrer Teilnahmezeiträume.
+
+    DataFrame und Index werden gemeinsam je Datenversion geteilt. Die Zeilenpositionen
+    des Index passen so immer zu genau diesem DataFrame, auch wenn eine andere
+    Sitzung zwischen zwei Ladevorgängen schreibt.
+
+    Args:
+        file_path (str): Pfad zur Teilnehmerdatei.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, np.ndarray]]: Teilnehmerdaten wie aus `load_participants`
+            und Index aus `utils.enrollment.build_enrollment_index`.
+    """
+    version = f"{get_data_version(file_path)}|{datetime.date.today().isoformat()}"
+    participants, index = get_shared(("enrollment", file_path), version, lambda: _read_enrollment(file_path))
+    return participants.copy(deep=False), index
+
+
+def _read_enrollment(file_path: str) -> Tuple[pd.DataFrame, Dict[str, np.ndarray]]:
     """
-    Filtert die aktiven Teilnehmer.
+    Lädt die Teilnehmerdaten und baut den Intervallindex aus genau diesem DataFrame.
+
+    Args:
+        file_path (str): Pfad zur Teilnehmerdatei.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, np.ndarray]]: Teilnehmerdaten und Index.
+    """
+    participants = load_participants(file_path)
+    return participants, build_enrollment_index(participants)
+
+
+def load_search_index(file_path: str) -> Dict[str, Any]:
+    """
+    Lädt den Suchindex über Name, ID und SV-Nummer, prozessweit geteilt je Datenversion.
+
+    Args:
+        file_path (str): Pfad zur Teilnehmerdatei.
+
+    Returns:
+        Dict[str, Any]: Index aus `utils.search_index.build_search_index`.
+    """
+    return get_shared(
+        ("search_index", file_path),
+        get_data_version(file_path),
+        lambda: build_search_index(load_participants(file_path)),
+    )
+
+
+@instrument("Filter")
+def get_active_participants(
+    participants: pd.DataFrame, on_date: Optional[DateLike] = None, index: Optional[Dict[str, np.ndarray]] = None
+) -> pd.DataFrame:
+    """
+    Filtert die an einem Tag eingeschriebenen Teilnehmer (Eintrittsdatum <= Tag < Austrittsdatum).
 
     Args:
         participants (pd.DataFrame): Teilnehmerdaten.
+        on_date (Optional[DateLike]): Stichtag (Standard: heute).
+        index (Optional[Dict[str, np.ndarray]]): Intervallindex genau dieses DataFrames, z. B.
+            aus `load_participants_with_index`; ohne Angabe wird er neu aufgebaut.
 
     Returns:
         pd.DataFrame: Aktive Teilnehmer.
     """
-    return participants[participants["Aktiv"]]
+    index = index if index is not None else build_enrollment_index(participants)
+    on_date = on_date if on_date is not None else datetime.date.today()
+    return participants.iloc[active_positions(index, on_date)]
 
 
-def get_inactive_participants(participants: pd.DataFrame) -> pd.DataFrame:
+@instrument("Filter")
+def get_inactive_participants(
+    participants: pd.DataFrame, on_date: Optional[DateLike] = None, index: Optional[Dict[str, np.ndarray]] = None
+) -> pd.DataFrame:
     """
-    Filtert die inaktiven Teilnehmer.
+    Filtert die an einem Tag nicht eingeschriebenen Teilnehmer.
 
     Args:
         participants (pd.DataFrame): Teilnehmerdaten.
+        on_date (Optional[DateLike]): Stichtag (Standard: heute).
+        index (Optional[Dict[str, np.ndarray]]): Intervallindex genau dieses DataFrames.
 
     Returns:
         pd.DataFrame: Inaktive Teilnehmer.
     """
-    return participants[~participants["Aktiv"]]
+    index = index if index is not None else build_enrollment_index(participants)
+    on_date = on_date if on_date is not None else datetime.date.today()
+    inactive = np.ones(len(participants), dtype=bool)
+    inactive[active_positions(index, on_date)] = False
+    return participants[inactive]
+
+
+@instrument("Filter")
+def filter_by_age(participants: pd.DataFrame, min_age: int, max_age: int) -> pd.DataFrame:
+    """
+    Filtert Teilnehmer nach Alter (beide Grenzen eingeschlossen).
+
+    Args:
+        participants (pd.DataFrame): Teilnehmerdaten mit der Spalte `Alter`.
+        min_age (int): Mindestalter.
+        max_age (int): Höchstalter.
+
+    Returns:
+        pd.DataFrame: Teilnehmer im Altersbereich; ohne gültiges Alter werden sie ausgelassen.
+    """
+    return participants[participants["Alter"].between(min_age, max_age).fillna(False).astype(bool)]
@@ -0,0 +1,127 @@
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import pandas as pd
+from cachetools import LRUCache
+from utils.metrics import record_cache_access
+
+# Maximale Anzahl gleichzeitig gehaltener Datensätze (inkl. abgeleiteter Ergebnisse)
+MAX_SHARED_ENTRIES = 32
+
+
+class _SharedEntries(LRUCache):
+    """
+    LRU-Speicher der geteilten Datensätze; mit einem verdrängten Eintrag entfällt auch seine Schlüsselsperre.
+    """
+
+    def popitem(self):
+        key, value = super().popitem()
+        # Eine gerade gehaltene Sperre bleibt, damit wartende Sitzungen nicht doppelt bauen
+        key_lock = _key_locks.get(key)
+        if key_lock is not None and not key_lock.locked():
+            del _key_locks[key]
+        return key, value
+
+
+# Prozessweiter Speicher: Schlüssel -> (Version, Objekt). Als Modulvariable überdauert er
+# Reruns und Sitzungen und funktioniert auch außerhalb der Streamlit-Laufzeit.
+_entries: _SharedEntries = _SharedEntries(maxsize=MAX_SHARED_ENTRIES)
+_key_locks: Dict[Hashable, threading.Lock] = {}
+_store_lock = threading.Lock()
+
+
+def get_shared(key: Hashable, version: str, builder: Callable[[], Any]) -> Any:
+    """
+    Liefert ein prozessweit geteiltes Objekt für eine Datenversion und baut es bei Bedarf.
+
+    Pro Schlüssel wird nur die aktuelle Version gehalten; eine neue Version ersetzt die
+    alte, sodass der Speicherbedarf nicht mit der Anzahl der Sitzungen wächst. Das
+    Objekt darf von Aufrufern nicht verändert werden.
+
+    Args:
+        key (Hashable): Schlüssel des Datensatzes, z. B. ("tests", "data/tests.csv").
+        version (str): Datenversion, z. B. aus `get_data_version`.
+        builder (Callable[[], Any]): Erzeugt das Objekt für die aktuelle Version.
+
+    Returns:
+        Any: Das geteilte Objekt.
+    """
+    with _store_lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] == version:
+            record_cache_access("Datensätze", hit=True)
+            return entry[1]
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    # Pro Schlüssel baut nur eine Sitzung, die übrigen warten auf das Ergebnis
+    with key_lock:
+        with _store_lock:
+            entry = _entries.get(key)
+            if entry is not None and entry[0] == version:
+                record_cache_access("Datensätze", hit=True)
+                return entry[1]
+        record_cache_access("Datensätze", hit=False)
+        value = builder()
+        with _store_lock:
+            _entries[key] = (version, value)
+        return value
+
+
+def set_shared(key: Hashable, version: str, value: Any) -> None:
+    """
+    Legt ein bereits berechnetes Objekt für eine Datenversion ab und ersetzt den bisherigen Stand.
+
+    Args:
+        key (Hashable): Schlüssel des Datensatzes.
+        version (str): Datenversion.
+        value (Any): Objekt dieser Version (wird danach nicht mehr verändert).
+
+    Returns:
+        None
+    """
+    with _store_lock:
+        _entries[key] = (version, value)
+
+
+def peek_shared(key: Hashable) -> Optional[Tuple[str, Any]]:
+    """
+    Liefert den aktuell gehaltenen Stand eines Schlüssels, ohne ihn zu bauen.
+
+    Args:
+        key (Hashable): Schlüssel des Datensatzes.
+
+    Returns:
+        Optional[Tuple[str, Any]]: (Version, Objekt) oder None, wenn nichts gehalten wird.
+    """
+    with _store_lock:
+        return _entries.get(key)
+
+
+def get_shared_frame(key: Hashable, version: str, builder: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+    """
+    Liefert eine unveränderliche Sicht auf einen geteilten DataFrame.
+
+    Die Sicht teilt den Speicher mit dem geteilten DataFrame. Mit Copy-on-Write
+    (`mode.copy_on_write`, beim Start der App gesetzt) kopiert eine Seite Daten erst,
+    wenn sie die Sicht tatsächlich verändert.
+
+    Args:
+        key (Hashable): Schlüssel des Datensatzes.
+        version (str): Datenversion.
+        builder (Callable[[], pd.DataFrame]): Lädt den DataFrame für die aktuelle Version.
+
+    Returns:
+        pd.DataFrame: Flache Kopie (Sicht) des geteilten DataFrames.
+    """
+    return get_shared(key, version, builder).copy(deep=False)
+
+
+def clear_shared() -> None:
+    """
+    Verwirft alle geteilten Datensätze.
+
+    Returns:
+        None
+    """
+    with _store_lock:
+        _entries.clear()
+        _key_locks.clear()
@@ -0,0 +1,135 @@
+import datetime
+from typing import Dict, Union
+import numpy as np
+import pandas as pd
+
+# Zeitpunkt als Datum, Text (YYYY-MM-DD) oder Timestamp
+DateLike = Union[str, datetime.date, pd.Timestamp]
+
+# Stellvertreter für fehlende Ein- bzw. Austrittsdaten (offenes Intervall)
+_OPEN_START = np.iinfo(np.int64).min
+_OPEN_END = np.iinfo(np.int64).max
+
+
+def _to_ns(value: DateLike) -> int:
+    """
+    Wandelt einen Zeitpunkt in Nanosekunden seit 1970 um.
+
+    Args:
+        value (DateLike): Zeitpunkt.
+
+    Returns:
+        int: Nanosekunden seit 1970.
+    """
+    return pd.Timestamp(value).value
+
+
+def build_enrollment_index(participants: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Baut einen Intervallindex über die Teilnahmezeiträume [Eintrittsdatum, Austrittsdatum).
+
+    Ein Teilnehmer gilt am Tag t als eingeschrieben, wenn Eintrittsdatum <= t < Austrittsdatum.
+    Fehlt das Austrittsdatum, ist der Zeitraum nach oben offen. Aus den sortierten
+    Ein- und Austrittsdaten ergibt sich die Belegung zu jedem Zeitpunkt mit zwei
+    binären Suchen. Liegt ein Austritt vor dem Eintritt, wird er auf das
+    Eintrittsdatum angehoben (leerer Zeitraum), damit die Zählung stimmt.
+
+    Args:
+        participants (pd.DataFrame): Teilnehmerdaten mit `Eintrittsdatum` und `Austrittsdatum`.
+
+    Returns:
+        Dict[str, np.ndarray]: Index mit "Eintritt" (sortierte Eintrittsdaten), "Position"
+            (Zeilenpositionen in dieser Reihenfolge), "Austritt_je_Eintritt" (Austrittsdaten
+            in dieser Reihenfolge) und "Austritt" (sortierte Austrittsdaten), alle als int64-ns.
+    """
+    starts = pd.to_datetime(participants["Eintrittsdatum"]).to_numpy(dtype="datetime64[ns]").view("int64")
+    ends = pd.to_datetime(participants["Austrittsdatum"]).to_numpy(dtype="datetime64[ns]").view("int64")
+    nat = np.datetime64("NaT").view("int64")
+    starts = np.where(starts == nat, _OPEN_START, starts)
+    ends = np.where(ends == nat, _OPEN_END, ends)
+    ends = np.maximum(ends, starts)
+
+    order = np.argsort(starts, kind="stable")
+    return {
+        "Eintritt": starts[order],
+        "Position": order,
+        "Austritt_je_Eintritt": ends[order],
+        "Austritt": np.sort(ends),
+    }
+
+
+def count_active(index: Dict[str, np.ndarray], on_date: DateLike) -> int:
+    """
+    Zählt die an einem Tag eingeschriebenen Teilnehmer in O(log n).
+
+    Args:
+        index (Dict[str, np.ndarray]): Index aus `build_enrollment_index`.
+        on_date (DateLike): Stichtag.
+
+    Returns:
+        int: Anzahl der eingeschriebenen Teilnehmer.
+    """
+    t = _to_ns(on_date)
+    started = np.searchsorted(index["Eintritt"], t, side="right")
+    ended = np.searchsorted(index["Austritt"], t, side="right")
+    return int(started - ended)
+
+
+def count_enrolled_between(index: Dict[str, np.ndarray], start: DateLike, end: DateLike) -> int:
+    """
+    Zählt die Teilnehmer, die im Zeitraum [start, end) mindestens einen Tag eingeschrieben waren, in O(log n).
+
+    Args:
+        index (Dict[str, np.ndarray]): Index aus `build_enrollment_index`.
+        start (DateLike): Beginn des Zeitraums.
+        end (DateLike): Ende des Zeitraums (ausschließlich).
+
+    Returns:
+        int: Anzahl der Teilnehmer.
+    """
+    started_before_end = np.searchsorted(index["Eintritt"], _to_ns(end), side="left")
+    ended_before_start = np.searchsorted(index["Austritt"], _to_ns(start), side="right")
+    return int(max(started_before_end - ended_before_start, 0))
+
+
+def active_positions(index: Dict[str, np.ndarray], on_date: DateLike) -> np.ndarray:
+    """
+    Liefert die Zeilenpositionen der an einem Tag eingeschriebenen Teilnehmer.
+
+    Nur Teilnehmer, die bis zum Stichtag eingetreten sind, werden geprüft.
+
+    Args:
+        index (Dict[str, np.ndarray]): Index aus `build_enrollment_index`.
+        on_date (DateLike): Stichtag.
+
+    Returns:
+        np.ndarray: Aufsteigende Zeilenpositionen im indizierten DataFrame.
+    """
+    t = _to_ns(on_date)
+    started = np.searchsorted(index["Eintritt"], t, side="right")
+    still_enrolled = index["Austritt_je_Eintritt"][:started] > t
+    return np.sort(index["Position"][:started][still_enrolled])
+
+
+def enrollment_timeline(
+    index: Dict[str, np.ndarray], start: DateLike, end: DateLike, freq: str = "W-MON"
+) -> pd.Series:
+    """
+    Berechnet die Belegung zu regelmäßigen Stichtagen (z. B. wöchentlich oder monatlich).
+
+    Alle Stichtage werden gemeinsam mit zwei vektorisierten binären Suchen ausgewertet.
+
+    Args:
+        index (Dict[str, np.ndarray]): Index aus `build_enrollment_index`.
+        start (DateLike): Erster möglicher Stichtag.
+        end (DateLike): Letzter möglicher Stichtag.
+        freq (str): pandas-Frequenz der Stichtage, z. B. "W-MON" (montags) oder "MS" (Monatsanfang).
+
+    Returns:
+        pd.Series: Anzahl eingeschriebener Teilnehmer je Stichtag.
+    """
+    dates = pd.date_range(start=start, end=end, freq=freq)
+    t = dates.to_numpy(dtype="datetime64[ns]").view("int64")
+    counts = np.searchsorted(index["Eintritt"], t, side="right") - np.searchsorted(index["Austritt"], t, side="right")
+    return pd.Series(counts, index=pd.Index(dates, name="Stichtag"), name="Eingeschrieben")
+
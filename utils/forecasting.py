@@ -0,0 +1,205 @@
+import copy
+import threading
+from typing import Any, Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDRegressor
+from sklearn.multioutput import MultiOutputRegressor
+from sklearn.preprocessing import StandardScaler
+from utils.data_loader import get_data_version
+from utils.dataset_store import get_shared, peek_shared
+from utils.jobs import STATUS_FAILED, STATUS_UNKNOWN, get_job_status, submit_job
+from utils.processors import CATEGORIES, prepare_prediction_data
+
+# Prognosezeitpunkte in Tagen nach dem letzten Test
+FORECAST_HORIZONS = (7, 14, 21, 28)
+
+# Mindestanzahl an Trainingsbeispielen (aufeinanderfolgende Testpaare) für ein Modell
+MIN_TRAINING_SAMPLES = 10
+
+# Ab diesem Anteil neuer Trainingsbeispiele wird das Modell vollständig neu trainiert
+FULL_REFIT_SHARE = 0.2
+
+# Durchläufe über die neuen Beispiele bei einer inkrementellen Anpassung
+INCREMENTAL_EPOCHS = 5
+
+# Vorhergesagte Werte: Gesamtprozentsatz und Prozentwerte der Kategorien
+TARGET_COLUMNS = ["Gesamtprozentsatz"] + [f"{cat}_Prozent" for cat in CATEGORIES]
+
+# Testdatei -> (Datenversion, Auftrags-ID) des zuletzt gestarteten Trainings
+_training_jobs: Dict[str, Tuple[str, str]] = {}
+_training_lock = threading.Lock()
+
+
+def _test_features(tests: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Berechnet die Merkmale jedes Tests: Ergebnisse, Tage seit dem Ersttest und Anzahl bisheriger Tests.
+
+    Args:
+        tests (pd.DataFrame): Bewertete Testdaten, sortiert nach (Teilnehmer_ID, Testdatum).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Teilnehmer-IDs, Testdaten in Tagen seit
+            1970 und Merkmalsmatrix (eine Zeile je Test).
+    """
+    values = tests[TARGET_COLUMNS].to_numpy(dtype=float)
+    # Kategorien ohne erreichbare Punkte erhalten den Gesamtwert
+    values = np.where(np.isnan(values), values[:, [0]], values)
+    days_since_first = prepare_prediction_data(tests)["Tage_seit_Ersttest"].to_numpy(dtype=float)
+    test_number = tests.groupby("Teilnehmer_ID").cumcount().to_numpy(dtype=float) + 1
+    days = (tests["Testdatum"] - pd.Timestamp("1970-01-01")).dt.days.to_numpy(dtype=float)
+    return tests["Teilnehmer_ID"].to_numpy(), days, np.column_stack([values, days_since_first, test_number])
+
+
+def build_training_samples(tests: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, pd.MultiIndex]:
+    """
+    Bildet Trainingsbeispiele aus aufeinanderfolgenden Tests desselben Teilnehmers.
+
+    Merkmale sind die Werte des früheren Tests plus der Abstand in Tagen, Ziel sind
+    die Werte des folgenden Tests.
+
+    Args:
+        tests (pd.DataFrame): Bewertete Testdaten, sortiert nach (Teilnehmer_ID, Testdatum).
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, pd.MultiIndex]: Merkmale, Zielwerte (0–1) und
+            (Teilnehmer_ID, Testdatum) des jeweiligen Zieltests.
+    """
+    ids, days, features = _test_features(tests)
+    same = ids[1:] == ids[:-1]
+    X = np.column_stack([features[:-1][same], (days[1:] - days[:-1])[same]])
+    Y = features[1:, : len(TARGET_COLUMNS)][same] / 100
+    targets = pd.MultiIndex.from_arrays([ids[1:][same], tests["Testdatum"].to_numpy()[1:][same]])
+    return X, Y, targets
+
+
+def _predict_all(scaler: StandardScaler, model: MultiOutputRegressor, tests: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sagt für alle Teilnehmer und alle Prognosezeitpunkte in einem Aufruf vorher.
+
+    Args:
+        scaler (StandardScaler): Skalierung der Merkmale.
+        model (MultiOutputRegressor): Trainiertes Modell.
+        tests (pd.DataFrame): Bewertete Testdaten, sortiert nach (Teilnehmer_ID, Testdatum).
+
+    Returns:
+        pd.DataFrame: Prognosen mit `Teilnehmer_ID`, `Testdatum` (Prognosedatum) und den Zielspalten.
+    """
+    ids, _, features = _test_features(tests)
+    last = np.r_[ids[1:] != ids[:-1], True]
+    horizons = np.array(FORECAST_HORIZONS, dtype=float)
+
+    base = np.repeat(features[last], len(horizons), axis=0)
+    X = np.column_stack([base, np.tile(horizons, int(last.sum()))])
+    predictions = np.clip(model.predict(scaler.transform(X)) * 100, 0, 100)
+
+    last_dates = np.repeat(tests["Testdatum"].to_numpy()[last], len(horizons))
+    forecasts = pd.DataFrame(predictions, columns=TARGET_COLUMNS)
+    forecasts.insert(0, "Teilnehmer_ID", np.repeat(ids[last], len(horizons)))
+    forecasts.insert(1, "Testdatum", pd.to_datetime(last_dates) + pd.to_timedelta(np.tile(horizons, int(last.sum())), unit="D"))
+    return forecasts
+
+
+def train_forecaster(tests: pd.DataFrame, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Trainiert das Prognosemodell und berechnet die Prognosen aller Teilnehmer.
+
+    Liegt ein früheres Modell vor und sind nur wenige Trainingsbeispiele neu, wird
+    es mit `partial_fit` nur auf den neuen Beispielen weiter trainiert; die
+    Skalierung bleibt dabei unverändert. Sonst wird vollständig neu trainiert.
+
+    Args:
+        tests (pd.DataFrame): Bewertete Testdaten, sortiert nach (Teilnehmer_ID, Testdatum).
+        previous (Optional[Dict[str, Any]]): Prognosemodell eines früheren Datenstands.
+
+    Returns:
+        Dict[str, Any]: Prognosemodell mit "scaler", "model", "trainiert" (Zieltests der
+            Trainingsbeispiele) und "prognosen"; ohne genügend Daten sind Modell und
+            Prognosen None.
+    """
+    X, Y, targets = build_training_samples(tests)
+    if len(X) < MIN_TRAINING_SAMPLES:
+        return {"scaler": None, "model": None, "trainiert": targets, "prognosen": None}
+
+    if previous is not None and previous["model"] is not None:
+        new = ~targets.isin(previous["trainiert"])
+        if new.sum() <= FULL_REFIT_SHARE * len(X):
+            scaler, model = previous["scaler"], previous["model"]
+            if new.any():
+                # Das geteilte Modell des alten Datenstands bleibt unverändert
+                model = copy.deepcopy(model)
+                X_new = scaler.transform(X[new])
+                for _ in range(INCREMENTAL_EPOCHS):
+                    model.partial_fit(X_new, Y[new])
+            return {"scaler": scaler, "model": model, "trainiert": targets, "prognosen": _predict_all(scaler, model, tests)}
+
+    scaler = StandardScaler().fit(X)
+    model = MultiOutputRegressor(SGDRegressor(random_state=0, max_iter=1000, tol=1e-4)).fit(scaler.transform(X), Y)
+    return {"scaler": scaler, "model": model, "trainiert": targets, "prognosen": _predict_all(scaler, model, tests)}
+
+
+def _train_and_share(tests_file: str, version: str, tests: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Trainiert das Prognosemodell für eine Datenversion und legt es prozessweit ab (Hintergrundauftrag).
+
+    Args:
+        tests_file (str): Pfad zur Testdatei.
+        version (str): Datenversion der Testdaten.
+        tests (pd.DataFrame): Bewertete Testdaten dieser Version.
+
+    Returns:
+        Dict[str, Any]: Prognosemodell.
+    """
+    entry = peek_shared(("forecaster", tests_file))
+    previous = entry[1] if entry is not None else None
+    return get_shared(("forecaster", tests_file), version, lambda: {**train_forecaster(tests, previous), "Datenversion": version})
+
+
+def get_forecaster(tests_file: str, tests: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """
+    Liefert das Prognosemodell, ohne auf ein Training zu warten.
+
+    Ist das Modell für die aktuelle Datenversion noch nicht trainiert, wird das
+    Training als Hintergrundauftrag gestartet und bis dahin das Modell des letzten
+    Datenstands geliefert. Je Datenversion wird nur ein Training gestartet; erst wenn
+    es fehlschlägt, wird es erneut angestoßen.
+
+    Args:
+        tests_file (str): Pfad zur Testdatei.
+        tests (pd.DataFrame): Bewertete Testdaten, sortiert nach (Teilnehmer_ID, Testdatum).
+
+    Returns:
+        Optional[Dict[str, Any]]: Prognosemodell (Schlüssel "Datenversion" gibt den
+            Datenstand an) oder None, solange noch keines trainiert wurde.
+    """
+    version = get_data_version(tests_file)
+    entry = peek_shared(("forecaster", tests_file))
+    if entry is None or entry[0] != version:
+        # Nach Datenversion statt über die Testdaten entdoppeln: kein Hash über alle Zeilen je Rerun
+        with _training_lock:
+            pending = _training_jobs.get(tests_file)
+            if pending is None or pending[0] != version or get_job_status(pending[1]) in (STATUS_FAILED, STATUS_UNKNOWN):
+                _training_jobs[tests_file] = (version, submit_job("prediction", _train_and_share, tests_file, version, tests))
+    return entry[1] if entry is not None else None
+
+
+def get_participant_forecast(forecaster: Dict[str, Any], participant_id: int) -> pd.DataFrame:
+    """
+    Liefert die vorberechnete Prognose eines Teilnehmers.
+
+    Args:
+        forecaster (Dict[str, Any]): Prognosemodell aus `get_forecaster`.
+        participant_id (int): ID des Teilnehmers.
+
+    Returns:
+        pd.DataFrame: Prognose mit `Testdatum`, `Tage` (Abstand zu heute) und den
+            vorhergesagten Prozentwerten; leer ohne Modell oder Tests.
+    """
+    forecasts = forecaster["prognosen"]
+    if forecasts is None:
+        return pd.DataFrame(columns=["Testdatum", "Tage"] + TARGET_COLUMNS)
+    ids = forecasts["Teilnehmer_ID"].to_numpy()
+    start, end = np.searchsorted(ids, participant_id, side="left"), np.searchsorted(ids, participant_id, side="right")
+    forecast = forecasts.iloc[start:end].drop(columns="Teilnehmer_ID").reset_index(drop=True)
+    forecast.insert(1, "Tage", (forecast["Testdatum"] - pd.Timestamp.today().normalize()).dt.days)
+    return forecast
@@ -1,6 +1,11 @@
 import datetime
 import re
-from typing import Dict, Union
+from typing import Dict, Optional, Union
+import numpy as np
+import pandas as pd
+
+# Zweistellige Geburtsjahre unter diesem Wert werden dem 21. Jahrhundert zugeordnet
+SV_CENTURY_PIVOT = 50
 
 
 def calculate_percentage(part: float, total: float) -> float:
@@ -34,14 +39,61 @@ def parse_sv_number(sv_number: str) -> Dict[str, Union[str, int]]:
         raise ValueError("Ungültige Sozialversicherungsnummer.")
     
     day, month, year = map(int, match.groups())
-    birth_date = datetime.date(2000 + year if year < 50 else 1900 + year, month, day)
-    age = datetime.date.today().year - birth_date.year
-    if (datetime.date.today().month, datetime.date.today().day) < (birth_date.month, birth_date.day):
+    birth_date = datetime.date(2000 + year if year < SV_CENTURY_PIVOT else 1900 + year, month, day)
+    today = datetime.date.today()
+    age = today.year - birth_date.year
+    if (today.month, today.day) < (birth_date.month, birth_date.day):
         age -= 1
-    
+
     return {"birth_date": birth_date, "age": age}
 
 
+def parse_sv_numbers(sv_numbers: pd.Series, today: Optional[datetime.date] = None) -> pd.DataFrame:
+    """
+    Leitet Geburtsdatum und Alter für eine ganze Spalte von Sozialversicherungsnummern ab.
+
+    Vektorisierte Variante von `parse_sv_number`: Die Nummern werden mit `str.fullmatch`
+    geprüft und als Zahl gelesen; Tag, Monat, Jahr, Geburtsdatum und Alter ergeben sich
+    mit Array-Arithmetik auf `float` und `datetime64`.
+
+    Args:
+        sv_numbers (pd.Series): Sozialversicherungsnummern im Format XXXXDDMMYY.
+        today (Optional[datetime.date]): Stichtag für das Alter (Standard: heute).
+
+    Returns:
+        pd.DataFrame: Spalten `Geburtsdatum` (NaT bei ungültigen Nummern) und `Alter`
+            (Int64, fehlend bei ungültigen Nummern), mit dem Index von `sv_numbers`.
+    """
+    today = today or datetime.date.today()
+    if pd.api.types.is_numeric_dtype(sv_numbers):
+        # Als Zahl gespeicherte Nummern (z. B. ältere Parquet-/Feather-Dateien) ohne führende Nullen
+        text = sv_numbers.astype("Int64").astype("string").str.zfill(10)
+    else:
+        text = sv_numbers.astype("string")
+    well_formed = text.str.fullmatch(r"\d{10}").fillna(False).astype(bool)
+    # Als Zahl gelesen: ...DDMMYY steht in den letzten sechs Stellen
+    number = pd.to_numeric(text.where(well_formed), errors="coerce").to_numpy(dtype=float)
+    day, month, year = number // 10_000 % 100, number // 100 % 100, number % 100
+    year = np.where(year < SV_CENTURY_PIVOT, 2000 + year, 1900 + year)
+
+    # Datum als Monatsanfang plus Tage; Tage außerhalb des Monats (z. B. 31.02.) sind ungültig
+    valid = well_formed.to_numpy() & (month >= 1) & (month <= 12) & (day >= 1)
+    month_start = np.where(valid, (year - 1970) * 12 + month - 1, 0).astype("int64").astype("datetime64[M]")
+    dates = month_start.astype("datetime64[D]") + np.where(valid, day - 1, 0).astype("int64")
+    valid &= dates.astype("datetime64[M]") == month_start
+    birth_dates = np.where(valid, dates, np.datetime64("NaT")).astype("datetime64[ns]")
+
+    birthday_pending = (month * 100 + day) > (today.month * 100 + today.day)
+    age = np.where(valid, today.year - year - birthday_pending, 0)
+    return pd.DataFrame(
+        {
+            "Geburtsdatum": birth_dates,
+            "Alter": pd.Series(age, index=sv_numbers.index).astype("Int64").where(valid),
+        },
+        index=sv_numbers.index,
+    )
+
+
 def format_date(date: Union[str, datetime.date]) -> str:
     """
     Formatiert ein Datum im Format DD.MM.YYYY.
@@ -0,0 +1,119 @@
+import argparse
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Sequence
+
+# Module, die beim Start der App immer geladen werden
+BASE_MODULES = [
+    "pandas",
+    "streamlit",
+    "components.forms",
+    "components.job_status",
+    "components.metrics_panel",
+    "components.tables",
+    "utils.aggregates",
+    "utils.data_loader",
+    "utils.dataset_store",
+    "utils.jobs",
+    "utils.metrics",
+    "utils.processors",
+    "utils.search_index",
+    "utils.storage",
+    "utils.write_coordinator",
+]
+
+# Zusätzlich geladene Module je Seite (werden erst beim ersten Aufruf der Seite importiert)
+PAGE_MODULES = {
+    "Teilnehmer": [],
+    "Tests": ["components.charts"],
+    "Berichte": ["components.charts", "components.reports"],
+    "Prognosen": ["components.charts", "utils.forecasting"],
+}
+
+# Stammverzeichnis der App (Arbeitsverzeichnis der Messprozesse)
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_MEASURE_SCRIPT = """
+import importlib, time
+for module in {preloaded!r}:
+    importlib.import_module(module)
+start = time.perf_counter()
+for module in {modules!r}:
+    importlib.import_module(module)
+print(time.perf_counter() - start)
+"""
+
+
+def measure_import_time(modules: List[str], preloaded: Sequence[str] = (), runs: int = 3) -> float:
+    """
+    Misst die Importzeit von Modulen in frischen Python-Prozessen (Kaltstart).
+
+    Args:
+        modules (List[str]): Zu messende Module.
+        preloaded (Sequence[str]): Vorab geladene Module, deren Zeit nicht mitgezählt wird.
+        runs (int): Anzahl der Messungen; geliefert wird der Median.
+
+    Returns:
+        float: Importzeit in Sekunden.
+    """
+    script = _MEASURE_SCRIPT.format(preloaded=list(preloaded), modules=list(modules))
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", script], cwd=APP_DIR, capture_output=True, text=True, check=True
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def measure_cold_start(runs: int = 3) -> Dict[str, float]:
+    """
+    Misst die Importzeit beim Start der App und die zusätzliche Zeit beim ersten Aufruf jeder Seite.
+
+    Args:
+        runs (int): Anzahl der Messungen je Wert.
+
+    Returns:
+        Dict[str, float]: Sekunden für "Start" und je Seite.
+    """
+    timings = {"Start": measure_import_time(BASE_MODULES, runs=runs)}
+    for page, modules in PAGE_MODULES.items():
+        timings[page] = measure_import_time(modules, preloaded=BASE_MODULES, runs=runs) if modules else 0.0
+    return timings
+
+
+def main() -> None:
+    """
+    Misst die Kaltstartzeiten, z. B. `python -m utils.import_timing --output data/import_times.jsonl`.
+
+    Mit `--output` wird je Aufruf eine JSON-Zeile angehängt, sodass sich die Werte über
+    die Zeit verfolgen lassen.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Misst die Importzeiten der App beim Kaltstart.")
+    parser.add_argument("--runs", type=int, default=3, help="Messungen je Wert (Median)")
+    parser.add_argument("--output", help="JSONL-Datei, an die das Ergebnis angehängt wird")
+    args = parser.parse_args()
+
+    timings = measure_cold_start(runs=args.runs)
+    for name, seconds in timings.items():
+        print(f"{name:<12} {seconds * 1000:8.1f} ms")
+
+    if args.output:
+        record = {
+            "Zeitpunkt": datetime.datetime.now().isoformat(timespec="seconds"),
+            "Python": sys.version.split()[0],
+            "Importzeiten": timings,
+        }
+        with open(args.output, "a", encoding="utf-8") as file:
+            file.write(json.dumps(record) + "\n")
+
+
+if __name__ == "__main__":
+    main()
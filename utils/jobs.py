@@ -0,0 +1,185 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+import streamlit as st
+from utils.cache import hash_key
+
+# Anzahl paralleler Hintergrundaufträge im Prozess
+MAX_JOB_WORKERS = 2
+
+# Anzahl gemerkter Aufträge; darüber hinaus werden die ältesten fertigen verworfen (laufende nie)
+MAX_TRACKED_JOBS = 64
+
+# Statuswerte eines Auftrags
+STATUS_UNKNOWN = "unbekannt"
+STATUS_RUNNING = "läuft"
+STATUS_DONE = "fertig"
+STATUS_FAILED = "fehlgeschlagen"
+
+_executor = ThreadPoolExecutor(max_workers=MAX_JOB_WORKERS, thread_name_prefix="mathe-daten-job")
+# Auftrags-ID -> Auftrag, in Reihenfolge der letzten Verwendung
+_jobs: Dict[str, Dict[str, Any]] = {}
+_jobs_lock = threading.Lock()
+
+
+def _prune_jobs() -> None:
+    """
+    Verwirft die ältesten fertigen oder fehlgeschlagenen Aufträge über `MAX_TRACKED_JOBS` hinaus.
+
+    Laufende und wartende Aufträge bleiben erhalten, damit ihr Status abrufbar bleibt und
+    gleiche Eingaben nicht doppelt gestartet werden. Der Aufrufer hält `_jobs_lock`.
+
+    Returns:
+        None
+    """
+    excess = len(_jobs) - MAX_TRACKED_JOBS
+    if excess <= 0:
+        return
+    finished = [job_id for job_id, job in _jobs.items() if job["future"].done()]
+    for job_id in finished[:excess]:
+        del _jobs[job_id]
+
+
+def submit_job(kind: str, func: Callable, *args, report_progress: bool = False, **kwargs) -> str:
+    """
+    Startet einen Auftrag im Hintergrund; gleiche Eingaben werden nur einmal ausgeführt.
+
+    Die Auftrags-ID ist ein Hash über Art, Funktion und Argumente. Läuft bereits ein
+    Auftrag mit derselben ID oder liegt sein Ergebnis vor, wird er wiederverwendet;
+    fehlgeschlagene Aufträge werden neu gestartet.
+
+    Args:
+        kind (str): Art des Auftrags, z. B. "report" oder "prediction".
+        func (Callable): Auszuführende Funktion.
+        *args: Argumente für die Funktion.
+        report_progress (bool): Übergibt der Funktion einen `progress_callback(done, total)`,
+            dessen Stand `get_job_progress` liefert.
+        **kwargs: Keyword-Argumente für die Funktion.
+
+    Returns:
+        str: Auftrags-ID.
+    """
+    job_id = f"{kind}:{hash_key(kind, func.__module__, func.__qualname__, args, kwargs)}"
+    with _jobs_lock:
+        job = _jobs.pop(job_id, None)
+        if job is not None and not (job["future"].done() and job["future"].exception() is not None):
+            _jobs[job_id] = job
+            return job_id
+
+        job = {"kind": kind, "progress": (0, 0)}
+        if report_progress:
+            def progress_callback(done: int, total: int) -> None:
+                job["progress"] = (done, total)
+            kwargs = {**kwargs, "progress_callback": progress_callback}
+        job["future"] = _executor.submit(func, *args, **kwargs)
+        _jobs[job_id] = job
+        _prune_jobs()
+    return job_id
+
+
+def _get_future(job_id: str) -> Optional[Future]:
+    """
+    Liefert das Future eines Auftrags.
+
+    Args:
+        job_id (str): Auftrags-ID.
+
+    Returns:
+        Optional[Future]: Future oder None, wenn der Auftrag unbekannt ist.
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    return job["future"] if job is not None else None
+
+
+def get_job_status(job_id: str) -> str:
+    """
+    Liefert den Status eines Auftrags.
+
+    Args:
+        job_id (str): Auftrags-ID.
+
+    Returns:
+        str: `STATUS_RUNNING`, `STATUS_DONE`, `STATUS_FAILED` oder `STATUS_UNKNOWN`.
+    """
+    future = _get_future(job_id)
+    if future is None:
+        return STATUS_UNKNOWN
+    if not future.done():
+        return STATUS_RUNNING
+    return STATUS_FAILED if future.exception() is not None else STATUS_DONE
+
+
+def get_job_progress(job_id: str) -> Tuple[int, int]:
+    """
+    Liefert den Fortschritt eines Auftrags, der mit `report_progress=True` gestartet wurde.
+
+    Args:
+        job_id (str): Auftrags-ID.
+
+    Returns:
+        Tuple[int, int]: (fertig, gesamt); (0, 0), solange nichts gemeldet wurde.
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+    return job["progress"] if job is not None else (0, 0)
+
+
+def get_job_result(job_id: str) -> Any:
+    """
+    Liefert das Ergebnis eines fertigen Auftrags.
+
+    Args:
+        job_id (str): Auftrags-ID.
+
+    Returns:
+        Any: Rückgabewert der Funktion.
+    """
+    future = _get_future(job_id)
+    if future is None:
+        raise ValueError(f"Unbekannter Auftrag: {job_id}.")
+    return future.result(timeout=0)
+
+
+def get_job_error(job_id: str) -> Optional[BaseException]:
+    """
+    Liefert den Fehler eines fehlgeschlagenen Auftrags.
+
+    Args:
+        job_id (str): Auftrags-ID.
+
+    Returns:
+        Optional[BaseException]: Ausnahme oder None.
+    """
+    future = _get_future(job_id)
+    if future is None or not future.done():
+        return None
+    return future.exception()
+
+
+def track_job(name: str, job_id: str) -> None:
+    """
+    Merkt sich einen Auftrag in der Sitzung, damit er über Reruns hinweg abgefragt werden kann.
+
+    Args:
+        name (str): Name des Auftrags in der Sitzung, z. B. "report_7".
+        job_id (str): Auftrags-ID aus `submit_job`.
+
+    Returns:
+        None
+    """
+    st.session_state.setdefault("jobs", {})[name] = job_id
+
+
+def get_tracked_job(name: str) -> Optional[str]:
+    """
+    Liefert die in der Sitzung gemerkte Auftrags-ID.
+
+    Args:
+        name (str): Name des Auftrags in der Sitzung.
+
+    Returns:
+        Optional[str]: Auftrags-ID oder None.
+    """
+    jobs: Dict[str, str] = st.session_state.get("jobs", {})
+    return jobs.get(name)
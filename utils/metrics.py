@@ -0,0 +1,236 @@
+import contextlib
+import functools
+import json
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, Optional, Tuple
+import numpy as np
+import pandas as pd
+from utils.report_cache import get_report_cache_stats, reset_report_cache_stats
+
+# Anzahl der letzten Messungen, die je Stufe für die Perzentile gehalten werden
+METRICS_WINDOW = 1000
+
+# Spalten der Zusammenfassung je Stufe
+SUMMARY_COLUMNS = ["Bereich", "Stufe", "Aufrufe", "p50_ms", "p95_ms", "Max_ms", "Summe_ms"]
+
+# (Bereich, Stufe) -> letzte Laufzeiten in Sekunden; Aufrufe und Gesamtzeit über die ganze Laufzeit
+_timings: Dict[Tuple[str, str], Deque[float]] = {}
+_totals: Dict[Tuple[str, str], Tuple[int, float]] = {}
+_cache_counters: Dict[str, Dict[str, int]] = {}
+_frame_bytes: Dict[str, Tuple[int, int]] = {}
+_lock = threading.Lock()
+
+
+def record_timing(area: str, stage: str, seconds: float) -> None:
+    """
+    Speichert die Laufzeit eines Aufrufs.
+
+    Args:
+        area (str): Bereich, z. B. "Laden", "Verarbeitung", "Diagramme" oder "Berichte".
+        stage (str): Stufe innerhalb des Bereichs, meist der Funktionsname.
+        seconds (float): Laufzeit in Sekunden.
+
+    Returns:
+        None
+    """
+    key = (area, stage)
+    with _lock:
+        samples = _timings.get(key)
+        if samples is None:
+            samples = _timings[key] = deque(maxlen=METRICS_WINDOW)
+        samples.append(seconds)
+        calls, total = _totals.get(key, (0, 0.0))
+        _totals[key] = (calls + 1, total + seconds)
+
+
+@contextlib.contextmanager
+def timed(area: str, stage: str) -> Iterator[None]:
+    """
+    Misst die Laufzeit eines Codeblocks, z. B. `with timed("Laden", "CSV"): ...`.
+
+    Auch abgebrochene Blöcke (Ausnahmen) werden gezählt.
+
+    Args:
+        area (str): Bereich.
+        stage (str): Stufe innerhalb des Bereichs.
+
+    Returns:
+        Iterator[None]: Kontext, dessen Laufzeit gemessen wird.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_timing(area, stage, time.perf_counter() - start)
+
+
+def instrument(area: str, stage: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Dekorator, der jeden Aufruf einer Funktion mit `timed` misst.
+
+    Args:
+        area (str): Bereich.
+        stage (Optional[str]): Stufe; standardmäßig der Funktionsname.
+
+    Returns:
+        Callable[[Callable], Callable]: Dekorator.
+    """
+    def decorator(func: Callable) -> Callable:
+        name = stage or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(area, name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_cache_access(cache: str, hit: bool) -> None:
+    """
+    Zählt einen Treffer oder Fehltreffer eines Caches.
+
+    Args:
+        cache (str): Name des Caches, z. B. "Datensätze" oder "Diagramme".
+        hit (bool): True bei einem Treffer.
+
+    Returns:
+        None
+    """
+    with _lock:
+        counters = _cache_counters.setdefault(cache, {"hits": 0, "misses": 0})
+        counters["hits" if hit else "misses"] += 1
+
+
+def record_frame(name: str, frame: pd.DataFrame) -> None:
+    """
+    Speichert Zeilenzahl und Speicherbedarf eines geladenen DataFrames (inkl. Textinhalten).
+
+    Args:
+        name (str): Name des Datensatzes, z. B. "participants".
+        frame (pd.DataFrame): Geladener DataFrame.
+
+    Returns:
+        None
+    """
+    size = int(frame.memory_usage(index=True, deep=True).sum())
+    with _lock:
+        _frame_bytes[name] = (len(frame), size)
+
+
+def get_timing_summary() -> pd.DataFrame:
+    """
+    Fasst die Laufzeiten je Stufe zusammen (Perzentile über die letzten `METRICS_WINDOW` Aufrufe).
+
+    Returns:
+        pd.DataFrame: Spalten `SUMMARY_COLUMNS`, langsamste Stufen (p95) zuerst.
+    """
+    with _lock:
+        snapshot = {key: (np.array(samples), _totals[key]) for key, samples in _timings.items()}
+    rows = [
+        {
+            "Bereich": area,
+            "Stufe": stage,
+            "Aufrufe": calls,
+            "p50_ms": np.percentile(samples, 50) * 1000,
+            "p95_ms": np.percentile(samples, 95) * 1000,
+            "Max_ms": samples.max() * 1000,
+            "Summe_ms": total * 1000,
+        }
+        for (area, stage), (samples, (calls, total)) in snapshot.items()
+    ]
+    return pd.DataFrame(rows, columns=SUMMARY_COLUMNS).sort_values(by="p95_ms", ascending=False, ignore_index=True)
+
+
+def get_cache_summary() -> pd.DataFrame:
+    """
+    Fasst Treffer und Fehltreffer aller Caches zusammen, einschließlich des Berichts-Caches.
+
+    Returns:
+        pd.DataFrame: Spalten `Cache`, `Treffer`, `Fehltreffer` und `Trefferquote`.
+    """
+    with _lock:
+        counters = {cache: dict(values) for cache, values in _cache_counters.items()}
+    report_stats = get_report_cache_stats()
+    counters["Berichte"] = {"hits": report_stats["hits"], "misses": report_stats["misses"]}
+
+    summary = pd.DataFrame(
+        [(cache, values["hits"], values["misses"]) for cache, values in counters.items()],
+        columns=["Cache", "Treffer", "Fehltreffer"],
+    )
+    accesses = summary["Treffer"] + summary["Fehltreffer"]
+    summary["Trefferquote"] = (summary["Treffer"] / accesses.where(accesses > 0)).round(3)
+    return summary
+
+
+def get_frame_summary() -> pd.DataFrame:
+    """
+    Liefert Zeilenzahl und Speicherbedarf der zuletzt geladenen DataFrames.
+
+    Returns:
+        pd.DataFrame: Spalten `Datensatz`, `Zeilen` und `MB`.
+    """
+    with _lock:
+        frames = dict(_frame_bytes)
+    return pd.DataFrame(
+        [(name, rows, round(size / 1024 / 1024, 2)) for name, (rows, size) in frames.items()],
+        columns=["Datensatz", "Zeilen", "MB"],
+    )
+
+
+def _records(frame: pd.DataFrame) -> list:
+    """
+    Wandelt einen DataFrame in JSON-fähige Zeilen um; fehlende Werte werden zu None.
+
+    Args:
+        frame (pd.DataFrame): Tabelle.
+
+    Returns:
+        list: Eine Liste von Dictionaries.
+    """
+    return frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
+
+
+def export_metrics(fmt: str = "json") -> str:
+    """
+    Exportiert alle Messwerte als JSON (Laufzeiten, Caches, Speicher) oder als CSV (Laufzeiten).
+
+    Args:
+        fmt (str): "json" oder "csv".
+
+    Returns:
+        str: Exportierte Messwerte.
+    """
+    timings = get_timing_summary()
+    if fmt == "csv":
+        return timings.to_csv(index=False)
+    if fmt != "json":
+        raise ValueError(f"Unbekanntes Exportformat: {fmt}. Erlaubt sind json und csv.")
+    return json.dumps(
+        {
+            "Laufzeiten": _records(timings.round(3)),
+            "Caches": _records(get_cache_summary()),
+            "Speicher": _records(get_frame_summary()),
+        },
+        ensure_ascii=False,
+        default=str,
+    )
+
+
+def reset_metrics() -> None:
+    """
+    Verwirft alle Messwerte dieses Prozesses, einschließlich der Zähler des Berichts-Caches.
+
+    Returns:
+        None
+    """
+    with _lock:
+        _timings.clear()
+        _totals.clear()
+        _cache_counters.clear()
+        _frame_bytes.clear()
+    reset_report_cache_stats()
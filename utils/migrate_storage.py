@@ -0,0 +1,58 @@
+import argparse
+import os
+from typing import Optional
+from utils.data_loader import read_with_journal
+from utils.storage import BACKEND_EXTENSIONS, STORAGE_BACKEND_ENV, write_table
+
+# Zu migrierende Datensätze mit ihrem Zeilenschlüssel
+DATASETS = {"participants": "ID", "tests": None}
+
+
+def migrate_file(source_path: str, backend: str, key: Optional[str] = None) -> str:
+    """
+    Überführt eine Datendatei samt Journal in ein anderes Speicherformat.
+
+    Datumsspalten werden beim Lesen geparst und im Zielformat typisiert gespeichert.
+    Die Quelldatei bleibt unverändert erhalten.
+
+    Args:
+        source_path (str): Pfad zur bestehenden Datendatei, z. B. "data/tests.csv".
+        backend (str): Zielformat ("csv", "parquet" oder "feather").
+        key (Optional[str]): Zeilenschlüssel für das Zusammenführen des Journals.
+
+    Returns:
+        str: Pfad zur neu geschriebenen Datei.
+    """
+    if backend not in BACKEND_EXTENSIONS:
+        raise ValueError(f"Unbekanntes Speicherformat: {backend}.")
+    target_path = os.path.splitext(source_path)[0] + BACKEND_EXTENSIONS[backend]
+    if os.path.abspath(target_path) == os.path.abspath(source_path):
+        raise ValueError("Quell- und Zieldatei sind identisch.")
+
+    data = read_with_journal(source_path, key=key)
+    write_table(data, target_path)
+    return target_path
+
+
+def main() -> None:
+    """
+    Einmalige Migration der CSV-Dateien, z. B. `python -m utils.migrate_storage parquet`.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Migriert die Kursdaten in ein anderes Speicherformat.")
+    parser.add_argument("backend", choices=sorted(BACKEND_EXTENSIONS))
+    parser.add_argument("--source", default="csv", choices=sorted(BACKEND_EXTENSIONS), help="Aktuelles Speicherformat")
+    parser.add_argument("--data-dir", default="data", help="Datenverzeichnis")
+    args = parser.parse_args()
+
+    for name, key in DATASETS.items():
+        source_path = os.path.join(args.data_dir, f"{name}{BACKEND_EXTENSIONS[args.source]}")
+        target_path = migrate_file(source_path, args.backend, key=key)
+        print(f"{source_path} -> {target_path}")
+    print(f"Zum Aktivieren {STORAGE_BACKEND_ENV}={args.backend} setzen.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,55 +1,138 @@
+import numpy as np
 import pandas as pd
-from typing import Dict
+from typing import Any, Dict, Optional
+from utils.metrics import instrument
 
+# Testkategorien in fester Reihenfolge
+CATEGORIES = ["Textaufgaben", "Raumvorstellung", "Gleichungen", "Brüche", "Grundrechenarten", "Zahlenraum"]
 
+# Teilnehmer mit einer Steigung unter diesem Wert (Prozentpunkte pro Tag) benötigen Aufmerksamkeit
+ATTENTION_MAX_SLOPE = -0.1
+
+# Mindestanzahl an Tests, ab der ein Trend bewertet wird
+ATTENTION_MIN_TESTS = 3
+
+
+def _select_participant(test_data: pd.DataFrame, participant_id: Optional[int]) -> pd.DataFrame:
+    """
+    Wählt die Tests eines Teilnehmers aus, sofern die Daten nicht bereits vorgefiltert sind.
+
+    Args:
+        test_data (pd.DataFrame): Testdaten.
+        participant_id (Optional[int]): ID des Teilnehmers oder None für vorgefilterte Daten.
+
+    Returns:
+        pd.DataFrame: Tests des Teilnehmers.
+    """
+    if participant_id is None:
+        return test_data
+    return test_data[test_data["Teilnehmer_ID"] == participant_id]
+
+
+@instrument("Verarbeitung")
+def has_score_columns(test_data: pd.DataFrame) -> bool:
+    """
+    Prüft, ob die Testdaten alle Punktespalten für die Bewertung enthalten.
+
+    Args:
+        test_data (pd.DataFrame): Testdaten.
+
+    Returns:
+        bool: True, wenn für jede Kategorie erreichte und maximale Punkte vorliegen.
+    """
+    required = [f"{cat}_{suffix}" for cat in CATEGORIES for suffix in ("Erreicht", "Max")]
+    return all(column in test_data.columns for column in required)
+
+
+@instrument("Verarbeitung")
+def score_tests(test_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Berechnet alle Prozentspalten und den Gesamtprozentsatz für die gesamte Testtabelle.
+
+    Die Punkte werden als (Zeilen × Kategorien)-Matrizen in einem NumPy-Durchlauf
+    verrechnet. Die Eingabe wird nicht verändert.
+
+    Args:
+        test_data (pd.DataFrame): Testdaten mit erreichten und maximal möglichen Punkten.
+
+    Returns:
+        pd.DataFrame: Neue Testdaten mit den Spalten `<Kategorie>_Prozent` und `Gesamtprozentsatz`.
+    """
+    reached = test_data[[f"{cat}_Erreicht" for cat in CATEGORIES]].to_numpy(dtype=float)
+    maximum = test_data[[f"{cat}_Max" for cat in CATEGORIES]].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentages = reached / maximum * 100
+
+    score_columns = [f"{cat}_Prozent" for cat in CATEGORIES] + ["Gesamtprozentsatz"]
+    scores = pd.DataFrame(
+        np.column_stack([percentages, reached.sum(axis=1)]), columns=score_columns, index=test_data.index
+    )
+    return pd.concat([test_data.drop(columns=score_columns, errors="ignore"), scores], axis=1)
+
+
+@instrument("Verarbeitung")
 def calculate_test_percentages(test_data: pd.DataFrame) -> pd.DataFrame:
     """
     Berechnet die Prozentwerte für jede Testkategorie und den Gesamtprozentsatz.
 
+    Bereits bewertete Daten (z. B. aus `load_tests`) werden unverändert zurückgegeben.
+
     Args:
         test_data (pd.DataFrame): Testdaten mit erreichten und maximal möglichen Punkten.
 
     Returns:
         pd.DataFrame: Testdaten mit zusätzlichen Spalten für Prozentwerte.
     """
-    categories = ["Textaufgaben", "Raumvorstellung", "Gleichungen", "Brüche", "Grundrechenarten", "Zahlenraum"]
-    for category in categories:
-        test_data[f"{category}_Prozent"] = (test_data[f"{category}_Erreicht"] / test_data[f"{category}_Max"]) * 100
-    test_data["Gesamtprozentsatz"] = test_data[[f"{cat}_Erreicht" for cat in categories]].sum(axis=1)
-    return test_data
+    if "Gesamtprozentsatz" in test_data.columns:
+        return test_data
+    return score_tests(test_data)
 
 
-def aggregate_progress(test_data: pd.DataFrame, participant_id: int) -> pd.DataFrame:
+@instrument("Verarbeitung")
+def aggregate_progress(test_data: pd.DataFrame, participant_id: Optional[int] = None) -> pd.DataFrame:
     """
     Aggregiert den Fortschritt eines Teilnehmers über alle Tests.
 
     Args:
         test_data (pd.DataFrame): Testdaten.
-        participant_id (int): ID des Teilnehmers.
+        participant_id (Optional[int]): ID des Teilnehmers. Bei None enthält `test_data`
+            bereits nur die Tests des Teilnehmers (z. B. aus `get_participant_tests`).
 
     Returns:
-        pd.DataFrame: Aggregierte Fortschrittsdaten, sortiert nach Datum.
+        pd.DataFrame: Aggregierte Fortschrittsdaten, sortiert nach Datum. Die Spalte `Tage`
+            gibt den Abstand jedes Tests zu heute an (negativ für vergangene Tests).
     """
-    participant_tests = test_data[test_data["Teilnehmer_ID"] == participant_id]
-    progress = participant_tests[["Testdatum", "Gesamtprozentsatz"] + [f"{cat}_Prozent" for cat in [
-        "Textaufgaben", "Raumvorstellung", "Gleichungen", "Brüche", "Grundrechenarten", "Zahlenraum"
-    ]]]
+    participant_tests = _select_participant(test_data, participant_id)
+    progress = participant_tests[["Testdatum", "Gesamtprozentsatz"] + [f"{cat}_Prozent" for cat in CATEGORIES]]
     progress = progress.sort_values(by="Testdatum").reset_index(drop=True)
+    progress.insert(1, "Tage", (progress["Testdatum"] - pd.Timestamp.today().normalize()).dt.days)
     return progress
 
 
-def calculate_statistics(test_data: pd.DataFrame, participant_id: int) -> Dict[str, float]:
+@instrument("Verarbeitung")
+def calculate_statistics(
+    test_data: pd.DataFrame, participant_id: Optional[int] = None, aggregate: Optional[Dict[str, Any]] = None
+) -> Dict[str, float]:
     """
     Berechnet Statistiken wie den Durchschnitt der letzten zwei Tests.
 
     Args:
         test_data (pd.DataFrame): Testdaten.
-        participant_id (int): ID des Teilnehmers.
+        participant_id (Optional[int]): ID des Teilnehmers. Bei None enthält `test_data`
+            bereits nur die Tests des Teilnehmers.
+        aggregate (Optional[Dict[str, Any]]): Laufendes Aggregat des Teilnehmers aus
+            `utils.aggregates`; wenn angegeben, werden die Testdaten nicht gelesen.
 
     Returns:
         Dict[str, float]: Statistiken des Teilnehmers.
     """
-    participant_tests = test_data[test_data["Teilnehmer_ID"] == participant_id].sort_values(by="Testdatum", ascending=False)
+    if aggregate is not None:
+        if aggregate["Anzahl"] < 2:
+            raise ValueError("Nicht genügend Tests für statistische Berechnungen.")
+        avg_last_two = sum(total for _, total in aggregate["Letzte_zwei"]) / 2
+        return {"Durchschnitt_letzte_zwei": round(avg_last_two, 2)}
+
+    participant_tests = _select_participant(test_data, participant_id).sort_values(by="Testdatum", ascending=False)
     if len(participant_tests) < 2:
         raise ValueError("Nicht genügend Tests für statistische Berechnungen.")
     
@@ -58,36 +141,166 @@ def calculate_statistics(test_data: pd.DataFrame, participant_id: int) -> Dict[s
     return {"Durchschnitt_letzte_zwei": round(avg_last_two, 2)}
 
 
-def prepare_prediction_data(test_data: pd.DataFrame, participant_id: int) -> pd.DataFrame:
+@instrument("Verarbeitung")
+def prepare_prediction_data(test_data: pd.DataFrame, participant_id: Optional[int] = None) -> pd.DataFrame:
     """
     Bereitet die Daten für Prognosemodelle vor.
 
     Args:
         test_data (pd.DataFrame): Testdaten.
-        participant_id (int): ID des Teilnehmers.
+        participant_id (Optional[int]): ID des Teilnehmers. Bei None enthält `test_data`
+            bereits nur die Tests des Teilnehmers.
 
     Returns:
         pd.DataFrame: Daten im Format für Prognosemodelle.
     """
-    participant_tests = test_data[test_data["Teilnehmer_ID"] == participant_id]
+    participant_tests = _select_participant(test_data, participant_id)
+    if "Teilnehmer_ID" in participant_tests.columns:
+        # Mehrere Teilnehmer: Ersttest je Teilnehmer
+        first_test = participant_tests.groupby("Teilnehmer_ID")["Testdatum"].transform("min")
+    else:
+        first_test = participant_tests["Testdatum"].min()
     participant_tests = participant_tests[["Testdatum", "Gesamtprozentsatz"]]
-    participant_tests["Tage_seit_Ersttest"] = (participant_tests["Testdatum"] - participant_tests["Testdatum"].min()).dt.days
-    return participant_tests
+    return participant_tests.assign(Tage_seit_Ersttest=(participant_tests["Testdatum"] - first_test).dt.days)
 
 
-def calculate_category_averages(test_data: pd.DataFrame) -> Dict[str, float]:
+@instrument("Verarbeitung")
+def calculate_category_averages(test_data: pd.DataFrame, aggregate: Optional[Dict[str, Any]] = None) -> Dict[str, float]:
     """
     Berechnet die Durchschnittswerte für jede Kategorie über alle Tests.
 
     Args:
         test_data (pd.DataFrame): Testdaten.
+        aggregate (Optional[Dict[str, Any]]): Laufendes Aggregat des Teilnehmers aus
+            `utils.aggregates`; wenn angegeben, werden die Testdaten nicht gelesen.
 
     Returns:
         Dict[str, float]: Durchschnittswerte pro Kategorie.
     """
-    categories = ["Textaufgaben", "Raumvorstellung", "Gleichungen", "Brüche", "Grundrechenarten", "Zahlenraum"]
+    if aggregate is not None:
+        return {
+            f"{category}_Durchschnitt": round(aggregate["Summen"][category] / aggregate["Gezaehlt"][category], 2)
+            if aggregate["Gezaehlt"][category] else float("nan")
+            for category in CATEGORIES
+        }
+
     averages = {}
-    for category in categories:
+    for category in CATEGORIES:
         averages[f"{category}_Durchschnitt"] = test_data[f"{category}_Prozent"].mean()
     return {k: round(v, 2) for k, v in averages.items()}
-  
+
+
+@instrument("Verarbeitung")
+def calculate_statistics_batch(test_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Berechnet die Statistiken aus `calculate_statistics` für alle Teilnehmer in einem Durchlauf.
+
+    Teilnehmer mit weniger als zwei Tests erhalten NaN statt eines Fehlers.
+
+    Args:
+        test_data (pd.DataFrame): Bewertete Testdaten aller Teilnehmer.
+
+    Returns:
+        pd.DataFrame: Eine Zeile je Teilnehmer (Index `Teilnehmer_ID`) mit den Spalten
+            `Anzahl_Tests` und `Durchschnitt_letzte_zwei`.
+    """
+    ordered = test_data.sort_values(by=["Teilnehmer_ID", "Testdatum"], kind="mergesort")
+    latest_two = ordered.groupby("Teilnehmer_ID", sort=True).tail(2)
+    stats = pd.DataFrame({
+        "Anzahl_Tests": ordered.groupby("Teilnehmer_ID", sort=True).size(),
+        "Durchschnitt_letzte_zwei": latest_two.groupby("Teilnehmer_ID", sort=True)["Gesamtprozentsatz"].mean().round(2),
+    })
+    stats.loc[stats["Anzahl_Tests"] < 2, "Durchschnitt_letzte_zwei"] = np.nan
+    return stats
+
+
+@instrument("Verarbeitung")
+def calculate_category_averages_batch(test_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Berechnet die Kategoriedurchschnitte aus `calculate_category_averages` für alle Teilnehmer.
+
+    Args:
+        test_data (pd.DataFrame): Bewertete Testdaten aller Teilnehmer.
+
+    Returns:
+        pd.DataFrame: Eine Zeile je Teilnehmer (Index `Teilnehmer_ID`) mit den Spalten
+            `<Kategorie>_Durchschnitt`.
+    """
+    averages = test_data.groupby("Teilnehmer_ID", sort=True)[[f"{cat}_Prozent" for cat in CATEGORIES]].mean()
+    averages.columns = [f"{cat}_Durchschnitt" for cat in CATEGORIES]
+    return averages.round(2)
+
+
+@instrument("Verarbeitung")
+def calculate_trends_batch(test_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Berechnet für alle Teilnehmer in einem Durchlauf eine Regressionsgerade des Gesamtprozentsatzes.
+
+    Die Summen für die Kleinste-Quadrate-Lösung werden mit segmentierten NumPy-Reduktionen
+    über die nach Teilnehmer sortierten Daten gebildet. Steigung und Achsenabschnitt
+    beziehen sich auf `Tage_seit_Ersttest`; die Residuenstreuung ist die
+    Standardabweichung der Abweichungen von der Geraden.
+
+    Args:
+        test_data (pd.DataFrame): Bewertete Testdaten aller Teilnehmer.
+
+    Returns:
+        pd.DataFrame: Eine Zeile je Teilnehmer (Index `Teilnehmer_ID`) mit den Spalten
+            `Anzahl_Tests`, `Steigung` (Prozentpunkte pro Tag), `Achsenabschnitt` und
+            `Residuenstreuung`. Ohne zwei unterschiedliche Testdaten ist die Steigung NaN,
+            bei weniger als drei Tests die Residuenstreuung.
+    """
+    ordered = test_data.sort_values(by="Teilnehmer_ID", kind="mergesort")
+    if ordered.empty:
+        return pd.DataFrame(
+            columns=["Anzahl_Tests", "Steigung", "Achsenabschnitt", "Residuenstreuung"],
+            index=pd.Index([], name="Teilnehmer_ID"),
+        )
+
+    prediction_data = prepare_prediction_data(ordered)
+    x = prediction_data["Tage_seit_Ersttest"].to_numpy(dtype=float)
+    y = prediction_data["Gesamtprozentsatz"].to_numpy(dtype=float)
+    ids = ordered["Teilnehmer_ID"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+
+    n = np.diff(np.r_[starts, len(ids)]).astype(float)
+    sx, sy = np.add.reduceat(x, starts), np.add.reduceat(y, starts)
+    sxx, sxy, syy = np.add.reduceat(x * x, starts), np.add.reduceat(x * y, starts), np.add.reduceat(y * y, starts)
+
+    # Zentrierte Summen
+    cxx = sxx - sx * sx / n
+    cxy = sxy - sx * sy / n
+    cyy = syy - sy * sy / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(cxx > 0, cxy / cxx, np.nan)
+        intercept = (sy - slope * sx) / n
+        residual_spread = np.where(n > 2, np.sqrt(np.maximum(cyy - slope * cxy, 0) / (n - 2)), np.nan)
+
+    return pd.DataFrame(
+        {
+            "Anzahl_Tests": n.astype(int),
+            "Steigung": slope,
+            "Achsenabschnitt": intercept,
+            "Residuenstreuung": residual_spread,
+        },
+        index=pd.Index(ids[starts], name="Teilnehmer_ID"),
+    )
+
+
+@instrument("Verarbeitung")
+def get_participants_needing_attention(
+    trends: pd.DataFrame, max_slope: float = ATTENTION_MAX_SLOPE, min_tests: int = ATTENTION_MIN_TESTS
+) -> pd.DataFrame:
+    """
+    Wählt Teilnehmer mit rückläufigem Trend aus, stärkster Rückgang zuerst.
+
+    Args:
+        trends (pd.DataFrame): Ergebnis von `calculate_trends_batch`.
+        max_slope (float): Steigungen unter diesem Wert (Prozentpunkte pro Tag) gelten als rückläufig.
+        min_tests (int): Mindestanzahl an Tests für eine Bewertung.
+
+    Returns:
+        pd.DataFrame: Betroffene Teilnehmer aus `trends`, aufsteigend nach Steigung sortiert.
+    """
+    declining = trends[(trends["Anzahl_Tests"] >= min_tests) & (trends["Steigung"] < max_slope)]
+    return declining.sort_values(by="Steigung")
@@ -0,0 +1,177 @@
+import os
+import tempfile
+import threading
+import uuid
+from typing import Callable, Dict
+from cachetools import LRUCache
+
+# Verzeichnis der zwischengespeicherten Berichte (eine Datei je Inhalts-Hash)
+REPORT_CACHE_DIR = os.path.join("data", "report_cache")
+
+# Obergrenze des Berichts-Caches auf der Festplatte in Bytes
+REPORT_CACHE_BYTES = 256 * 1024 * 1024
+
+
+class _DiskLRU(LRUCache):
+    """
+    LRU-Index über die Cache-Dateien (Dateiname -> Größe); verdrängte Einträge werden gelöscht.
+    """
+
+    def popitem(self):
+        name, size = super().popitem()
+        try:
+            os.remove(os.path.join(REPORT_CACHE_DIR, name))
+        except FileNotFoundError:
+            pass
+        return name, size
+
+
+_index: Dict[str, _DiskLRU] = {}
+_counters = {"hits": 0, "misses": 0}
+_lock = threading.Lock()
+
+
+def _get_index() -> _DiskLRU:
+    """
+    Liefert den LRU-Index und baut ihn beim ersten Zugriff aus dem Cache-Verzeichnis auf.
+
+    Die Reihenfolge ergibt sich aus dem Änderungszeitpunkt der Dateien, der bei jedem
+    Treffer aktualisiert wird; so bleibt sie über Neustarts hinweg erhalten.
+
+    Returns:
+        _DiskLRU: Index der Cache-Dateien.
+    """
+    index = _index.get(REPORT_CACHE_DIR)
+    if index is None:
+        index = _DiskLRU(maxsize=REPORT_CACHE_BYTES, getsizeof=lambda size: size)
+        os.makedirs(REPORT_CACHE_DIR, exist_ok=True)
+        entries = [entry for entry in os.scandir(REPORT_CACHE_DIR) if entry.is_file() and not entry.name.startswith(".")]
+        for entry in sorted(entries, key=lambda entry: entry.stat().st_mtime_ns):
+            size = entry.stat().st_size
+            if size <= REPORT_CACHE_BYTES:
+                index[entry.name] = size
+            else:
+                os.remove(entry.path)
+        _index[REPORT_CACHE_DIR] = index
+    return index
+
+
+def get_cached_report(key: str, extension: str, build: Callable[[], bytes]) -> bytes:
+    """
+    Liefert einen Bericht aus dem Festplatten-Cache oder erstellt und speichert ihn.
+
+    Args:
+        key (str): Inhalts-Hash über die Eingaben und die Vorlagenversion.
+        extension (str): Dateiendung, z. B. "pdf" oder "xlsx".
+        build (Callable[[], bytes]): Erstellt den Bericht bei einem Fehltreffer.
+
+    Returns:
+        bytes: Bericht.
+    """
+    name = f"{key}.{extension}"
+    path = os.path.join(REPORT_CACHE_DIR, name)
+    with _lock:
+        index = _get_index()
+        if name in index or os.path.exists(path):
+            try:
+                with open(path, "rb") as file:
+                    report = file.read()
+                os.utime(path)
+                index[name] = len(report)
+                _counters["hits"] += 1
+                return report
+            except FileNotFoundError:
+                # Von einem anderen Prozess verdrängt
+                index.pop(name, None)
+        _counters["misses"] += 1
+
+    report = build()
+    if len(report) > REPORT_CACHE_BYTES:
+        return report
+
+    # Atomar schreiben, damit parallele Prozesse nie eine halbe Datei lesen
+    with tempfile.NamedTemporaryFile(dir=REPORT_CACHE_DIR, prefix=".", delete=False) as temp_file:
+        temp_file.write(report)
+    os.replace(temp_file.name, path)
+    with _lock:
+        _get_index()[name] = len(report)
+    return report
+
+
+def create_report_file() -> str:
+    """
+    Legt eine leere temporäre Datei im Cache-Verzeichnis an, z. B. für ein großes ZIP-Archiv.
+
+    Die Datei zählt erst nach `store_report_file` zum Cache.
+
+    Returns:
+        str: Pfad der temporären Datei.
+    """
+    with _lock:
+        _get_index()
+    with tempfile.NamedTemporaryFile(dir=REPORT_CACHE_DIR, prefix=".", delete=False) as temp_file:
+        return temp_file.name
+
+
+def store_report_file(temp_path: str, extension: str) -> str:
+    """
+    Übernimmt eine fertig geschriebene Datei aus `create_report_file` in den Cache.
+
+    Sie unterliegt damit derselben Größenobergrenze wie die übrigen Berichte und kann
+    verdrängt werden; Aufrufer müssen mit einer fehlenden Datei rechnen.
+
+    Args:
+        temp_path (str): Pfad aus `create_report_file`.
+        extension (str): Dateiendung, z. B. "zip".
+
+    Returns:
+        str: Pfad der Datei im Cache.
+    """
+    name = f"{uuid.uuid4().hex}.{extension}"
+    path = os.path.join(REPORT_CACHE_DIR, name)
+    size = os.path.getsize(temp_path)
+    os.replace(temp_path, path)
+    # Größere Dateien bleiben außerhalb des Index und werden beim nächsten Start entfernt
+    if size <= REPORT_CACHE_BYTES:
+        with _lock:
+            _get_index()[name] = size
+    return path
+
+
+def get_report_cache_stats() -> Dict[str, int]:
+    """
+    Liefert Treffer, Fehltreffer und Belegung des Berichts-Caches (dieses Prozesses).
+
+    Returns:
+        Dict[str, int]: "hits", "misses", "entries" und "bytes".
+    """
+    with _lock:
+        index = _get_index()
+        return {**_counters, "entries": len(index), "bytes": int(index.currsize)}
+
+
+def reset_report_cache_stats() -> None:
+    """
+    Setzt Treffer und Fehltreffer des Berichts-Caches zurück, ohne Berichte zu löschen.
+
+    Returns:
+        None
+    """
+    with _lock:
+        _counters["hits"] = 0
+        _counters["misses"] = 0
+
+
+def clear_report_cache() -> None:
+    """
+    Löscht alle zwischengespeicherten Berichte und setzt die Zähler zurück.
+
+    Returns:
+        None
+    """
+    with _lock:
+        index = _get_index()
+        while index:
+            index.popitem()
+        _counters["hits"] = 0
+        _counters["misses"] = 0
@@ -0,0 +1,190 @@
+import difflib
+import re
+import unicodedata
+from typing import Any, Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+# Anzahl der Treffer, die die Suche höchstens liefert
+SEARCH_RESULT_LIMIT = 10
+
+# Mindestähnlichkeit (0–1) eines Namensteils für einen unscharfen Treffer
+FUZZY_MIN_SIMILARITY = 0.75
+
+# Anzahl der Namensteile mit den meisten gemeinsamen Trigrammen, die genauer verglichen werden
+FUZZY_CANDIDATES = 50
+
+# Bewertung der Trefferarten; unscharfe Treffer erhalten ihre Ähnlichkeit (höchstens 1)
+EXACT_SCORE = 3.0
+PREFIX_SCORE = 2.0
+
+# Trennzeichen zwischen Namensteilen
+_TOKEN_SEPARATOR = re.compile(r"[\s\-]+")
+
+# Kombinierende Zeichen (Akzente), die nach der Zerlegung NFKD entfernt werden
+_COMBINING_MARKS = re.compile(r"[\u0300-\u036f]")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalisiert Text für die Suche: Kleinschreibung, ohne Akzente (z. B. "Müller" -> "muller").
+
+    Args:
+        text (str): Eingabetext.
+
+    Returns:
+        str: Normalisierter Text.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _trigrams(term: str) -> List[str]:
+    """
+    Zerlegt einen Begriff in Trigramme (mit Randzeichen, damit auch kurze Begriffe welche haben).
+
+    Args:
+        term (str): Normalisierter Begriff.
+
+    Returns:
+        List[str]: Trigramme des Begriffs.
+    """
+    padded = f"  {term} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def build_search_index(participants: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Baut den Suchindex über Namensteile, ID und SV-Nummer der Teilnehmer.
+
+    Alle Begriffe liegen sortiert vor, sodass Präfixe mit zwei binären Suchen gefunden
+    werden. Für die unscharfe Suche werden die Namensteile zusätzlich über ihre
+    Trigramme erschlossen.
+
+    Args:
+        participants (pd.DataFrame): Teilnehmerdaten mit `ID`, `name` und `sv_number`.
+
+    Returns:
+        Dict[str, Any]: Index mit "Begriff" (sortierte Begriffe), "Position" (Zeilenposition
+            je Begriff), "Name_Begriff" (eindeutige Namensteile), "Name_Position"
+            (Zeilenpositionen je Namensteil), "Trigramme" (Trigramm -> Namensteile) sowie
+            "ID" und "Name" je Zeile.
+    """
+    names = participants["name"].fillna("").astype(str).to_numpy()
+    ids = participants["ID"].to_numpy()
+
+    # Namensteile vektorisiert normalisieren und zerlegen (wie `normalize_text`)
+    tokens = (
+        pd.Series(names, dtype=object)
+        .str.casefold()
+        .str.normalize("NFKD")
+        .str.replace(_COMBINING_MARKS, "", regex=True)
+        .str.split(_TOKEN_SEPARATOR)
+        .explode()
+    )
+    tokens = tokens[tokens.notna() & (tokens != "")]
+    name_terms = tokens.to_numpy(dtype=object)
+    name_positions = tokens.index.to_numpy(dtype=np.int64)
+
+    positions = np.arange(len(participants))
+    terms = np.concatenate([
+        name_terms,
+        ids.astype(str).astype(object),
+        participants["sv_number"].fillna("").astype(str).str.strip().to_numpy(dtype=object),
+    ])
+    term_positions = np.concatenate([name_positions, positions, positions])
+    # Feste Zeichenbreite statt Python-Objekten: schnelleres Sortieren und Suchen
+    terms = terms.astype(str)
+    keep = terms != ""
+    terms, term_positions = terms[keep], term_positions[keep]
+    order = np.argsort(terms, kind="stable")
+
+    # Namensteile gruppiert: eindeutige Begriffe mit ihren Zeilenpositionen
+    grouped = pd.Series(name_positions).groupby(name_terms).agg(list)
+    trigrams: Dict[str, List[int]] = {}
+    for term_id, term in enumerate(grouped.index):
+        for trigram in set(_trigrams(term)):
+            trigrams.setdefault(trigram, []).append(term_id)
+
+    return {
+        "Begriff": terms[order],
+        "Position": term_positions[order],
+        "Name_Begriff": grouped.index.to_numpy(dtype=object),
+        "Name_Position": [np.array(group, dtype=np.int64) for group in grouped],
+        "Trigramme": {trigram: np.array(term_ids, dtype=np.int64) for trigram, term_ids in trigrams.items()},
+        "ID": ids,
+        "Name": names,
+    }
+
+
+def _match_word(index: Dict[str, Any], word: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sucht ein Suchwort als exakten Begriff, als Präfix und unscharf unter den Namensteilen.
+
+    Args:
+        index (Dict[str, Any]): Index aus `build_search_index`.
+        word (str): Normalisiertes Suchwort.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Zeilenpositionen und ihre beste Bewertung.
+    """
+    terms = index["Begriff"]
+    start = np.searchsorted(terms, word, side="left")
+    end = np.searchsorted(terms, word + "\uffff", side="left")
+    positions = [index["Position"][start:end]]
+    scores = [np.where(terms[start:end] == word, EXACT_SCORE, PREFIX_SCORE)]
+
+    # Unscharf: Kandidaten über gemeinsame Trigramme, dann genauer Vergleich
+    postings = [index["Trigramme"][t] for t in set(_trigrams(word)) if t in index["Trigramme"]]
+    if len(word) >= 3 and postings:
+        shared = np.bincount(np.concatenate(postings), minlength=len(index["Name_Begriff"]))
+        candidates = np.argsort(-shared, kind="stable")[:FUZZY_CANDIDATES]
+        for term_id in candidates[shared[candidates] > 0]:
+            term = index["Name_Begriff"][term_id]
+            similarity = difflib.SequenceMatcher(None, word, term).ratio()
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                positions.append(index["Name_Position"][term_id])
+                scores.append(np.full(len(index["Name_Position"][term_id]), similarity))
+
+    positions, scores = np.concatenate(positions), np.concatenate(scores)
+    # Je Zeile nur die beste Bewertung behalten
+    order = np.lexsort((-scores, positions))
+    positions, scores = positions[order], scores[order]
+    first = np.ones(len(positions), dtype=bool)
+    first[1:] = positions[1:] != positions[:-1]
+    return positions[first], scores[first]
+
+
+def search_participants(index: Dict[str, Any], query: str, limit: int = SEARCH_RESULT_LIMIT) -> pd.DataFrame:
+    """
+    Sucht Teilnehmer nach Name, ID oder SV-Nummer und liefert die besten Treffer.
+
+    Jedes Wort der Anfrage muss zu einem Begriff passen (exakt, als Präfix oder
+    unscharf bei Namensteilen). Die Treffer werden nach Summe der Bewertungen und
+    dann nach ID sortiert. Ohne Suchbegriff werden die ersten Teilnehmer geliefert.
+
+    Args:
+        index (Dict[str, Any]): Index aus `build_search_index`.
+        query (str): Suchanfrage, z. B. "mül" oder "1234".
+        limit (int): Höchstzahl der Treffer.
+
+    Returns:
+        pd.DataFrame: Treffer mit `ID`, `name` und `Bewertung`.
+    """
+    words = [word for word in _TOKEN_SEPARATOR.split(normalize_text(query)) if word]
+    if not words:
+        first = np.argsort(index["ID"], kind="stable")[:limit]
+        return pd.DataFrame({"ID": index["ID"][first], "name": index["Name"][first], "Bewertung": 0.0})
+
+    positions, scores = _match_word(index, words[0])
+    for word in words[1:]:
+        word_positions, word_scores = _match_word(index, word)
+        positions, left, right = np.intersect1d(positions, word_positions, assume_unique=True, return_indices=True)
+        scores = scores[left] + word_scores[right]
+
+    top = np.lexsort((index["ID"][positions], -scores))[:limit]
+    return pd.DataFrame({
+        "ID": index["ID"][positions[top]],
+        "name": index["Name"][positions[top]],
+        "Bewertung": scores[top],
+    })
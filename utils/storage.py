@@ -0,0 +1,191 @@
+import os
+import operator
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import pandas as pd
+from utils.metrics import instrument
+
+# Umgebungsvariable zur Auswahl des Speicherformats
+STORAGE_BACKEND_ENV = "MATHE_DATEN_STORAGE"
+DEFAULT_BACKEND = "csv"
+
+# Dateiendungen der unterstützten Speicherformate
+BACKEND_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+# Spalten, die als Datum gespeichert bzw. beim Lesen von CSV geparst werden
+DATE_COLUMNS = ["Eintrittsdatum", "Austrittsdatum", "Testdatum"]
+
+# Spalten, die beim Lesen von CSV als Text erhalten bleiben (z. B. führende Nullen der SV-Nummer)
+TEXT_COLUMNS = ["sv_number"]
+
+# Filter im Format [(Spalte, Operator, Wert)], z. B. [("Teilnehmer_ID", "==", 7)]
+Filters = List[Tuple[str, str, Any]]
+
+_FILTER_OPERATORS: Dict[str, Callable] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def get_storage_backend() -> str:
+    """
+    Liefert das konfigurierte Speicherformat (Umgebungsvariable `MATHE_DATEN_STORAGE`).
+
+    Returns:
+        str: "csv", "parquet" oder "feather".
+    """
+    backend = os.environ.get(STORAGE_BACKEND_ENV, DEFAULT_BACKEND).lower()
+    if backend not in BACKEND_EXTENSIONS:
+        raise ValueError(f"Unbekanntes Speicherformat: {backend}. Erlaubt: {', '.join(BACKEND_EXTENSIONS)}.")
+    return backend
+
+
+def get_data_path(name: str, directory: str = "data", backend: Optional[str] = None) -> str:
+    """
+    Bildet den Dateipfad eines Datensatzes für das gewählte Speicherformat.
+
+    Args:
+        name (str): Name des Datensatzes, z. B. "tests".
+        directory (str): Datenverzeichnis.
+        backend (Optional[str]): Speicherformat, standardmäßig das konfigurierte.
+
+    Returns:
+        str: Dateipfad, z. B. "data/tests.parquet".
+    """
+    backend = backend or get_storage_backend()
+    return os.path.join(directory, f"{name}{BACKEND_EXTENSIONS[backend]}")
+
+
+def get_backend_for_path(file_path: str) -> str:
+    """
+    Bestimmt das Speicherformat anhand der Dateiendung.
+
+    Args:
+        file_path (str): Pfad zur Datendatei.
+
+    Returns:
+        str: Speicherformat der Datei.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    for backend, backend_extension in BACKEND_EXTENSIONS.items():
+        if extension == backend_extension:
+            return backend
+    raise ValueError(f"Unbekannte Dateiendung: {extension}.")
+
+
+def read_columns(file_path: str) -> List[str]:
+    """
+    Liest nur die Spaltennamen einer Datendatei.
+
+    Args:
+        file_path (str): Pfad zur Datendatei.
+
+    Returns:
+        List[str]: Spaltennamen.
+    """
+    backend = get_backend_for_path(file_path)
+    if backend == "parquet":
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(file_path).names)
+    if backend == "feather":
+        import pyarrow.ipc as ipc
+        with ipc.open_file(file_path) as reader:
+            return list(reader.schema.names)
+    return list(pd.read_csv(file_path, nrows=0).columns)
+
+
+@instrument("Filter")
+def apply_filters(data: pd.DataFrame, filters: Optional[Filters]) -> pd.DataFrame:
+    """
+    Wendet Filter auf einen DataFrame an (für Formate ohne native Filterung).
+
+    Args:
+        data (pd.DataFrame): Daten.
+        filters (Optional[Filters]): Filterliste.
+
+    Returns:
+        pd.DataFrame: Gefilterte Daten.
+    """
+    if not filters:
+        return data
+    mask = pd.Series(True, index=data.index)
+    for column, op, value in filters:
+        if op == "in":
+            mask &= data[column].isin(value)
+        elif op in _FILTER_OPERATORS:
+            mask &= _FILTER_OPERATORS[op](data[column], value)
+        else:
+            raise ValueError(f"Unbekannter Filteroperator: {op}.")
+    return data[mask].reset_index(drop=True)
+
+
+@instrument("Laden")
+def read_table(file_path: str, columns: Optional[List[str]] = None, filters: Optional[Filters] = None) -> pd.DataFrame:
+    """
+    Liest eine Datendatei mit optionaler Spaltenauswahl und Filterung.
+
+    Parquet filtert beim Lesen (Predicate Pushdown), Feather und CSV lesen nur die
+    benötigten Spalten und filtern anschließend. Datumsspalten werden bei CSV geparst,
+    die typisierten Formate speichern sie nativ.
+
+    Args:
+        file_path (str): Pfad zur Datendatei.
+        columns (Optional[List[str]]): Zu ladende Spalten (alle, wenn None).
+        filters (Optional[Filters]): Filterliste.
+
+    Returns:
+        pd.DataFrame: Geladene Daten.
+    """
+    backend = get_backend_for_path(file_path)
+    filter_columns = [column for column, _, _ in filters or []]
+    load_columns = None
+    if columns is not None:
+        load_columns = list(dict.fromkeys(list(columns) + filter_columns))
+
+    if backend == "parquet":
+        data = pd.read_parquet(file_path, columns=load_columns, filters=filters or None)
+    elif backend == "feather":
+        data = apply_filters(pd.read_feather(file_path, columns=load_columns), filters)
+    else:
+        present = load_columns or read_columns(file_path)
+        date_columns = [column for column in DATE_COLUMNS if column in present]
+        text_columns = {column: str for column in TEXT_COLUMNS if column in present}
+        data = apply_filters(
+            pd.read_csv(file_path, usecols=load_columns, parse_dates=date_columns, dtype=text_columns), filters
+        )
+
+    if columns is not None:
+        data = data[list(columns)]
+    return data
+
+
+def write_table(data: pd.DataFrame, file_path: str) -> None:
+    """
+    Schreibt einen DataFrame im zur Dateiendung passenden Format (atomar über eine temporäre Datei).
+
+    Args:
+        data (pd.DataFrame): Zu speichernde Daten.
+        file_path (str): Pfad zur Datendatei.
+
+    Returns:
+        None
+    """
+    backend = get_backend_for_path(file_path)
+    # In eine temporäre Datei schreiben und atomar ersetzen: Leser sehen nie eine halbe Datei
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
+    try:
+        if backend == "parquet":
+            data.to_parquet(temp_path, index=False)
+        elif backend == "feather":
+            data.reset_index(drop=True).to_feather(temp_path)
+        else:
+            data.to_csv(temp_path, index=False)
+        with open(temp_path, "rb") as file:
+            os.fsync(file.fileno())
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
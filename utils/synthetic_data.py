@@ -0,0 +1,166 @@
+import argparse
+import os
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+from utils.processors import CATEGORIES
+from utils.storage import BACKEND_EXTENSIONS, get_data_path, write_table
+
+# Vordefinierte Datensatzgrößen (Anzahl der Testzeilen)
+SYNTHETIC_SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+# Durchschnittliche Anzahl an Tests je Teilnehmer
+TESTS_PER_PARTICIPANT = 10
+
+# Anteil der Teilnehmer mit Austrittsdatum
+EXIT_SHARE = 0.3
+
+# Mögliche Höchstpunktzahlen je Kategorie und Test
+MAX_POINT_CHOICES = np.array([10, 12, 15, 20, 25])
+
+# Zeitraum der Eintrittsdaten
+FIRST_ENTRY_DATE = pd.Timestamp("2021-01-01")
+ENTRY_PERIOD_DAYS = 3 * 365
+
+# Namensbestandteile der synthetischen Teilnehmer
+FIRST_NAMES = np.array([
+    "Anna", "Ben", "Clara", "David", "Elif", "Felix", "Greta", "Hannah", "Ilias", "Jana", "Jürgen", "Lena",
+    "Luca", "Marie", "Mehmet", "Noah", "Özge", "Paul", "Sophie", "Tim", "Zoë",
+])
+LAST_NAMES = np.array([
+    "Bauer", "Becker", "Fischer", "Hoffmann", "Huber", "Kaya", "Koch", "Meyer", "Müller", "Nowak", "Schäfer",
+    "Schmidt", "Schneider", "Schulz", "Wagner", "Weber", "Wolf", "Yılmaz", "Zimmermann",
+])
+
+
+def generate_participants(count: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Erzeugt reproduzierbar synthetische Teilnehmer im Schema der Teilnehmerdatei.
+
+    Die SV-Nummern haben das Format XXXXDDMMYY mit gültigem Geburtsdatum.
+
+    Args:
+        count (int): Anzahl der Teilnehmer.
+        seed (int): Startwert des Zufallsgenerators.
+
+    Returns:
+        pd.DataFrame: Spalten `ID`, `name`, `sv_number`, `Eintrittsdatum` und `Austrittsdatum`.
+    """
+    rng = np.random.default_rng(seed)
+    names = pd.Series(rng.choice(FIRST_NAMES, count)).str.cat(rng.choice(LAST_NAMES, count), sep=" ")
+
+    birth_dates = pd.to_datetime("1960-01-01") + pd.to_timedelta(rng.integers(0, 48 * 365, count), unit="D")
+    serials = pd.Series(rng.integers(0, 10_000, count)).astype(str).str.zfill(4)
+    sv_numbers = serials.str.cat(pd.Series(birth_dates.strftime("%d%m%y")))
+
+    entry_dates = FIRST_ENTRY_DATE + pd.to_timedelta(rng.integers(0, ENTRY_PERIOD_DAYS, count), unit="D")
+    exit_dates = entry_dates + pd.to_timedelta(rng.integers(90, 2 * 365, count), unit="D")
+    exit_dates = exit_dates.where(rng.random(count) < EXIT_SHARE)
+
+    return pd.DataFrame({
+        "ID": np.arange(1, count + 1),
+        "name": names,
+        "sv_number": sv_numbers,
+        "Eintrittsdatum": entry_dates,
+        "Austrittsdatum": exit_dates,
+    })
+
+
+def generate_tests(participants: pd.DataFrame, rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Erzeugt reproduzierbar synthetische Tests im Schema der Testdatei.
+
+    Jeder Teilnehmer hat eine eigene Leistungsstärke und einen leichten Trend, sodass
+    Statistiken, Trends und Prognosen realistische Werte liefern. Die Testdaten
+    liegen innerhalb des Teilnahmezeitraums (höchstens ein Jahr nach Eintritt).
+
+    Args:
+        participants (pd.DataFrame): Teilnehmer aus `generate_participants`.
+        rows (int): Anzahl der Testzeilen.
+        seed (int): Startwert des Zufallsgenerators.
+
+    Returns:
+        pd.DataFrame: Spalten `Teilnehmer_ID`, `Testdatum` sowie `<Kategorie>_Erreicht` und `<Kategorie>_Max`.
+    """
+    rng = np.random.default_rng(seed + 1)
+    count = len(participants)
+    ability = rng.beta(5, 3, count)
+    trend = rng.normal(0.0, 0.0005, count)
+
+    positions = rng.integers(0, count, rows)
+    entry = participants["Eintrittsdatum"].to_numpy()[positions]
+    span = (participants["Austrittsdatum"] - participants["Eintrittsdatum"]).dt.days.to_numpy(dtype=float)[positions]
+    span = np.where(np.isnan(span), 365, np.minimum(span, 365))
+    days = np.floor(rng.random(rows) * span)
+
+    tests = pd.DataFrame({
+        "Teilnehmer_ID": participants["ID"].to_numpy()[positions],
+        "Testdatum": entry + days.astype("timedelta64[D]"),
+    })
+    probability = np.clip(ability[positions] + trend[positions] * days, 0.02, 0.98)
+    for category in CATEGORIES:
+        maximum = rng.choice(MAX_POINT_CHOICES, rows)
+        tests[f"{category}_Erreicht"] = rng.binomial(maximum, probability)
+        tests[f"{category}_Max"] = maximum
+    return tests
+
+
+def generate_dataset(rows: int, seed: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Erzeugt Teilnehmer und Tests für eine Anzahl an Testzeilen.
+
+    Args:
+        rows (int): Anzahl der Testzeilen.
+        seed (int): Startwert des Zufallsgenerators.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: Teilnehmer und Tests.
+    """
+    participants = generate_participants(max(rows // TESTS_PER_PARTICIPANT, 1), seed)
+    return participants, generate_tests(participants, rows, seed)
+
+
+def write_dataset(directory: str, rows: int, seed: int = 0, backend: Optional[str] = None) -> Dict[str, str]:
+    """
+    Erzeugt einen synthetischen Datensatz und schreibt ihn in ein Verzeichnis.
+
+    Args:
+        directory (str): Zielverzeichnis.
+        rows (int): Anzahl der Testzeilen.
+        seed (int): Startwert des Zufallsgenerators.
+        backend (Optional[str]): Speicherformat ("csv", "parquet" oder "feather"; Standard wie die App).
+
+    Returns:
+        Dict[str, str]: Pfade der Dateien unter "participants" und "tests".
+    """
+    os.makedirs(directory, exist_ok=True)
+    participants, tests = generate_dataset(rows, seed)
+    paths = {name: get_data_path(name, directory, backend) for name in ("participants", "tests")}
+    write_table(participants, paths["participants"])
+    write_table(tests, paths["tests"])
+    return paths
+
+
+def main() -> None:
+    """
+    Schreibt synthetische Datensätze, z. B. `python -m utils.synthetic_data --size 100k --output data/synthetic`.
+
+    Je Größe entsteht ein Unterverzeichnis mit `participants` und `tests`.
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Erzeugt reproduzierbare synthetische Teilnehmer- und Testdaten.")
+    parser.add_argument("--size", action="append", choices=list(SYNTHETIC_SIZES), help="Datensatzgröße (mehrfach möglich)")
+    parser.add_argument("--output", default=os.path.join("data", "synthetic"), help="Zielverzeichnis")
+    parser.add_argument("--seed", type=int, default=0, help="Startwert des Zufallsgenerators")
+    parser.add_argument("--backend", choices=list(BACKEND_EXTENSIONS), help="Speicherformat")
+    args = parser.parse_args()
+
+    for size in args.size or list(SYNTHETIC_SIZES):
+        paths = write_dataset(os.path.join(args.output, size), SYNTHETIC_SIZES[size], args.seed, args.backend)
+        print(f"{size:<5} {paths['participants']}  {paths['tests']}")
+
+
+if __name__ == "__main__":
+    main()
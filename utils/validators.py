@@ -1,6 +1,17 @@
 import re
 import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Format der Sozialversicherungsnummer (XXXXDDMMYY)
+SV_NUMBER_PATTERN = r"^\d{4}\d{2}\d{2}\d{2}$"
+
+# Datumsformat beim Import (Excel liefert Datumszellen mit Uhrzeit 00:00:00)
+IMPORT_DATE_PATTERN = r"^\d{4}-\d{2}-\d{2}(?: 00:00:00)?$"
+
+# Summe der maximal möglichen Punkte eines Tests
+TEST_MAX_POINTS = 100
 
 
 def validate_sv_number(sv_number: str) -> bool:
@@ -13,8 +24,7 @@ def validate_sv_number(sv_number: str) -> bool:
     Returns:
         bool: True, wenn gültig, sonst False.
     """
-    pattern = r"^\d{4}\d{2}\d{2}\d{2}$"
-    if not re.match(pattern, sv_number):
+    if not re.match(SV_NUMBER_PATTERN, sv_number):
         raise ValueError("Ungültige Sozialversicherungsnummer. Das Format muss XXXXDDMMYY sein.")
     return True
 
@@ -48,7 +58,7 @@ def validate_test_scores(test_scores: List[Dict[str, Any]]) -> bool:
         bool: True, wenn die Testdaten gültig sind, sonst False.
     """
     total_max_points = sum(score.get("max_points", 0) for score in test_scores)
-    if total_max_points != 100:
+    if total_max_points != TEST_MAX_POINTS:
         raise ValueError(f"Die maximal möglichen Punkte aller Kategorien müssen 100 betragen, gefunden: {total_max_points}.")
     return True
 
@@ -95,4 +105,99 @@ def validate_test_input(test_input: Dict[str, Any]) -> bool:
     if "scores" not in test_input or not validate_test_scores(test_input["scores"]):
         raise ValueError("Ungültige Testpunkte.")
     return True
-  
+
+
+def _collect_errors(index: pd.Index, checks: Iterable[Tuple[pd.Series, str]]) -> pd.Series:
+    """
+    Fasst die Ergebnisse spaltenweiser Prüfungen zu einer Fehlermeldung je Zeile zusammen.
+
+    Args:
+        index (pd.Index): Zeilenindex der geprüften Daten.
+        checks (Iterable[Tuple[pd.Series, str]]): Paare aus Fehlermaske (True = ungültig) und Meldung.
+
+    Returns:
+        pd.Series: Fehlermeldungen je Zeile; leerer Text für gültige Zeilen.
+    """
+    errors = pd.Series("", index=index, dtype=object)
+    for invalid, message in checks:
+        errors = errors + np.where(invalid.to_numpy(dtype=bool), f"{message}; ", "")
+    return errors.str.rstrip("; ")
+
+
+def parse_import_dates(values: pd.Series) -> pd.Series:
+    """
+    Wandelt Datumstexte (YYYY-MM-DD) spaltenweise in Timestamps um.
+
+    Args:
+        values (pd.Series): Datumstexte.
+
+    Returns:
+        pd.Series: Timestamps; NaT für fehlende oder ungültige Werte.
+    """
+    text = values.astype("string").str.strip()
+    valid_format = text.str.match(IMPORT_DATE_PATTERN).fillna(False).astype(bool)
+    return pd.to_datetime(text.where(valid_format).str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+
+
+def validate_participants_frame(participants: pd.DataFrame) -> pd.Series:
+    """
+    Validiert viele Teilnehmer auf einmal mit spaltenweisen Prüfungen.
+
+    Es gelten dieselben Regeln wie in `validate_participant_data`.
+
+    Args:
+        participants (pd.DataFrame): Teilnehmer mit den Spalten `name`, `sv_number`,
+            `Eintrittsdatum` und `Austrittsdatum` (Texte).
+
+    Returns:
+        pd.Series: Fehlermeldungen je Zeile; leerer Text für gültige Zeilen.
+    """
+    names = participants["name"].astype("string").str.strip()
+    sv_numbers = participants["sv_number"].astype("string").str.strip()
+    entry_dates = parse_import_dates(participants["Eintrittsdatum"])
+    exit_dates = parse_import_dates(participants["Austrittsdatum"])
+
+    return _collect_errors(participants.index, [
+        (names.isna() | (names == ""), "Der Name des Teilnehmers darf nicht leer sein"),
+        (~sv_numbers.str.match(SV_NUMBER_PATTERN).fillna(False).astype(bool),
+         "Ungültige Sozialversicherungsnummer. Das Format muss XXXXDDMMYY sein"),
+        (entry_dates.isna(), "Ungültiges Eintrittsdatum"),
+        (exit_dates.isna(), "Ungültiges Austrittsdatum"),
+        (entry_dates >= exit_dates, "Das Eintrittsdatum muss vor dem Austrittsdatum liegen"),
+    ])
+
+
+def validate_tests_frame(
+    tests: pd.DataFrame, categories: List[str], participant_ids: Optional[Iterable[int]] = None
+) -> pd.Series:
+    """
+    Validiert viele Tests auf einmal mit spaltenweisen Prüfungen.
+
+    Args:
+        tests (pd.DataFrame): Tests mit `Teilnehmer_ID`, `Testdatum` und den Spalten
+            `<Kategorie>_Erreicht` und `<Kategorie>_Max` (Texte oder Zahlen).
+        categories (List[str]): Testkategorien.
+        participant_ids (Optional[Iterable[int]]): Bekannte Teilnehmer-IDs; wenn angegeben,
+            werden Tests unbekannter Teilnehmer abgelehnt.
+
+    Returns:
+        pd.Series: Fehlermeldungen je Zeile; leerer Text für gültige Zeilen.
+    """
+    ids = pd.to_numeric(tests["Teilnehmer_ID"], errors="coerce")
+    reached = tests[[f"{cat}_Erreicht" for cat in categories]].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    max_points = tests[[f"{cat}_Max" for cat in categories]].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+    checks = [
+        (ids.isna(), "Ungültige Teilnehmer-ID"),
+        (parse_import_dates(tests["Testdatum"]).isna(), "Ungültiges Testdatum"),
+        (pd.Series((np.isnan(reached) | (reached % 1 != 0)).any(axis=1) | (np.isnan(max_points) | (max_points % 1 != 0)).any(axis=1)),
+         "Punkte müssen ganze Zahlen sein"),
+        (pd.Series((reached < 0).any(axis=1) | (max_points < 1).any(axis=1)),
+         "Erreichte Punkte dürfen nicht negativ und maximale Punkte nicht kleiner als 1 sein"),
+        (pd.Series((reached > max_points).any(axis=1)), "Erreichte Punkte dürfen die maximalen Punkte nicht übersteigen"),
+        (pd.Series(np.nansum(max_points, axis=1) != TEST_MAX_POINTS),
+         f"Die maximal möglichen Punkte aller Kategorien müssen {TEST_MAX_POINTS} betragen"),
+    ]
+    if participant_ids is not None:
+        checks.append((ids.notna() & ~ids.isin(list(participant_ids)), "Unbekannte Teilnehmer-ID"))
+    return _collect_errors(tests.index, checks)
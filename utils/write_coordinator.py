@@ -0,0 +1,216 @@
+import contextlib
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import pandas as pd
+from utils.data_loader import append_data, get_data_version, read_with_journal
+
+try:
+    import fcntl
+except ImportError:  # Windows: nur Sperre innerhalb des Prozesses
+    fcntl = None
+
+# Endung der Sperrdatei neben der Datendatei
+LOCK_SUFFIX = ".lock"
+
+# Wartezeit (Sekunden), in der kurz nacheinander eintreffende Schreibaufträge gesammelt werden
+GROUP_COMMIT_WINDOW = 0.005
+
+
+class WriteConflictError(ValueError):
+    """
+    Die zu ändernden Zeilen wurden seit dem Laden von einer anderen Sitzung geändert.
+    """
+
+
+_path_locks: Dict[str, threading.Lock] = {}
+_pending: Dict[str, List[Dict[str, Any]]] = {}
+_committing = set()
+_state_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def file_lock(file_path: str) -> Iterator[None]:
+    """
+    Sperrt eine Datendatei exklusiv für Threads und Prozesse (z. B. mehrere App-Instanzen).
+
+    Args:
+        file_path (str): Pfad zur Datendatei.
+
+    Returns:
+        Iterator[None]: Kontext, in dem die Sperre gehalten wird.
+    """
+    with _state_lock:
+        path_lock = _path_locks.setdefault(os.path.abspath(file_path), threading.Lock())
+    with path_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(f"{file_path}{LOCK_SUFFIX}", "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _changed_keys(current: pd.DataFrame, base_rows: pd.DataFrame, key: str) -> List[Any]:
+    """
+    Ermittelt die Schlüssel, deren gespeicherte Zeile nicht mehr dem geladenen Stand entspricht.
+
+    Args:
+        current (pd.DataFrame): Aktuell gespeicherte Daten.
+        base_rows (pd.DataFrame): Zeilen, wie sie vor der Änderung geladen wurden.
+        key (str): Schlüsselspalte.
+
+    Returns:
+        List[Any]: Schlüssel mit abweichendem oder gelöschtem Stand.
+    """
+    # Abgeleitete Spalten (z. B. `Aktiv`) werden nicht gespeichert und nicht verglichen
+    columns = base_rows.columns.intersection(current.columns)
+    base = base_rows[columns].set_index(key)
+    stored = current[columns].set_index(key).reindex(index=base.index)
+    missing = ~base.index.isin(current[key])
+    # Fehlende Werte gelten auf beiden Seiten als gleich
+    differs = (stored.ne(base) & ~(stored.isna() & base.isna())).any(axis=1).to_numpy()
+    return base.index[differs | missing].tolist()
+
+
+def _commit_batch(file_path: str, key: Optional[str], batch: List[Dict[str, Any]]) -> None:
+    """
+    Prüft die gesammelten Schreibaufträge einer Datei und schreibt alle gültigen mit einem Journalzugriff.
+
+    Das Ergebnis bzw. ein `WriteConflictError` wird im jeweiligen Auftrag hinterlegt.
+
+    Args:
+        file_path (str): Pfad zur Datendatei.
+        key (Optional[str]): Schlüsselspalte der Datei.
+        batch (List[Dict[str, Any]]): Schreibaufträge in Eingangsreihenfolge.
+
+    Returns:
+        None
+    """
+    with file_lock(file_path):
+        version = get_data_version(file_path)
+        needs_current = any(
+            write["assign_ids"] or (write["base_rows"] is not None and write["expected_version"] != version)
+            for write in batch
+        )
+        current = None
+        if needs_current and os.path.exists(file_path):
+            current = read_with_journal(file_path, key=key)
+
+        accepted = []
+        next_id = int(current[key].max()) + 1 if current is not None and not current.empty else 1
+        for write in batch:
+            rows = write["rows"]
+            if write["base_rows"] is not None and write["expected_version"] != version and current is not None:
+                conflicts = _changed_keys(current, write["base_rows"], key)
+                if conflicts:
+                    write["error"] = WriteConflictError(
+                        f"Die Einträge {', '.join(map(str, conflicts))} wurden zwischenzeitlich geändert. "
+                        "Bitte die Seite neu laden und die Änderung wiederholen."
+                    )
+                    continue
+            if write["assign_ids"]:
+                rows = rows.assign(**{key: range(next_id, next_id + len(rows))})
+                next_id += len(rows)
+            if current is not None and key is not None:
+                # Spätere Aufträge desselben Stapels prüfen gegen den neuen Stand
+                current = pd.concat([current, rows], ignore_index=True).drop_duplicates(subset=key, keep="last")
+            accepted.append((write, rows))
+
+        if accepted:
+            batch_rows = pd.concat([rows for _, rows in accepted], ignore_index=True)
+            append_data(batch_rows, file_path, key=key)
+            for write, rows in accepted:
+                write["result"] = rows
+
+            # Noch unter der Sperre: Kein anderer Schreibvorgang liegt zwischen den beiden Versionen
+            new_version = get_data_version(file_path)
+            for write, _ in accepted:
+                if write["on_commit"] is not None:
+                    try:
+                        write["on_commit"](batch_rows, version, new_version)
+                    except Exception:
+                        # Die Zeilen sind gespeichert; abgeleitete Daten werden beim nächsten Laden neu aufgebaut
+                        pass
+
+
+def commit_rows(
+    rows: pd.DataFrame,
+    file_path: str,
+    key: Optional[str] = None,
+    expected_version: Optional[str] = None,
+    base_rows: Optional[pd.DataFrame] = None,
+    assign_ids: bool = False,
+    on_commit: Optional[Callable[[pd.DataFrame, str, str], None]] = None,
+) -> pd.DataFrame:
+    """
+    Speichert neue oder geänderte Zeilen sicher bei gleichzeitigem Zugriff mehrerer Sitzungen.
+
+    Aufträge, die innerhalb von `GROUP_COMMIT_WINDOW` für dieselbe Datei eintreffen,
+    werden unter einer Dateisperre gemeinsam geprüft und mit einem einzigen
+    Journalzugriff geschrieben. Bei Änderungen bestehender Zeilen (`base_rows`) wird
+    geprüft, ob sich die Datei seit `expected_version` geändert hat; nur dann werden die
+    betroffenen Zeilen mit dem geladenen Stand verglichen. Neue IDs (`assign_ids`)
+    werden erst unter der Sperre vergeben, sodass parallele Einfügungen sich nicht
+    überschreiben. `on_commit` wird nach dem Schreiben noch unter der Sperre mit allen
+    Zeilen des Stapels sowie der Datenversion davor und danach aufgerufen, z. B. um
+    abgeleitete Daten ohne erneutes Lesen fortzuschreiben.
+
+    Args:
+        rows (pd.DataFrame): Zu speichernde Zeilen.
+        file_path (str): Pfad zur Datendatei.
+        key (Optional[str]): Schlüsselspalte (erforderlich für `base_rows` und `assign_ids`).
+        expected_version (Optional[str]): Datenversion beim Laden (`get_data_version`).
+        base_rows (Optional[pd.DataFrame]): Geänderte Zeilen im geladenen Stand.
+        assign_ids (bool): Fortlaufende IDs in der Schlüsselspalte vergeben.
+        on_commit (Optional[Callable[[pd.DataFrame, str, str], None]]): Wird mit
+            (Zeilen des Stapels, Version davor, Version danach) aufgerufen.
+
+    Returns:
+        pd.DataFrame: Gespeicherte Zeilen (mit vergebenen IDs).
+    """
+    if key is None and (assign_ids or base_rows is not None):
+        raise ValueError("Für die Konfliktprüfung und die Vergabe von IDs ist eine Schlüsselspalte nötig.")
+
+    write = {
+        "rows": rows,
+        "expected_version": expected_version,
+        "base_rows": base_rows,
+        "assign_ids": assign_ids,
+        "on_commit": on_commit,
+        "result": None,
+        "error": None,
+        "done": threading.Event(),
+    }
+    path = os.path.abspath(file_path)
+    with _state_lock:
+        _pending.setdefault(path, []).append(write)
+        leader = path not in _committing
+        _committing.add(path)
+
+    if leader:
+        # Der erste Auftrag schreibt für alle, die bis dahin hinzukommen
+        time.sleep(GROUP_COMMIT_WINDOW)
+        while True:
+            with _state_lock:
+                batch = _pending.pop(path, [])
+                if not batch:
+                    _committing.discard(path)
+                    break
+            try:
+                _commit_batch(file_path, key, batch)
+            except Exception as e:
+                for pending_write in batch:
+                    if pending_write["error"] is None:
+                        pending_write["error"] = e
+            for pending_write in batch:
+                pending_write["done"].set()
+
+    write["done"].wait()
+    if write["error"] is not None:
+        raise write["error"]
+    return write["result"]